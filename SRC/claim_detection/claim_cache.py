@@ -0,0 +1,233 @@
+import functools
+import inspect
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+from utils import metrics
+
+CLAIM_CACHE_THRESHOLD = float(os.getenv("CLAIM_CACHE_THRESHOLD", "0.8"))
+CLAIM_CACHE_MAX_ENTRIES = int(os.getenv("CLAIM_CACHE_MAX_ENTRIES", "50000"))
+CLAIM_CACHE_TTL = float(os.getenv("CLAIM_CACHE_TTL", str(7 * 24 * 3600)))
+CLAIM_CACHE_EVICTION = os.getenv("CLAIM_CACHE_EVICTION", "lru")  # lru | fifo
+CLAIM_CACHE_ENABLED = os.getenv("CLAIM_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+_PRIME = 4294967311  # smallest prime above 2**32
+_rng = np.random.default_rng(1234)
+_A = _rng.integers(1, 2 ** 31, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 2 ** 31, size=NUM_PERM, dtype=np.uint64)
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+_NEGATIONS = {"not", "no", "never", "nor", "none", "nobody", "nothing", "neither", "nowhere", "cannot", "without"}
+
+
+def normalize_claim(text: str) -> str:
+    text = _PUNCT_RE.sub(" ", text.lower().replace("’", "'"))
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def fact_tokens(normalized: str) -> tuple:
+    """
+    Numbers and negations, in order. A one-token change here flips a claim's
+    truth but barely moves its Jaccard similarity, so near hits must match
+    these exactly.
+    """
+    words = normalized.split()
+    facts = []
+    for n, word in enumerate(words):
+        # normalize_claim turns "isn't" into "isn t"
+        if word in _NEGATIONS or (word == "t" and n and words[n - 1].endswith("n")):
+            facts.append("not")
+        elif any(c.isdigit() for c in word):
+            facts.append(word)
+    return tuple(facts)
+
+
+def shingles(normalized: str, n: int = 3) -> set[int]:
+    words = normalized.split()
+    if len(words) < n:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + n]) for i in range(len(words) - n + 1)]
+    return {zlib.crc32(g.encode("utf-8")) for g in grams}
+
+
+def minhash(normalized: str) -> np.ndarray:
+    values = np.fromiter(shingles(normalized), dtype=np.uint64)
+    if values.size == 0:
+        return np.full(NUM_PERM, _PRIME, dtype=np.uint64)
+    # a < 2**31 and x < 2**32, so a * x + b fits in uint64
+    hashed = (values[None, :] * _A[:, None] + _B[:, None]) % _PRIME
+    return hashed.min(axis=1)
+
+
+class ClaimCache:
+    """
+    Near-duplicate cache for claim verdicts. Sentences are normalized and
+    MinHashed; LSH banding finds candidates and the estimated Jaccard
+    similarity must reach `threshold` for a stored verdict to be reused.
+    Near hits must also carry exactly the same numbers and negations.
+    """
+
+    def __init__(self, threshold: float = CLAIM_CACHE_THRESHOLD, max_entries: int = CLAIM_CACHE_MAX_ENTRIES,
+                 ttl: float = CLAIM_CACHE_TTL, eviction: str = CLAIM_CACHE_EVICTION):
+        if eviction not in ("lru", "fifo"):
+            raise ValueError(f"Unknown eviction policy '{eviction}', expected 'lru' or 'fifo'")
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.eviction = eviction
+        self._entries = OrderedDict()  # entry_id -> (namespace, normalized, signature, value, created_at, facts)
+        self._exact = {}  # (namespace, normalized) -> entry_id
+        self._buckets = [{} for _ in range(BANDS)]  # band -> {(namespace, band_hash): set(entry_id)}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.stats = {"exact_hits": 0, "near_hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def _band_keys(namespace: str, signature: np.ndarray):
+        for band in range(BANDS):
+            yield band, (namespace, signature[band * ROWS:(band + 1) * ROWS].tobytes())
+
+    def _remove(self, entry_id: int):
+        namespace, normalized, signature, _, _, _ = self._entries.pop(entry_id)
+        self._exact.pop((namespace, normalized), None)
+        for band, key in self._band_keys(namespace, signature):
+            ids = self._buckets[band].get(key)
+            if ids:
+                ids.discard(entry_id)
+                if not ids:
+                    del self._buckets[band][key]
+
+    def _expired(self, entry) -> bool:
+        return self.ttl is not None and time.time() - entry[4] > self.ttl
+
+    def _touch(self, entry_id: int):
+        if self.eviction == "lru":
+            self._entries.move_to_end(entry_id)
+
+    def get(self, text: str, namespace: str = "default"):
+        """Returns the stored value for the text or a near-duplicate of it, else None."""
+        normalized = normalize_claim(text)
+        with self._lock:
+            entry_id = self._exact.get((namespace, normalized))
+            if entry_id is not None and not self._expired(self._entries[entry_id]):
+                self._touch(entry_id)
+                self.stats["exact_hits"] += 1
+                metrics.incr("claim_cache.exact_hit")
+                return self._entries[entry_id][3]
+
+        signature = minhash(normalized)
+        facts = fact_tokens(normalized)
+        with self._lock:
+            candidates = set()
+            for band, key in self._band_keys(namespace, signature):
+                candidates |= self._buckets[band].get(key, set())
+
+            best_id, best_sim = None, 0.0
+            for candidate in candidates:
+                entry = self._entries.get(candidate)
+                if entry is None or self._expired(entry) or entry[5] != facts:
+                    continue
+                similarity = float(np.mean(entry[2] == signature))
+                if similarity > best_sim:
+                    best_id, best_sim = candidate, similarity
+
+            if best_id is not None and best_sim >= self.threshold:
+                self._touch(best_id)
+                self.stats["near_hits"] += 1
+                metrics.incr("claim_cache.near_hit")
+                return self._entries[best_id][3]
+
+            self.stats["misses"] += 1
+            metrics.incr("claim_cache.miss")
+            return None
+
+    def put(self, text: str, value, namespace: str = "default"):
+        normalized = normalize_claim(text)
+        signature = minhash(normalized)
+        with self._lock:
+            existing = self._exact.get((namespace, normalized))
+            if existing is not None:
+                self._remove(existing)
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (namespace, normalized, signature, value, time.time(),
+                                       fact_tokens(normalized))
+            self._exact[(namespace, normalized)] = entry_id
+            for band, key in self._band_keys(namespace, signature):
+                self._buckets[band].setdefault(key, set()).add(entry_id)
+
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._exact.clear()
+            for bucket in self._buckets:
+                bucket.clear()
+
+    def hit_rate(self) -> float:
+        hits = self.stats["exact_hits"] + self.stats["near_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_claim_cache() -> ClaimCache:
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = ClaimCache()
+    return _default_cache
+
+
+def cached_claim(namespace: str):
+    """
+    Puts the claim cache in front of a classify_* function. The cache key is
+    the claim text plus the function's `mode` argument, if it has one.
+    Verdicts reached while an external lookup failed are returned but not
+    stored, so the next call retries instead of reusing a degraded answer.
+    The wrapped function also takes refresh=True, which skips the lookup and
+    overwrites the stored verdict.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(text, *args, refresh: bool = False, **kwargs):
+            if not CLAIM_CACHE_ENABLED or not text.strip():
+                return fn(text, *args, **kwargs)
+            bound = signature.bind(text, *args, **kwargs)
+            bound.apply_defaults()
+            mode = bound.arguments.get("mode")
+            key = f"{namespace}:{mode}" if mode else namespace
+            cache = get_claim_cache()
+            verdict = None if refresh else cache.get(text, key)
+            if verdict is None:
+                with metrics.track_failures() as failures:
+                    verdict = fn(text, *args, **kwargs)
+                if not failures:
+                    cache.put(text, verdict, key)
+            return verdict
+        return wrapper
+    return decorator
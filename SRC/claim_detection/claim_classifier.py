@@ -1,23 +1,21 @@
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-import torch
 import os
-import torch.nn.functional as F
+import logging
 from evidence.retrieval import retrieve_evidence
-from claim_detection.claimbuster_client import get_claimbuster_score
 from utils.article_fetcher import extract_article_from_url
+from ner.ner_pipeline import extract_named_entities
+from pipeline.article_context import ArticleContext
+from utils import http_client, metrics
+from utils.disk_cache import disk_cached
+from claim_detection.nli_backends import get_backend
+from claim_detection.nli_tokenizer import get_encoder
+from claim_detection.claim_cache import cached_claim
+from claim_detection.entity_resolver import fetch_wikipedia_summary
 
-# ✅ Switched model for manual mode
-MANUAL_MODEL_ID = "mrm8488/bert-tiny-finetuned-fake-news-detection"
-AUTO_MODEL_ID = "ynie/roberta-large-snli_mnli_fever_anli_R1_R2_R3-nli"
+logger = logging.getLogger(__name__)
 
 id2label = {0: "CONTRADICTION", 1: "NEUTRAL", 2: "ENTAILMENT"}
 
-# Load both models
-manual_tokenizer = AutoTokenizer.from_pretrained(MANUAL_MODEL_ID)
-manual_model = AutoModelForSequenceClassification.from_pretrained(MANUAL_MODEL_ID)
-
-auto_tokenizer = AutoTokenizer.from_pretrained(AUTO_MODEL_ID, use_fast=False)
-auto_model = AutoModelForSequenceClassification.from_pretrained(AUTO_MODEL_ID)
+# Models are loaded on first use through model_registry; call model_registry.warmup() to preload
 
 CONFIDENCE_THRESHOLD = 0.92
 WEAK_ENTAILMENT_THRESHOLD = 0.85
@@ -25,25 +23,15 @@ WEAK_ENTAILMENT_THRESHOLD = 0.85
 # Google Programmable Search
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 GOOGLE_CX = os.getenv("GOOGLE_CX")
-
-# Wikipedia entity resolver
-def fetch_wikipedia_summary(title):
-    try:
-        search_url = f"https://en.wikipedia.org/w/api.php?action=query&list=search&srsearch={title}&format=json"
-        search_resp = requests.get(search_url).json()
-        results = search_resp.get("query", {}).get("search", [])
-        if not results:
-            return None
-        top_title = results[0]['title']
-        summary_url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{top_title.replace(' ', '_')}"
-        summary_resp = requests.get(summary_url).json()
-        return summary_resp.get("extract", "").lower()
-    except Exception as e:
-        print(f"❌ Wikipedia error: {e}")
-        return None
-
-def dynamic_wiki_check(text):
-    entities = extract_named_entities(text)
+GOOGLE_CSE_ENDPOINT = os.getenv("GOOGLE_CSE_ENDPOINT", "https://www.googleapis.com/customsearch/v1")
+
+def dynamic_wiki_check(text, entities=None, summary_fn=None):
+    # Pipelines pass the sentence's spans from the article parse; only re-run NER when they don't
+    if entities is None:
+        entities = extract_named_entities(text)
+    # ...and an ArticleContext lookup backed by the article-wide bulk resolution
+    summary_fn = summary_fn or fetch_wikipedia_summary
+    entities = [ent for ent, _label in entities]
     text_lower = text.lower()
 
     contradiction_pairs = [
@@ -54,49 +42,54 @@ def dynamic_wiki_check(text):
     ]
 
     for ent in entities:
-        snippet = fetch_wikipedia_summary(ent)
+        snippet = summary_fn(ent)
         if not snippet:
             continue
 
         # Contradiction detection logic
         for entity, role, correct_person in contradiction_pairs:
             if entity in text_lower and role in text_lower and correct_person not in snippet:
-                print(f"❌ Contradiction: '{entity}' assigned wrong role '{role}'")
+                logger.debug("❌ Contradiction: '%s' assigned wrong role '%s'", entity, role)
                 return True
 
         # Extra catch: if entity isn't mentioned in its own snippet, it's suspicious
         if ent.lower() not in snippet:
-            print(f"⚠️ Entity '{ent}' not in its own summary → suspicious")
+            logger.debug("⚠️ Entity '%s' not in its own summary → suspicious", ent)
             return True
 
     return False
 
 
 
+@disk_cached("google_cse", offline_default=[])
 def google_search(query):
     if not GOOGLE_API_KEY or not GOOGLE_CX:
         return []
     try:
-        url = f"https://www.googleapis.com/customsearch/v1?q={query}&key={GOOGLE_API_KEY}&cx={GOOGLE_CX}"
-        resp = requests.get(url)
+        params = {"q": query, "key": GOOGLE_API_KEY, "cx": GOOGLE_CX}
+        metrics.incr("external_calls.google_cse")
+        with metrics.stage("external.google_cse"):
+            resp = http_client.get(GOOGLE_CSE_ENDPOINT, params=params,
+                                   source="google_cse", api_key=GOOGLE_API_KEY)
+        resp.raise_for_status()
         data = resp.json()
         return [item['snippet'] for item in data.get('items', [])]
-    except:
+    except Exception as e:
+        metrics.lookup_failed("google_cse")
+        logger.warning("❌ Google search error: %s", e)
         return []
 
-def classify_nli(text: str, mode: str = "auto") -> dict:
-    premise = "According to verified sources,"
-    tokenizer = auto_tokenizer if mode == "auto" else manual_tokenizer
-    model = auto_model if mode == "auto" else manual_model
+NLI_PREMISE = "According to verified sources,"
+NLI_MAX_LENGTH = 512
+# Upper bound on padded tokens (batch size x longest sequence) per forward pass
+NLI_TOKEN_BUDGET = int(os.getenv("NLI_TOKEN_BUDGET", "4096"))
+NLI_MAX_BATCH_SIZE = int(os.getenv("NLI_MAX_BATCH_SIZE", "32"))
 
-    inputs = tokenizer(premise, text, return_tensors="pt", truncation=True, max_length=512)
-    with torch.no_grad():
-        logits = model(**inputs).logits
-        probs = F.softmax(logits, dim=1).squeeze()
 
-    label_id = torch.argmax(probs).item()
+def _nli_result_from_probs(probs: list[float]) -> dict:
+    label_id = max(range(len(probs)), key=probs.__getitem__)
     label_name = id2label[label_id]
-    score = probs[label_id].item()
+    score = probs[label_id]
 
     final_label = "UNSURE"
     if score >= CONFIDENCE_THRESHOLD:
@@ -108,21 +101,78 @@ def classify_nli(text: str, mode: str = "auto") -> dict:
     return {
         "nli_label": label_name,
         "score": score,
-        "probs": probs.tolist(),
+        "probs": probs,
         "label": final_label
     }
 
+
+def _plan_micro_batches(lengths: list[int], token_budget: int, max_batch_size: int) -> list[list[int]]:
+    """
+    Groups sequence indices into length-sorted micro-batches so that the
+    padded size (len(batch) * longest sequence) stays within token_budget.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches = []
+    current = []
+    for idx in order:
+        # Lengths are ascending, so the incoming sequence is the longest in the batch
+        padded = lengths[idx] * (len(current) + 1)
+        if current and (padded > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current = []
+        current.append(idx)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def classify_nli_batch(texts: list[str], mode: str = "auto", token_budget: int = None,
+                       max_batch_size: int = None, backend: str = None) -> list[dict]:
+    """
+    Batched version of classify_nli. Sentences are sorted by token length and
+    packed into dynamically padded micro-batches, then results are returned
+    in the original input order. The inference backend defaults to NLI_BACKEND.
+    Encodings come from nli_tokenizer, which reuses the pre-encoded premise
+    and caches sentence encodings across calls.
+    """
+    if not texts:
+        return []
+    token_budget = token_budget or NLI_TOKEN_BUDGET
+    max_batch_size = max_batch_size or NLI_MAX_BATCH_SIZE
+    engine = get_backend(mode, backend)
+    encoder = get_encoder(mode, NLI_PREMISE, NLI_MAX_LENGTH)
+
+    with metrics.stage("nli.tokenize"):
+        encodings = encoder.encode(texts)
+    lengths = [len(ids) for ids, _types in encodings]
+
+    results = [None] * len(texts)
+    for batch in _plan_micro_batches(lengths, token_budget, max_batch_size):
+        inputs = encoder.to_tensors([encodings[i] for i in batch])
+        metrics.observe_batch(len(batch))
+        with metrics.stage("nli.forward"):
+            probs = engine.predict_proba(inputs)
+        for i, row in zip(batch, probs):
+            results[i] = _nli_result_from_probs(row)
+
+    return results
+
+
+def classify_nli(text: str, mode: str = "auto", backend: str = None) -> dict:
+    return classify_nli_batch([text], mode=mode, backend=backend)[0]
+
 def is_fallback_fake(evidence_list):
     suspicious = ["conspiracy", "disproven", "misinformation", "false", "debunked", "not true", "fake"]
     return any(any(word in e.lower() for word in suspicious) for e in evidence_list)
 
+@cached_claim("manual_text")
 def classify_manual_text(text: str) -> str:
     if not text.strip():
         return "UNSURE"
 
     result = classify_nli(text, mode="manual")
-    print(f"🧾 Manual Claim: {text}")
-    print(f"➡️ Label: {result['label']} ({result['nli_label']}), Score: {result['score']:.2f}")
+    logger.debug("🧾 Manual Claim: %s", text)
+    logger.debug("➡️ Label: %s (%s), Score: %.2f", result['label'], result['nli_label'], result['score'])
 
     needs_extra_check = (
         result["label"] == "UNSURE" or
@@ -132,10 +182,10 @@ def classify_manual_text(text: str) -> str:
 
     if needs_extra_check:
         google_evidence = google_search(text)
-        print(f"🔎 Google Search Evidence: {google_evidence}")
+        logger.debug("🔎 Google Search Evidence: %s", google_evidence)
         if not google_evidence:
             fallback = retrieve_evidence(text)
-            print(f"🔁 Fallback Evidence: {fallback}")
+            logger.debug("🔁 Fallback Evidence: %s", fallback)
             if not fallback:
                 return "UNSURE"
             return "FAKE" if is_fallback_fake(fallback) else "REAL"
@@ -143,29 +193,33 @@ def classify_manual_text(text: str) -> str:
 
     return result["label"]
 
-def classify_claim_auto(text: str, mode: str = "article") -> str:
+@cached_claim("claim_auto")
+def classify_claim_auto(text: str, mode: str = "article", nli_result: dict = None,
+                        context: ArticleContext = None, entities: list = None) -> str:
     if not text.strip():
         return "UNSURE"
 
-    cb_score = get_claimbuster_score(text)
-    print(f"📊 ClaimBuster score: {cb_score:.2f}")
+    context = context or ArticleContext()
+    cb_score = context.claimbuster_score(text)
+    logger.debug("📊 ClaimBuster score: %.2f", cb_score)
 
-    result = classify_nli(text, mode="auto")
-    print(f"📰 Article Claim: {text}")
-    print(f"➡️ Label: {result['label']} ({result['nli_label']}), Score: {result['score']:.2f}")
+    # Pipelines pass in results from classify_nli_batch to avoid one forward pass per sentence
+    result = nli_result or classify_nli(text, mode="auto")
+    logger.debug("📰 Article Claim: %s", text)
+    logger.debug("➡️ Label: %s (%s), Score: %.2f", result['label'], result['nli_label'], result['score'])
 
     if mode == "article":
-        retrieve_evidence(text)
+        context.evidence(text)
 
     needs_extra_check = (
         result["label"] == "UNSURE" or
         result["nli_label"] == "ENTAILMENT" and result["score"] < WEAK_ENTAILMENT_THRESHOLD or
-        dynamic_wiki_check(text)
+        dynamic_wiki_check(text, entities, summary_fn=context.wiki_summary)
     )
 
     if needs_extra_check:
-        fallback = retrieve_evidence(text)
-        print(f"🔁 Fallback Evidence: {fallback}")
+        fallback = context.evidence(text)
+        logger.debug("🔁 Fallback Evidence: %s", fallback)
         if not fallback:
             return "UNSURE"
         return "FAKE" if is_fallback_fake(fallback) else "REAL"
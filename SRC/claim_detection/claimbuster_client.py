@@ -1,28 +1,44 @@
-import requests
 import os
+import logging
+import requests
 from dotenv import load_dotenv
+from utils import http_client, metrics
+from utils.disk_cache import disk_cached
+
+logger = logging.getLogger(__name__)
 
 load_dotenv()
 API_KEY = os.getenv("CLAIMBUSTER_API_KEY")
-CLAIMBUSTER_ENDPOINT = "https://idir.uta.edu/claimbuster/api/v2/score/text/"
+CLAIMBUSTER_ENDPOINT = os.getenv("CLAIMBUSTER_ENDPOINT", "https://idir.uta.edu/claimbuster/api/v2/score/text/")
 
+@disk_cached("claimbuster", offline_default=0.0)
 def get_claimbuster_score(sentence: str) -> float:
     headers = {"x-api-key": API_KEY}
     payload = {"input_text": sentence}
 
-    response = requests.post(CLAIMBUSTER_ENDPOINT, headers=headers, json=payload)
+    metrics.incr("external_calls.claimbuster")
+    try:
+        with metrics.stage("external.claimbuster"):
+            response = http_client.post(CLAIMBUSTER_ENDPOINT, headers=headers, json=payload,
+                                        source="claimbuster", api_key=API_KEY)
+    except requests.RequestException as e:
+        # Includes an open circuit; 0.0 is falsy so it is not cached and gets retried later
+        metrics.lookup_failed("claimbuster")
+        logger.warning("❌ ClaimBuster unavailable: %s", e)
+        return 0.0
 
-    print(f"🔁 Sent: {sentence}")
-    print(f"📥 Status: {response.status_code}")
-    print(f"📦 Raw Response: {response.text}")
+    logger.debug("🔁 Sent: %s", sentence)
+    logger.debug("📥 Status: %s", response.status_code)
 
     if response.status_code == 200:
         result = response.json()
         try:
             return result["results"][0]["score"]
         except (KeyError, IndexError):
-            print("⚠️ Could not extract score from result.")
+            metrics.lookup_failed("claimbuster")
+            logger.warning("⚠️ Could not extract score from result: %.200s", response.text)
             return 0.0
     else:
-        print(f"❌ ClaimBuster API Error: {response.status_code}")
+        metrics.lookup_failed("claimbuster")
+        logger.warning("❌ ClaimBuster API Error: %s", response.status_code)
         return 0.0
@@ -0,0 +1,140 @@
+import contextvars
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from evidence import retrieval
+from evidence.retrieval import WIKIPEDIA_API_URL, WIKIPEDIA_REST_URL
+from utils import http_client, metrics
+from utils.disk_cache import disk_cached, get_default_cache, is_offline, normalize_key
+
+logger = logging.getLogger(__name__)
+
+# MediaWiki returns intro extracts for at most 20 pages per query
+WIKI_TITLES_PER_QUERY = 20
+ENTITY_RESOLVER_WORKERS = int(os.getenv("ENTITY_RESOLVER_WORKERS", "4"))
+SUMMARY_SOURCE = "wikipedia_summary"
+
+
+def fetch_wikipedia_summary(title):
+    if retrieval.EVIDENCE_BACKEND in ("local", "local+live"):
+        summary = retrieval.local_wikipedia_summary(title)
+        if summary or retrieval.EVIDENCE_BACKEND == "local":
+            return summary.lower() if summary else None
+    return fetch_wikipedia_summary_live(title)
+
+@disk_cached(SUMMARY_SOURCE)
+def fetch_wikipedia_summary_live(title):
+    try:
+        metrics.incr("external_calls.wikipedia_summary")
+        with metrics.stage("external.wikipedia_summary"):
+            search_url = f"{WIKIPEDIA_API_URL}?action=query&list=search&srsearch={title}&format=json"
+            search_resp = http_client.get(search_url, source="wikipedia").json()
+            results = search_resp.get("query", {}).get("search", [])
+            if not results:
+                return None
+            top_title = results[0]['title']
+            summary_url = f"{WIKIPEDIA_REST_URL}/page/summary/{top_title.replace(' ', '_')}"
+            summary_resp = http_client.get(summary_url, source="wikipedia").json()
+        return summary_resp.get("extract", "").lower()
+    except Exception as e:
+        metrics.lookup_failed("wikipedia_summary")
+        logger.warning("❌ Wikipedia error: %s", e)
+        return None
+
+
+def fetch_summaries_bulk(titles: list[str]) -> dict:
+    """
+    Intro extracts for up to WIKI_TITLES_PER_QUERY titles in one MediaWiki
+    query. Title normalization and redirects are followed back to the title
+    that was asked for; titles without a page, or whose page is a
+    disambiguation page, map to None so they go through the search lookup.
+    Returns None if the request itself failed.
+    """
+    params = {
+        "action": "query", "prop": "extracts|pageprops", "ppprop": "disambiguation", "exintro": 1,
+        "explaintext": 1, "redirects": 1, "exlimit": "max", "titles": "|".join(titles), "format": "json",
+    }
+    try:
+        metrics.incr("external_calls.wikipedia_bulk")
+        with metrics.stage("external.wikipedia_bulk"):
+            query = http_client.get(WIKIPEDIA_API_URL, params=params, source="wikipedia").json().get("query", {})
+    except Exception as e:
+        metrics.lookup_failed("wikipedia_bulk")
+        logger.warning("❌ Wikipedia bulk query failed for %d titles: %s", len(titles), e)
+        return None
+
+    aliases = {item["from"]: item["to"] for item in query.get("normalized", []) + query.get("redirects", [])}
+    pages = query.get("pages", {})
+    pages = pages.values() if isinstance(pages, dict) else pages
+    # "Mercury may refer to: ..." is not a summary of any one entity
+    extracts = {p["title"]: p.get("extract") for p in pages
+                if "missing" not in p and "invalid" not in p and "disambiguation" not in p.get("pageprops", {})}
+
+    summaries = {}
+    for title in titles:
+        resolved, seen = title, set()
+        while resolved in aliases and resolved not in seen:
+            seen.add(resolved)
+            resolved = aliases[resolved]
+        extract = extracts.get(resolved)
+        summaries[title] = extract.lower() if extract else None
+    return summaries
+
+
+def resolve_entities(names, max_workers: int = None) -> dict:
+    """
+    Wikipedia summaries for every unique entity name, e.g. all the entities of
+    an article at once. Names already in the disk cache are served from it;
+    the rest go out as multi-title queries in parallel. Names with no exact
+    page fall back to the search-based lookup. Shares cache entries with
+    fetch_wikipedia_summary_live, so either path warms the other.
+    """
+    unique = list(dict.fromkeys(n.strip() for n in names if n and n.strip()))
+    summaries = {}
+    if retrieval.EVIDENCE_BACKEND in ("local", "local+live"):
+        for name in unique:
+            summaries[name] = fetch_wikipedia_summary(name) if retrieval.EVIDENCE_BACKEND == "local" \
+                else retrieval.local_wikipedia_summary(name)
+        if retrieval.EVIDENCE_BACKEND == "local":
+            return summaries
+        summaries = {name: s.lower() for name, s in summaries.items() if s}
+
+    cache = get_default_cache()
+    missing = []
+    for name in unique:
+        if name in summaries:
+            continue
+        hit, value = cache.get(SUMMARY_SOURCE, normalize_key(name))
+        if hit:
+            metrics.incr(f"cache.{SUMMARY_SOURCE}.hit")
+            summaries[name] = value
+        else:
+            metrics.incr(f"cache.{SUMMARY_SOURCE}.miss")
+            missing.append(name)
+    if not missing or is_offline():
+        return {name: summaries.get(name) for name in unique}
+
+    chunks = [missing[i:i + WIKI_TITLES_PER_QUERY] for i in range(0, len(missing), WIKI_TITLES_PER_QUERY)]
+    workers = min(max_workers or ENTITY_RESOLVER_WORKERS, len(chunks))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Worker threads don't inherit context variables; carry the metrics collector over
+        bulk = list(pool.map(lambda chunk: contextvars.copy_context().run(fetch_summaries_bulk, chunk), chunks))
+
+        not_found = []
+        for chunk, found in zip(chunks, bulk):
+            if found is None:
+                continue
+            for name, summary in found.items():
+                if summary:
+                    summaries[name] = summary
+                    cache.set(SUMMARY_SOURCE, normalize_key(name), summary)
+                else:
+                    not_found.append(name)
+
+        fallback = pool.map(lambda name: contextvars.copy_context().run(fetch_wikipedia_summary_live, name),
+                            not_found)
+        summaries.update(zip(not_found, fallback))
+
+    logger.debug("🔗 Resolved %d entities (%d queried, %d via search)", len(unique), len(missing), len(not_found))
+    return {name: summaries.get(name) for name in unique}
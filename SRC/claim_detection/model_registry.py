@@ -0,0 +1,87 @@
+import threading
+
+# ✅ Switched model for manual mode
+MANUAL_MODEL_ID = "mrm8488/bert-tiny-finetuned-fake-news-detection"
+AUTO_MODEL_ID = "ynie/roberta-large-snli_mnli_fever_anli_R1_R2_R3-nli"
+
+
+class LazyModel:
+    """
+    Handle to a tokenizer/model pair that is only loaded on first use.
+    torch and transformers are imported by the loader, so importing this
+    module (or anything that imports it) stays cheap.
+    """
+
+    def __init__(self, model_id: str, **tokenizer_kwargs):
+        self.model_id = model_id
+        self.tokenizer_kwargs = tokenizer_kwargs
+        self._pair = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._pair is not None
+
+    def get(self):
+        if self._pair is None:
+            with self._lock:
+                if self._pair is None:
+                    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+                    tokenizer = AutoTokenizer.from_pretrained(self.model_id, **self.tokenizer_kwargs)
+                    model = AutoModelForSequenceClassification.from_pretrained(self.model_id)
+                    model.eval()
+                    self._pair = (tokenizer, model)
+        return self._pair
+
+
+MODELS = {
+    "manual": LazyModel(MANUAL_MODEL_ID),
+    "auto": LazyModel(AUTO_MODEL_ID, use_fast=False),
+}
+
+# Which models each entry point actually touches; warmup() loads only these
+MODELS_FOR_MODE = {
+    "article": ("spacy", "auto"),
+    "manual": ("spacy", "auto"),
+    "manual_text": ("spacy", "manual"),
+}
+
+
+def get_model(mode: str = "auto"):
+    """Returns (tokenizer, model) for the given classifier mode, loading it if needed."""
+    return MODELS["auto" if mode == "auto" else "manual"].get()
+
+
+def warmup(mode: str = None, names=None, run_forward: bool = True):
+    """
+    Loads models ahead of the first request and runs one tiny forward pass so
+    lazy kernel initialisation is not billed to a user. Pass a pipeline mode
+    ("article", "manual", "manual_text") or explicit model names; with neither,
+    everything is loaded. run_forward=False only loads weights, which is what a
+    parent process should do before forking workers.
+    """
+    if names is None:
+        names = MODELS_FOR_MODE[mode] if mode else ("spacy", *MODELS)
+
+    for name in names:
+        if name == "spacy":
+            from utils.spacy_model import get_nlp
+            nlp = get_nlp()
+            if run_forward:
+                nlp("Warmup sentence.")
+            continue
+
+        if not run_forward:
+            MODELS[name].get()
+            continue
+
+        # Warm the configured inference backend and the pair encoder, which load the registry model underneath
+        from claim_detection.claim_classifier import classify_nli_batch
+        classify_nli_batch(["Warmup sentence."], mode=name)
+
+
+def loaded_models() -> dict:
+    from utils import spacy_model
+    status = {name: handle.loaded for name, handle in MODELS.items()}
+    status["spacy"] = spacy_model._nlp is not None
+    return status
@@ -0,0 +1,102 @@
+import os
+import threading
+
+from claim_detection.model_registry import get_model, MODELS
+
+# torch (fp32 eager, default) | torch_int8 (dynamic quantization) | onnx (ONNX Runtime)
+NLI_BACKEND = os.getenv("NLI_BACKEND", "torch")
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+ONNX_DIR = os.getenv("NLI_ONNX_DIR", os.path.join(REPO_ROOT, "data", "onnx"))
+ONNX_THREADS = int(os.getenv("NLI_ONNX_THREADS", "0"))  # 0 lets ONNX Runtime decide
+
+
+class TorchBackend:
+    """Default PyTorch eager inference on the registry's fp32 model."""
+
+    name = "torch"
+
+    def __init__(self, mode: str):
+        self.tokenizer, self.model = get_model(mode)
+
+    def predict_proba(self, inputs) -> list[list[float]]:
+        import torch
+        with torch.no_grad():
+            logits = self.model(**inputs).logits
+            return torch.softmax(logits, dim=-1).tolist()
+
+
+class QuantizedTorchBackend(TorchBackend):
+    """fp32 model with its Linear layers dynamically quantized to int8 for CPU."""
+
+    name = "torch_int8"
+
+    def __init__(self, mode: str):
+        import torch
+        super().__init__(mode)
+        self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class OnnxBackend:
+    """
+    Runs the model with ONNX Runtime. The graph is exported from the registry's
+    PyTorch model on first use and reused from ONNX_DIR afterwards.
+    """
+
+    name = "onnx"
+
+    def __init__(self, mode: str):
+        import onnxruntime as ort
+        self.tokenizer, model = get_model(mode)
+        model_id = MODELS["auto" if mode == "auto" else "manual"].model_id
+        path = os.path.join(ONNX_DIR, model_id.replace("/", "__") + ".onnx")
+        if not os.path.exists(path):
+            self._export(model, path)
+
+        options = ort.SessionOptions()
+        if ONNX_THREADS:
+            options.intra_op_num_threads = ONNX_THREADS
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _export(self, model, path: str):
+        import torch
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        sample = self.tokenizer("According to verified sources,", "Sample claim.", return_tensors="pt")
+        names = [k for k in ("input_ids", "attention_mask", "token_type_ids") if k in sample]
+        dynamic = {k: {0: "batch", 1: "sequence"} for k in names}
+        dynamic["logits"] = {0: "batch"}
+        torch.onnx.export(
+            model, tuple(sample[k] for k in names), path,
+            input_names=names, output_names=["logits"], dynamic_axes=dynamic, opset_version=14,
+        )
+
+    def predict_proba(self, inputs) -> list[list[float]]:
+        import numpy as np
+        feeds = {k: v.numpy() for k, v in inputs.items() if k in self.input_names}
+        (logits,) = self.session.run(["logits"], feeds)
+        logits = logits - logits.max(axis=-1, keepdims=True)
+        exp = np.exp(logits)
+        return (exp / exp.sum(axis=-1, keepdims=True)).tolist()
+
+
+BACKENDS = {
+    TorchBackend.name: TorchBackend,
+    QuantizedTorchBackend.name: QuantizedTorchBackend,
+    OnnxBackend.name: OnnxBackend,
+}
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def get_backend(mode: str = "auto", name: str = None):
+    """Returns the (cached) inference backend for a classifier mode."""
+    name = name or NLI_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown NLI backend '{name}', expected one of {sorted(BACKENDS)}")
+    key = ("auto" if mode == "auto" else "manual", name)
+    if key not in _instances:
+        with _instances_lock:
+            if key not in _instances:
+                _instances[key] = BACKENDS[name](key[0])
+    return _instances[key]
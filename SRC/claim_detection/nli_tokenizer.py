@@ -0,0 +1,159 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# auto: use the Rust tokenizer when it reproduces the slow one on the probe set | 1: always | 0: never
+NLI_FAST_TOKENIZER = os.getenv("NLI_FAST_TOKENIZER", "auto").lower()
+NLI_ENCODING_CACHE_SIZE = int(os.getenv("NLI_ENCODING_CACHE_SIZE", "50000"))
+
+# Checked through both tokenizers before the fast one is trusted: casing,
+# punctuation, digits, accents, dashes, emoji and odd whitespace
+PROBE_SENTENCES = [
+    "Tesla Inc. opened its first showroom in India on Tuesday.",
+    "Narendra Modi is the President of the United States.",
+    "Mount Everest is 8,849 metres high; rates rose 0.25% in Q3.",
+    "The café's naïve coöperation — “quoted” text… isn't it?",
+    "  Leading and   repeated spaces\tand tabs ",
+    "Emoji 🚀 and CJK 東京 and Ελληνικά mixed in.",
+    "U.S.-China talks resumed (again) on 2024-03-01 at 9:30am.",
+]
+
+
+class PairEncoder:
+    """
+    Encodes (premise, sentence) pairs for NLI. The fixed premise is tokenized
+    once; each sentence is tokenized on its own, memoized in an LRU, and the
+    pair is assembled with the tokenizer's special-token layout. Cache misses
+    in a batch go through the tokenizer in a single call.
+
+    On construction the assembled ids are compared with the tokenizer's own
+    pair encoding on PROBE_SENTENCES; if they ever differ the encoder falls
+    back to encoding each pair directly (still cached).
+    """
+
+    def __init__(self, tokenizer, premise: str, max_length: int, cache_size: int = NLI_ENCODING_CACHE_SIZE):
+        self.tokenizer = tokenizer
+        self.premise = premise
+        self.max_length = max_length
+        self.cache_size = cache_size
+        self.premise_ids = tokenizer(premise, add_special_tokens=False)["input_ids"]
+        self.with_token_types = "token_type_ids" in getattr(tokenizer, "model_input_names", ())
+        self.pad_id = 0 if tokenizer.pad_token_id is None else tokenizer.pad_token_id
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.assemble = all(self._assembled(p) == self._direct(p) for p in PROBE_SENTENCES)
+        if not self.assemble:
+            logger.warning("⚠️ Pre-encoded premise does not match the tokenizer's pair encoding; encoding pairs directly")
+
+    def _direct(self, text: str) -> tuple:
+        enc = self.tokenizer(self.premise, text, truncation=True, max_length=self.max_length)
+        return tuple(enc["input_ids"]), tuple(enc.get("token_type_ids") or ())
+
+    def _assembled(self, text: str, sentence_ids: list = None) -> tuple:
+        if sentence_ids is None:
+            sentence_ids = self.tokenizer(text, add_special_tokens=False)["input_ids"]
+        budget = self.max_length - len(self.premise_ids) - self.tokenizer.num_special_tokens_to_add(pair=True)
+        sentence_ids = sentence_ids[:max(budget, 0)]
+        ids = self.tokenizer.build_inputs_with_special_tokens(self.premise_ids, sentence_ids)
+        types = self.tokenizer.create_token_type_ids_from_sequences(self.premise_ids, sentence_ids) \
+            if self.with_token_types else ()
+        return tuple(ids), tuple(types)
+
+    def encode(self, texts: list[str]) -> list[tuple]:
+        """(input_ids, token_type_ids) per text; token_type_ids is empty for models without them."""
+        with self._lock:
+            found = {t: self._cache[t] for t in dict.fromkeys(texts) if t in self._cache}
+            for t in found:
+                self._cache.move_to_end(t)
+        misses = [t for t in dict.fromkeys(texts) if t not in found]
+        metrics.incr("nli.encode_cache.hit", len(texts) - len(misses))
+        metrics.incr("nli.encode_cache.miss", len(misses))
+
+        if misses:
+            if self.assemble:
+                sentence_ids = self.tokenizer(misses, add_special_tokens=False)["input_ids"]
+                encoded = [self._assembled(t, ids) for t, ids in zip(misses, sentence_ids)]
+            else:
+                encoded = [self._direct(t) for t in misses]
+            with self._lock:
+                for t, enc in zip(misses, encoded):
+                    found[t] = self._cache[t] = enc
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return [found[t] for t in texts]
+
+    def to_arrays(self, encodings: list[tuple]) -> dict:
+        """Right-pads a batch straight into int64 arrays, skipping tokenizer.pad."""
+        width = max(len(ids) for ids, _types in encodings)
+        input_ids = np.full((len(encodings), width), self.pad_id, dtype=np.int64)
+        attention_mask = np.zeros((len(encodings), width), dtype=np.int64)
+        token_type_ids = np.zeros((len(encodings), width), dtype=np.int64) if self.with_token_types else None
+        for row, (ids, types) in enumerate(encodings):
+            input_ids[row, :len(ids)] = ids
+            attention_mask[row, :len(ids)] = 1
+            if token_type_ids is not None:
+                token_type_ids[row, :len(types)] = types
+        arrays = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if token_type_ids is not None:
+            arrays["token_type_ids"] = token_type_ids
+        return arrays
+
+    def to_tensors(self, encodings: list[tuple]) -> dict:
+        import torch
+        return {k: torch.from_numpy(v) for k, v in self.to_arrays(encodings).items()}
+
+    def cache_info(self) -> dict:
+        return {"entries": len(self._cache), "max_entries": self.cache_size}
+
+
+def _pair_ids(tokenizer, premise: str, max_length: int) -> list:
+    return [tokenizer(premise, p, truncation=True, max_length=max_length)["input_ids"] for p in PROBE_SENTENCES]
+
+
+def select_tokenizer(model_id: str, slow_tokenizer, premise: str, max_length: int):
+    """
+    The Rust tokenizer for model_id if it encodes the probe pairs exactly like
+    the slow reference tokenizer (or NLI_FAST_TOKENIZER=1), else the slow one.
+    """
+    if NLI_FAST_TOKENIZER in ("0", "false", "no") or getattr(slow_tokenizer, "is_fast", False):
+        return slow_tokenizer
+    try:
+        from transformers import AutoTokenizer
+        fast = AutoTokenizer.from_pretrained(model_id, use_fast=True)
+    except Exception as e:
+        logger.info("⚠️ No fast tokenizer for %s: %s", model_id, e)
+        return slow_tokenizer
+    if not fast.is_fast:
+        return slow_tokenizer
+    if NLI_FAST_TOKENIZER in ("1", "true", "yes"):
+        return fast
+    if _pair_ids(fast, premise, max_length) == _pair_ids(slow_tokenizer, premise, max_length):
+        logger.info("⚡ Using the fast tokenizer for %s", model_id)
+        return fast
+    logger.warning("⚠️ Fast tokenizer for %s differs from the slow one on the probe set; keeping the slow one",
+                   model_id)
+    return slow_tokenizer
+
+
+_encoders = {}
+_encoders_lock = threading.Lock()
+
+
+def get_encoder(mode: str, premise: str, max_length: int) -> PairEncoder:
+    """Shared PairEncoder for a classifier mode, built on first use."""
+    from claim_detection.model_registry import MODELS, get_model
+    key = ("auto" if mode == "auto" else "manual", premise, max_length)
+    if key not in _encoders:
+        with _encoders_lock:
+            if key not in _encoders:
+                slow_tokenizer, _model = get_model(key[0])
+                tokenizer = select_tokenizer(MODELS[key[0]].model_id, slow_tokenizer, premise, max_length)
+                _encoders[key] = PairEncoder(tokenizer, premise, max_length)
+    return _encoders[key]
@@ -0,0 +1,126 @@
+import os
+import re
+
+import numpy as np
+
+from utils import metrics
+from utils.disk_cache import get_default_cache, normalize_key
+
+PREFILTER_ENABLED = os.getenv("PREFILTER_ENABLED", "1").lower() not in ("0", "false", "no")
+CHECKWORTHY_THRESHOLD = float(os.getenv("CHECKWORTHY_THRESHOLD", "0.35"))
+MIN_WORDS = 6
+
+BOILERPLATE_RE = re.compile(
+    r"\b(subscribe|newsletter|sign up|read more|click here|follow us|all rights reserved|"
+    r"copyright|photographs? by|reporting by|editing by|contributed to this report|"
+    r"cookies?|terms of (use|service)|advertisement)\b|©",
+    re.IGNORECASE,
+)
+BYLINE_RE = re.compile(r"^\s*(by|written by|words by)\s+[A-Z][\w.'-]+(\s+[A-Z][\w.'-]+){0,3}\s*$")
+NUMBER_RE = re.compile(r"\d")
+FACTUAL_VERB_RE = re.compile(
+    r"\b(is|are|was|were|has|have|had|rose|fell|increased|decreased|reached|won|lost|killed|"
+    r"announced|reported|said|served|opened|raised|cut|became|located|founded|elected)\b",
+    re.IGNORECASE,
+)
+OPINION_RE = re.compile(
+    r"\b(i think|i believe|we think|in my opinion|should|might|may|could|perhaps|hope|wish|"
+    r"beautiful|amazing|terrible|great)\b",
+    re.IGNORECASE,
+)
+FIRST_PERSON_RE = re.compile(r"\b(i|me|my|we|our|us)\b", re.IGNORECASE)
+QUANTITY_LABELS = {"CARDINAL", "DATE", "PERCENT", "MONEY", "QUANTITY", "ORDINAL", "TIME"}
+NAME_LABELS = {"PERSON", "ORG", "GPE", "NORP", "LOC", "FAC", "EVENT", "LAW"}
+
+# Hand-tuned logistic weights over the feature columns built in _features()
+FEATURE_WEIGHTS = np.array([1.2, 0.6, 0.9, 0.8, -1.1, -0.7, -0.4, 0.3], dtype=np.float32)
+FEATURE_BIAS = -1.3
+
+
+def heuristic_reject(sentence: str, entities: list) -> str:
+    """Returns the name of the rule that rejects the sentence, or None if it passes."""
+    if len(sentence.split()) < MIN_WORDS:
+        return "too_short"
+    if BOILERPLATE_RE.search(sentence):
+        return "boilerplate"
+    if BYLINE_RE.match(sentence):
+        return "byline"
+    if sentence.rstrip().endswith("?"):
+        return "question"
+    if not entities and not NUMBER_RE.search(sentence):
+        return "no_entity_or_number"
+    return None
+
+
+def _features(sentences: list[str], entities: list[list]) -> np.ndarray:
+    rows = []
+    for sentence, ents in zip(sentences, entities):
+        labels = {label for _, label in ents}
+        words = len(sentence.split())
+        rows.append((
+            bool(NUMBER_RE.search(sentence)),
+            min(len([1 for _, label in ents if label in NAME_LABELS]), 3) / 3,
+            bool(labels & QUANTITY_LABELS),
+            bool(FACTUAL_VERB_RE.search(sentence)),
+            bool(OPINION_RE.search(sentence)),
+            bool(FIRST_PERSON_RE.search(sentence)),
+            sentence.count('"') + sentence.count("“") >= 2,
+            min(words, 40) / 40,
+        ))
+    return np.asarray(rows, dtype=np.float32).reshape(len(rows), len(FEATURE_WEIGHTS))
+
+
+def checkworthiness_scores(sentences: list[str], entities: list[list]) -> np.ndarray:
+    """Vectorized local check-worthiness estimate in [0, 1] for every sentence."""
+    if not sentences:
+        return np.zeros(0, dtype=np.float32)
+    logits = _features(sentences, entities) @ FEATURE_WEIGHTS + FEATURE_BIAS
+    return 1 / (1 + np.exp(-logits))
+
+
+def cached_claimbuster_score(sentence: str):
+    """ClaimBuster score from the on-disk cache, without ever calling the API."""
+    hit, value = get_default_cache().get("claimbuster", normalize_key(sentence))
+    return value if hit else None
+
+
+def run_cascade(parsed: list[tuple[str, list]], threshold: float = None) -> dict:
+    """
+    Staged cheap filter over (sentence, entities) pairs. Stage 1 applies the
+    heuristic rules, stage 2 the check-worthiness score (the cached ClaimBuster
+    score when there is one, otherwise the local scorer). Returns per-sentence
+    keep flags, the stage that eliminated each dropped sentence, the scores, and
+    how many sentences each stage eliminated.
+    """
+    threshold = CHECKWORTHY_THRESHOLD if threshold is None else threshold
+    sentences = [s for s, _ in parsed]
+    entities = [e or [] for _, e in parsed]
+
+    eliminated_by = [heuristic_reject(s, e) for s, e in zip(sentences, entities)]
+    local_scores = checkworthiness_scores(sentences, entities)
+    scores = []
+    for i, sentence in enumerate(sentences):
+        cb_score = cached_claimbuster_score(sentence) if eliminated_by[i] is None else None
+        score = float(cb_score) if cb_score is not None else float(local_scores[i])
+        scores.append(score)
+        if eliminated_by[i] is None and score < threshold:
+            eliminated_by[i] = "low_checkworthiness"
+
+    counts = {"input": len(sentences), "heuristics": 0, "scorer": 0}
+    for reason in eliminated_by:
+        if reason == "low_checkworthiness":
+            counts["scorer"] += 1
+        elif reason is not None:
+            counts["heuristics"] += 1
+    counts["kept"] = counts["input"] - counts["heuristics"] - counts["scorer"]
+
+    metrics.incr("prefilter.input", counts["input"])
+    metrics.incr("prefilter.eliminated.heuristics", counts["heuristics"])
+    metrics.incr("prefilter.eliminated.scorer", counts["scorer"])
+
+    return {
+        "keep": [reason is None for reason in eliminated_by],
+        "eliminated_by": eliminated_by,
+        "scores": scores,
+        "counts": counts,
+    }
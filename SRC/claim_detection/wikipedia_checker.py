@@ -1,5 +1,8 @@
+import logging
 import wikipedia
 
+logger = logging.getLogger(__name__)
+
 def check_with_wikipedia(claim: str) -> str:
     try:
         results = wikipedia.search(claim)
@@ -9,12 +12,12 @@ def check_with_wikipedia(claim: str) -> str:
         summary = wikipedia.summary(results[0], sentences=2).lower()
         claim_lower = claim.lower()
 
-        print(f"🔍 Wiki Match Summary: {summary}")
+        logger.debug("🔍 Wiki Match Summary: %s", summary)
 
         if claim_lower in summary or any(word in summary for word in claim_lower.split()):
             return "REAL"
         else:
             return "UNSURE"
     except Exception as e:
-        print(f"⚠️ Wikipedia Error: {e}")
+        logger.warning("⚠️ Wikipedia Error: %s", e)
         return "UNSURE"
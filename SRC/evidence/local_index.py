@@ -0,0 +1,279 @@
+"""
+Offline Wikipedia evidence index.
+
+Builds a BM25 inverted index over the sentences of a Wikipedia abstracts or
+summaries dump and serves top-k evidence sentences from memory-mapped NumPy
+arrays, so lookups take milliseconds and need no network.
+
+    python SRC/evidence/local_index.py build enwiki-latest-abstract.xml.gz data/wiki_index
+    python SRC/evidence/local_index.py build summaries.jsonl data/wiki_index --dense
+    python SRC/evidence/local_index.py query data/wiki_index "Narendra Modi prime minister"
+
+Accepted dumps: the enwiki abstract XML (optionally gzipped), or JSON lines with
+"title" and "abstract"/"summary"/"text". With --dense (needs
+sentence-transformers) sentence embeddings are stored too and used to rerank
+the BM25 candidates.
+"""
+import argparse
+import gzip
+import json
+import logging
+import math
+import os
+import re
+import threading
+import xml.etree.ElementTree as ET
+from collections import Counter
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+WIKIPEDIA_INDEX_DIR = os.getenv("WIKIPEDIA_INDEX_DIR", os.path.join(REPO_ROOT, "data", "wiki_index"))
+DENSE_MODEL = os.getenv("WIKIPEDIA_INDEX_DENSE_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+RERANK_CANDIDATES = 100
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have he her his in is it its of on or that the their "
+    "they this to was were which who will with".split()
+)
+TOKEN_RE = re.compile(r"\w+")
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'])")
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _open(path: str):
+    return gzip.open(path, "rt", encoding="utf-8") if path.endswith(".gz") else open(path, encoding="utf-8")
+
+
+def iter_dump(path: str):
+    """Yields (title, abstract) pairs from an abstract XML dump or a JSON lines file."""
+    if ".xml" in path:
+        with _open(path) as f:
+            for _, elem in ET.iterparse(f, events=("end",)):
+                if elem.tag == "doc":
+                    title = (elem.findtext("title") or "").removeprefix("Wikipedia: ")
+                    abstract = elem.findtext("abstract") or ""
+                    if title and abstract:
+                        yield title, abstract
+                    elem.clear()
+        return
+    with _open(path) as f:
+        for line in f:
+            if line.strip():
+                obj = json.loads(line)
+                text = obj.get("abstract") or obj.get("summary") or obj.get("text") or ""
+                if obj.get("title") and text:
+                    yield obj["title"], text
+
+
+def _write_strings(path_prefix: str, strings: list[str]):
+    offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+    with open(path_prefix + ".bin", "wb") as f:
+        for i, s in enumerate(strings):
+            data = s.encode("utf-8")
+            f.write(data)
+            offsets[i + 1] = offsets[i] + len(data)
+    np.save(path_prefix + "_offsets.npy", offsets)
+
+
+def build_index(dump_path: str, out_dir: str, dense: bool = False, min_sentence_chars: int = 20) -> dict:
+    """Builds the index files in out_dir and returns the metadata."""
+    os.makedirs(out_dir, exist_ok=True)
+    titles, sentences, sentence_title = [], [], []
+    postings = {}
+    doc_len = []
+
+    for title, abstract in iter_dump(dump_path):
+        title_id = len(titles)
+        titles.append(title)
+        for sentence in SENTENCE_RE.split(abstract.strip()):
+            sentence = sentence.strip()
+            if len(sentence) < min_sentence_chars:
+                continue
+            doc_id = len(sentences)
+            # Index the title with each sentence so "Modi prime minister" finds "He has served as ..."
+            tokens = tokenize(title) + tokenize(sentence)
+            for term, tf in Counter(tokens).items():
+                postings.setdefault(term, []).append((doc_id, tf))
+            sentences.append(sentence)
+            sentence_title.append(title_id)
+            doc_len.append(len(tokens))
+
+    vocab = sorted(postings)
+    offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+    for i, term in enumerate(vocab):
+        offsets[i + 1] = offsets[i] + len(postings[term])
+    docs = np.empty(offsets[-1], dtype=np.int32)
+    tfs = np.empty(offsets[-1], dtype=np.uint16)
+    for i, term in enumerate(vocab):
+        plist = postings.pop(term)
+        docs[offsets[i]:offsets[i + 1]] = [d for d, _ in plist]
+        tfs[offsets[i]:offsets[i + 1]] = [min(tf, 65535) for _, tf in plist]
+
+    np.save(os.path.join(out_dir, "postings_offsets.npy"), offsets)
+    np.save(os.path.join(out_dir, "postings_docs.npy"), docs)
+    np.save(os.path.join(out_dir, "postings_tf.npy"), tfs)
+    np.save(os.path.join(out_dir, "doc_len.npy"), np.asarray(doc_len, dtype=np.int32))
+    np.save(os.path.join(out_dir, "sentence_title.npy"), np.asarray(sentence_title, dtype=np.int32))
+    _write_strings(os.path.join(out_dir, "sentences"), sentences)
+    _write_strings(os.path.join(out_dir, "titles"), titles)
+    with open(os.path.join(out_dir, "vocab.json"), "w", encoding="utf-8") as f:
+        json.dump(vocab, f)
+
+    if dense:
+        from sentence_transformers import SentenceTransformer
+        encoder = SentenceTransformer(DENSE_MODEL)
+        vectors = encoder.encode(sentences, batch_size=256, normalize_embeddings=True, show_progress_bar=True)
+        np.save(os.path.join(out_dir, "dense.npy"), vectors.astype(np.float16))
+
+    meta = {
+        "documents": len(sentences),
+        "titles": len(titles),
+        "terms": len(vocab),
+        "avgdl": float(np.mean(doc_len)) if doc_len else 0.0,
+        "dense_model": DENSE_MODEL if dense else None,
+        "source": os.path.basename(dump_path),
+    }
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+class LocalWikipediaIndex:
+    """Read side of the index. Arrays are memory-mapped, so opening is cheap and pages load on demand."""
+
+    def __init__(self, index_dir: str):
+        def load(name):
+            return np.load(os.path.join(index_dir, name), mmap_mode="r")
+
+        with open(os.path.join(index_dir, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        with open(os.path.join(index_dir, "vocab.json"), encoding="utf-8") as f:
+            self.term_ids = {term: i for i, term in enumerate(json.load(f))}
+
+        self.offsets = load("postings_offsets.npy")
+        self.docs = load("postings_docs.npy")
+        self.tfs = load("postings_tf.npy")
+        self.doc_len = load("doc_len.npy")
+        self.sentence_title = load("sentence_title.npy")
+        self.sentence_offsets = load("sentences_offsets.npy")
+        self.title_offsets = load("titles_offsets.npy")
+        self.sentence_bytes = np.memmap(os.path.join(index_dir, "sentences.bin"), dtype=np.uint8, mode="r") \
+            if self.sentence_offsets[-1] else np.zeros(0, dtype=np.uint8)
+        self.title_bytes = np.memmap(os.path.join(index_dir, "titles.bin"), dtype=np.uint8, mode="r") \
+            if self.title_offsets[-1] else np.zeros(0, dtype=np.uint8)
+
+        dense_path = os.path.join(index_dir, "dense.npy")
+        self.dense = np.load(dense_path, mmap_mode="r") if os.path.exists(dense_path) else None
+        self._encoder = None
+
+    @staticmethod
+    def _string(data, offsets, i: int) -> str:
+        return bytes(data[offsets[i]:offsets[i + 1]]).decode("utf-8")
+
+    def sentence(self, doc_id: int) -> str:
+        return self._string(self.sentence_bytes, self.sentence_offsets, doc_id)
+
+    def title(self, doc_id: int) -> str:
+        return self._string(self.title_bytes, self.title_offsets, int(self.sentence_title[doc_id]))
+
+    def bm25(self, query: str, k: int) -> list[tuple[int, float]]:
+        n_docs = self.meta["documents"]
+        avgdl = self.meta["avgdl"] or 1.0
+        doc_parts, score_parts = [], []
+        for term in set(tokenize(query)):
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                continue
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            docs = np.asarray(self.docs[start:end])
+            tf = np.asarray(self.tfs[start:end], dtype=np.float32)
+            idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_len[docs] / avgdl)
+            doc_parts.append(docs)
+            score_parts.append(idf * tf * (BM25_K1 + 1) / (tf + norm))
+        if not doc_parts:
+            return []
+
+        docs = np.concatenate(doc_parts)
+        unique_docs, inverse = np.unique(docs, return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(score_parts))
+        k = min(k, len(unique_docs))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(unique_docs[i]), float(scores[i])) for i in top]
+
+    def _rerank_dense(self, query: str, candidates: list[tuple[int, float]], k: int):
+        if self._encoder is None:
+            from sentence_transformers import SentenceTransformer
+            self._encoder = SentenceTransformer(self.meta["dense_model"])
+        q = self._encoder.encode([query], normalize_embeddings=True)[0].astype(np.float32)
+        ids = np.asarray([d for d, _ in candidates])
+        sims = np.asarray(self.dense[ids], dtype=np.float32) @ q
+        order = np.argsort(-sims)[:k]
+        return [(int(ids[i]), float(sims[i])) for i in order]
+
+    def summary(self, query: str, max_sentences: int = 3):
+        """Leading sentences of the best-matching article, or None. Stand-in for the REST summary endpoint."""
+        top = self.bm25(query, 1)
+        if not top:
+            return None
+        # Sentences are stored in dump order, so an article's sentences are contiguous
+        title_id = int(self.sentence_title[top[0][0]])
+        start = int(np.searchsorted(self.sentence_title, title_id, side="left"))
+        end = int(np.searchsorted(self.sentence_title, title_id, side="right"))
+        return " ".join(self.sentence(i) for i in range(start, min(end, start + max_sentences)))
+
+    def search(self, query: str, k: int = 3) -> list[dict]:
+        candidates = self.bm25(query, RERANK_CANDIDATES if self.dense is not None else k)
+        if self.dense is not None and candidates:
+            candidates = self._rerank_dense(query, candidates, k)
+        return [
+            {"title": self.title(doc_id), "sentence": self.sentence(doc_id), "score": score}
+            for doc_id, score in candidates[:k]
+        ]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_local_index() -> LocalWikipediaIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = LocalWikipediaIndex(WIKIPEDIA_INDEX_DIR)
+    return _index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the offline Wikipedia evidence index.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build")
+    build.add_argument("dump")
+    build.add_argument("out_dir", nargs="?", default=WIKIPEDIA_INDEX_DIR)
+    build.add_argument("--dense", action="store_true")
+    query = sub.add_parser("query")
+    query.add_argument("index_dir")
+    query.add_argument("text")
+    query.add_argument("-k", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        print(json.dumps(build_index(args.dump, args.out_dir, dense=args.dense), indent=2))
+    else:
+        for hit in LocalWikipediaIndex(args.index_dir).search(args.text, args.k):
+            print(f"{hit['score']:7.3f}  [{hit['title']}] {hit['sentence']}")
+
+
+if __name__ == "__main__":
+    main()
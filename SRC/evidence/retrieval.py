@@ -1,42 +1,100 @@
 import os
+import logging
+import requests
 import wikipedia
 from dotenv import load_dotenv
-from serpapi import GoogleSearch
 import re
+from urllib.parse import urlparse
+from utils.disk_cache import disk_cached
+from utils import http_client, metrics
+
+logger = logging.getLogger(__name__)
 
 # Load .env variables (like SERPAPI_KEY)
 load_dotenv()
 SERPAPI_KEY = os.getenv("SERPAPI_KEY")
 
+# Endpoints are overridable so benchmarks and tests can point at local stand-ins
+WIKIPEDIA_API_URL = os.getenv("WIKIPEDIA_API_URL", "https://en.wikipedia.org/w/api.php")
+WIKIPEDIA_REST_URL = os.getenv("WIKIPEDIA_REST_URL", "https://en.wikipedia.org/api/rest_v1")
+wikipedia.wikipedia.API_URL = WIKIPEDIA_API_URL
+SERPAPI_BACKEND = os.getenv("SERPAPI_BACKEND", "https://serpapi.com")
+
+# live: Wikipedia API | local: offline index only | local+live: offline index, then the API on a miss
+EVIDENCE_BACKEND = os.getenv("EVIDENCE_BACKEND", "live")
+
 def clean_query(text: str) -> str:
     text = re.sub(r"[^\w\s]", "", text)  # Remove punctuation
     return " ".join(text.split()[:6])
 
+@disk_cached("wikipedia", offline_default=[])
 def retrieve_from_wikipedia(query: str, num_sentences: int = 3) -> list[str]:
     try:
         query = clean_query(query)
-        page = wikipedia.page(query)
+        metrics.incr("external_calls.wikipedia")
+        with metrics.stage("external.wikipedia"), http_client.source_call(
+                "wikipedia", urlparse(WIKIPEDIA_API_URL).netloc,
+                failures=(requests.RequestException, wikipedia.exceptions.HTTPTimeoutError)):
+            page = wikipedia.page(query)
         content = page.content
         sentences = [s.strip() for s in content.split(". ") if s.strip()]
         return sentences[:num_sentences]
+    except (wikipedia.exceptions.PageError, wikipedia.exceptions.DisambiguationError) as e:
+        # Wikipedia answered; there is just no single page for the query
+        logger.debug("🔎 No Wikipedia page for '%s': %s", query, e)
+        return []
     except Exception as e:
-        print(f"⚠️ Wikipedia failed for '{query}': {e}")
+        metrics.lookup_failed("wikipedia")
+        logger.debug("⚠️ Wikipedia failed for '%s': %s", query, e)
         return []
 
 
+def retrieve_from_local_index(query: str, num_sentences: int = 3) -> list[str]:
+    from evidence.local_index import get_local_index
+    try:
+        with metrics.stage("local_index"):
+            hits = get_local_index().search(query, k=num_sentences)
+        return [hit["sentence"] for hit in hits]
+    except FileNotFoundError as e:
+        logger.warning("⚠️ Local Wikipedia index unavailable: %s", e)
+        return []
+
+
+def local_wikipedia_summary(title: str):
+    from evidence.local_index import get_local_index
+    try:
+        with metrics.stage("local_index"):
+            return get_local_index().summary(title)
+    except FileNotFoundError as e:
+        logger.warning("⚠️ Local Wikipedia index unavailable: %s", e)
+        return None
+
+
+@disk_cached("serpapi", offline_default=[])
 def retrieve_from_google(query: str, num_results: int = 3) -> list[str]:
     if not SERPAPI_KEY:
         raise ValueError("Missing SERPAPI_KEY in .env")
 
     try:
-        search = GoogleSearch({
+        # Same query the serpapi package's GoogleSearch sends, but through the shared client
+        # so it gets the timeout, Retry-After handling, rate limit and circuit breaker
+        params = {
+            "engine": "google",
             "q": query,
             "api_key": SERPAPI_KEY,
             "num": num_results,
-            "hl": "en"
-        })
+            "hl": "en",
+            "output": "json",
+        }
 
-        results = search.get_dict()
+        metrics.incr("external_calls.serpapi")
+        with metrics.stage("external.serpapi"):
+            response = http_client.get(f"{SERPAPI_BACKEND}/search", params=params,
+                                       source="serpapi", api_key=SERPAPI_KEY)
+        response.raise_for_status()
+        results = response.json()
+        if results.get("error"):
+            raise ValueError(results["error"])
         snippets = []
         for result in results.get("organic_results", []):
             snippet = result.get("snippet")
@@ -45,19 +103,26 @@ def retrieve_from_google(query: str, num_results: int = 3) -> list[str]:
 
         return snippets
     except Exception as e:
-        print(f"❌ SerpAPI error: {e}")
+        metrics.lookup_failed("serpapi")
+        logger.warning("❌ SerpAPI error: %s", e)
         return []
 
 
-def retrieve_evidence(query: str, fallback_to_google: bool = True) -> list[str]:
-    print(f"🔎 Trying Wikipedia for: {query}")
-    wiki_results = retrieve_from_wikipedia(query)
+def retrieve_evidence(query: str, fallback_to_google: bool = True, backend: str = None) -> list[str]:
+    backend = backend or EVIDENCE_BACKEND
+    wiki_results = []
+    if backend in ("local", "local+live"):
+        logger.debug("🔎 Trying local Wikipedia index for: %s", query)
+        wiki_results = retrieve_from_local_index(query)
+    if not wiki_results and backend in ("live", "local+live"):
+        logger.debug("🔎 Trying Wikipedia for: %s", query)
+        wiki_results = retrieve_from_wikipedia(query)
 
     if wiki_results:
-        print(f"✅ Wikipedia success: {len(wiki_results)} sentences found")
+        logger.debug("✅ Wikipedia success: %d sentences found", len(wiki_results))
         return wiki_results
     elif fallback_to_google:
-        print(f"🔁 Falling back to Google search for: {query}")
+        logger.debug("🔁 Falling back to Google search for: %s", query)
         return retrieve_from_google(query)
     else:
         return []
@@ -0,0 +1,106 @@
+import threading
+from collections import Counter
+from concurrent.futures import Future
+
+from claim_detection.claimbuster_client import get_claimbuster_score
+from claim_detection.entity_resolver import fetch_wikipedia_summary, resolve_entities
+from evidence.retrieval import retrieve_evidence
+from utils import metrics
+
+
+class ArticleContext:
+    """
+    Per-article memo for external lookups. Every stage of the pipeline asks the
+    context instead of calling ClaimBuster / evidence retrieval directly, so each
+    lookup runs at most once per unique sentence. Safe to share between the
+    threads of the lookup stage: concurrent requests for the same key wait on
+    the first one instead of issuing a second call.
+    """
+
+    def __init__(self):
+        self._store = {}
+        self._lock = threading.Lock()
+        self.hits = Counter()
+        self.misses = Counter()
+        # Keys whose lookup hit an upstream error and returned a stand-in value
+        self._failed = set()
+
+    def _lookup(self, source: str, key, fetch):
+        cache_key = (source, key)
+        owner = False
+        with self._lock:
+            pending = self._store.get(cache_key)
+            if pending is not None:
+                self.hits[source] += 1
+                metrics.incr(f"memo.{source}.hit")
+            else:
+                self.misses[source] += 1
+                metrics.incr(f"memo.{source}.miss")
+                pending = self._store[cache_key] = Future()
+                owner = True
+        if not owner:
+            value = pending.result()
+            if cache_key in self._failed:
+                # The failure was recorded wherever the lookup ran, e.g. a prefetch thread
+                metrics.mark_failed(source)
+            return value
+
+        try:
+            with metrics.track_failures() as failures:
+                value = fetch()
+            if failures:
+                self._failed.add(cache_key)
+            pending.set_result(value)
+        except Exception as e:
+            # Let a later caller retry rather than caching the failure
+            with self._lock:
+                self._store.pop(cache_key, None)
+            pending.set_exception(e)
+        return pending.result()
+
+    def claimbuster_score(self, sentence: str) -> float:
+        return self._lookup("claimbuster", sentence, lambda: get_claimbuster_score(sentence))
+
+    def evidence(self, query: str, fallback_to_google: bool = True) -> list[str]:
+        return self._lookup(
+            "evidence", (query, fallback_to_google),
+            lambda: retrieve_evidence(query, fallback_to_google=fallback_to_google),
+        )
+
+    def wiki_summary(self, title: str):
+        return self._lookup("wiki_summary", title, lambda: fetch_wikipedia_summary(title))
+
+    def resolve_entities(self, names):
+        """
+        Bulk-resolves the Wikipedia summaries of every entity not yet in the
+        memo. The names are claimed up front, so a sentence that asks for one
+        of them meanwhile waits on the batch instead of fetching it alone.
+        """
+        claimed = {}
+        with self._lock:
+            for name in dict.fromkeys(n for n in names if n and n.strip()):
+                if ("wiki_summary", name) not in self._store:
+                    claimed[name] = self._store[("wiki_summary", name)] = Future()
+        if claimed:
+            try:
+                with metrics.track_failures() as failures:
+                    resolved = resolve_entities(list(claimed))
+            except Exception as e:
+                with self._lock:
+                    for name in claimed:
+                        self._store.pop(("wiki_summary", name), None)
+                for future in claimed.values():
+                    future.set_exception(e)
+                raise
+            if failures:
+                # Failures aren't attributed per name; treat the whole batch as degraded
+                self._failed.update(("wiki_summary", name) for name in claimed)
+            for name, future in claimed.items():
+                future.set_result(resolved.get(name.strip()))
+
+    def stats(self) -> dict:
+        sources = sorted(set(self.hits) | set(self.misses))
+        return {
+            source: {"hits": self.hits[source], "misses": self.misses[source]}
+            for source in sources
+        }
@@ -0,0 +1,275 @@
+"""
+Bulk scoring CLI: streams URLs or raw texts through the article pipeline and
+writes results as they finish.
+
+    python SRC/pipeline/bulk.py urls.txt -o results.jsonl
+    cat feed.jsonl | python SRC/pipeline/bulk.py - -o results.parquet --format parquet
+
+Each input line is a URL, a raw text, or a JSON object with "url" or "text"
+(and an optional "id"). Fetching, spaCy parsing and model inference run as
+separate stages connected by bounded queues, so memory stays flat however
+large the input is. Completed input indices are appended to a checkpoint file
+(default: <output>.ckpt); rerunning with --resume skips them. Parquet output
+goes to numbered part files next to the output path (results.part001.parquet,
+...), each closed before its inputs are checkpointed.
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils.article_fetcher import extract_article_from_url
+from pipeline.full_pipeline import parse_article, score_sentences
+from pipeline.result_table import ResultTable
+from utils.metrics import configure_logging
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+def parse_input_line(line: str):
+    """
+    Returns (kind, value, record_id) for one input line, or None for blank
+    lines. Raises ValueError for malformed JSON or objects without url/text.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith("{"):
+        obj = json.loads(line)
+        if "url" in obj:
+            return "url", obj["url"], obj.get("id")
+        if "text" in obj:
+            return "text", obj["text"], obj.get("id")
+        raise ValueError("JSON input needs a \"url\" or \"text\" field")
+    if line.startswith(("http://", "https://")):
+        return "url", line, None
+    return "text", line, None
+
+
+def load_checkpoint(path: str) -> set:
+    if not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        return {int(line) for line in f if line.strip()}
+
+
+class JsonlWriter:
+    def __init__(self, path: str, append: bool):
+        self._file = sys.stdout if path == "-" else open(path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, record: dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        return True
+
+    def close(self):
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+class ParquetWriter:
+    """
+    One row per sentence. Records are buffered in a ResultTable, so labels
+    stay interned and numeric columns go to Arrow without a per-row dict.
+    Each flush writes a complete part file (<stem>.partNNN<ext>): a Parquet
+    file is unreadable until its footer is written, so a flushed batch is only
+    reported durable once its own file is closed.
+    """
+
+    def __init__(self, path: str, append: bool, row_group_size: int = 5000):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pq = pq
+        self._stem, self._ext = os.path.splitext(path)
+        if not append:
+            for old in glob.glob(f"{glob.escape(self._stem)}.part*{self._ext}"):
+                os.remove(old)
+        # Parquet files cannot be appended to, so a resumed run carries on after the existing parts
+        self._part = 0
+        label = pa.dictionary(pa.int8(), pa.string())
+        self._schema = pa.schema([
+            ("index", pa.int64()), ("id", pa.string()), ("input", pa.string()),
+            ("sentence", pa.string()), ("score", pa.float64()), ("verdict", label),
+            ("claim_type", label), ("prefilter", label), ("prefilter_score", pa.float64()),
+            ("evidence", pa.list_(pa.string())),
+            ("entities", pa.string()), ("error", pa.string()),
+        ])
+        self._table = ResultTable()
+        self._row_group_size = row_group_size
+
+    def write(self, record: dict):
+        """Returns True once the buffered records are in a closed part file."""
+        self._table.extend(record.get("results") or [], index=record["index"], id=record.get("id"),
+                           input=record["input"], error=record.get("error"))
+        if len(self._table) >= self._row_group_size:
+            self.flush()
+            return True
+        return False
+
+    def flush(self):
+        if len(self._table):
+            path = self._next_part_path()
+            self._pq.write_table(self._table.to_arrow(self._schema.names, schema=self._schema), path)
+            self._table = ResultTable()
+
+    def _next_part_path(self) -> str:
+        while True:
+            self._part += 1
+            path = f"{self._stem}.part{self._part:03d}{self._ext}"
+            if not os.path.exists(path):
+                return path
+
+    def close(self):
+        self.flush()
+
+
+def _fetch_worker(inbox: queue.Queue, outbox: queue.Queue):
+    while (item := inbox.get()) is not _DONE:
+        index, kind, value, record_id = item
+        try:
+            text = extract_article_from_url(value) if kind == "url" else value
+            outbox.put((index, value, record_id, text, None))
+        except Exception as e:
+            outbox.put((index, value, record_id, None, f"fetch failed: {e}"))
+    outbox.put(_DONE)
+
+
+def _parse_worker(inbox: queue.Queue, outbox: queue.Queue, fetch_workers: int):
+    finished = 0
+    while finished < fetch_workers:
+        item = inbox.get()
+        if item is _DONE:
+            finished += 1
+            continue
+        index, value, record_id, text, error = item
+        parsed = None
+        if error is None:
+            try:
+                parsed = parse_article(text)
+            except Exception as e:
+                error = f"parse failed: {e}"
+        outbox.put((index, value, record_id, parsed, error))
+    outbox.put(_DONE)
+
+
+def _score_worker(inbox: queue.Queue, outbox: queue.Queue):
+    while (item := inbox.get()) is not _DONE:
+        index, value, record_id, parsed, error = item
+        start = time.perf_counter()
+        results = []
+        if error is None:
+            try:
+                results = score_sentences(parsed)
+            except Exception as e:
+                error = f"scoring failed: {e}"
+        outbox.put({
+            "index": index, "id": record_id, "input": value, "results": results,
+            "error": error, "elapsed_s": round(time.perf_counter() - start, 3),
+        })
+    outbox.put(_DONE)
+
+
+def run_bulk(lines, writer, checkpoint_path: str, done: set = frozenset(),
+             fetch_workers: int = 8, queue_size: int = 32) -> int:
+    """Streams input lines through the staged pipeline. Returns the number of records written."""
+    fetch_q = queue.Queue(maxsize=queue_size)
+    parse_q = queue.Queue(maxsize=queue_size)
+    score_q = queue.Queue(maxsize=queue_size)
+    write_q = queue.Queue(maxsize=queue_size)
+
+    threads = [threading.Thread(target=_fetch_worker, args=(fetch_q, parse_q), daemon=True)
+               for _ in range(fetch_workers)]
+    threads.append(threading.Thread(target=_parse_worker, args=(parse_q, score_q, fetch_workers), daemon=True))
+    threads.append(threading.Thread(target=_score_worker, args=(score_q, write_q), daemon=True))
+    for t in threads:
+        t.start()
+
+    def feed():
+        try:
+            for index, line in enumerate(lines):
+                if index in done:
+                    continue
+                try:
+                    parsed = parse_input_line(line)
+                except ValueError as e:
+                    # Skips fetching; the error record still flows through to the writer and checkpoint
+                    parse_q.put((index, line.strip(), None, None, f"invalid input: {e}"))
+                    continue
+                if parsed is not None:
+                    fetch_q.put((index, *parsed))
+        except Exception as e:
+            logger.error("❌ Reading input failed: %s", e)
+        finally:
+            for _ in range(fetch_workers):
+                fetch_q.put(_DONE)
+
+    threading.Thread(target=feed, daemon=True).start()
+
+    written = 0
+    pending = []
+    with open(checkpoint_path, "a") as checkpoint:
+        while (record := write_q.get()) is not _DONE:
+            pending.append(record["index"])
+            if writer.write(record):
+                # Only checkpoint what the writer has actually flushed
+                checkpoint.writelines(f"{i}\n" for i in pending)
+                checkpoint.flush()
+                pending = []
+            written += 1
+            if record["error"]:
+                logger.warning("⚠️ [%d] %s", record["index"], record["error"])
+            else:
+                logger.info("✅ [%d] %d sentences in %ss", record["index"], len(record["results"]),
+                            record["elapsed_s"])
+        writer.close()
+        checkpoint.writelines(f"{i}\n" for i in pending)
+
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score many articles through the fake news pipeline.")
+    parser.add_argument("input", help="Input file with one URL / text / JSON object per line, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="Output path, or - for stdout (jsonl only)")
+    parser.add_argument("--format", choices=("jsonl", "parquet"), default=None,
+                        help="Defaults to the output file extension")
+    parser.add_argument("--checkpoint", default=None, help="Defaults to <output>.ckpt")
+    parser.add_argument("--resume", action="store_true", help="Skip inputs recorded in the checkpoint")
+    parser.add_argument("--fetch-workers", type=int, default=8)
+    parser.add_argument("--queue-size", type=int, default=32)
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    fmt = args.format or ("parquet" if args.output.endswith(".parquet") else "jsonl")
+    if fmt == "parquet" and args.output == "-":
+        parser.error("parquet output needs a file path")
+    checkpoint_path = args.checkpoint or (
+        (args.output if args.output != "-" else "bulk_stdout") + ".ckpt"
+    )
+    done = load_checkpoint(checkpoint_path) if args.resume else set()
+    if not args.resume and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    writer = ParquetWriter(args.output, append=args.resume) if fmt == "parquet" \
+        else JsonlWriter(args.output, append=args.resume)
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        written = run_bulk(source, writer, checkpoint_path, done,
+                           fetch_workers=args.fetch_workers, queue_size=args.queue_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    logger.info("📦 Wrote %d records (%d skipped from checkpoint)", written, len(done))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,338 @@
-from utils.article_fetcher import extract_article_from_url
-from utils.text_preprocessor import split_into_sentences
-from ner.ner_pipeline import extract_named_entities
-from evidence.retrieval import retrieve_evidence
-from claim_detection.claim_classifier import classify_claim_auto
-from claim_detection.claimbuster_client import get_claimbuster_score
+import itertools
+import logging
+import os
+from utils.article_fetcher import extract_article_from_url, FAILED_TEXT
+from utils.text_preprocessor import split_into_sentences_with_entities, iter_sentences_with_entities, CHUNK_CHARS
+from utils import metrics
+from claim_detection.claim_classifier import classify_claim_auto, classify_nli_batch
 from claim_detection.claim_classifier import classify_manual_text
+from claim_detection.claim_cache import get_claim_cache, CLAIM_CACHE_ENABLED
+from claim_detection.prefilter import run_cascade, PREFILTER_ENABLED
+from pipeline.article_context import ArticleContext
+from pipeline.lookup_stage import prefetch_lookups, start_prefetch
+from pipeline.result_store import get_result_store, url_key, content_key, RESULT_STORE_ENABLED
 
+logger = logging.getLogger(__name__)
 
-def run_pipeline_from_url(url: str):
-    mode = "article"
-    text = extract_article_from_url(url)
-    print(f"\n📄 Extracted article:\n{text}\n")
+# Live blogs and transcripts can run to thousands of sentences; score only the first N
+MAX_SENTENCES_PER_ARTICLE = int(os.getenv("MAX_SENTENCES_PER_ARTICLE", "1500"))
+# Parsed sentences scored per step in chunked mode
+CHUNK_SENTENCES = int(os.getenv("CHUNK_SENTENCES", "64"))
 
-    raw_sentences = split_into_sentences(text)
-    sentences = [s.strip().replace("\n", " ") for s in raw_sentences if s.strip()]
-    print(f"\n📝 Sentences extracted ({len(sentences)}):\n{sentences}\n")
 
-    results = []
+def iter_parse_article(text: str, max_sentences: int = None):
+    """
+    Lazily yields (sentence, entities) pairs. Long texts are parsed in
+    paragraph-aligned chunks, and parsing stops at max_sentences
+    (MAX_SENTENCES_PER_ARTICLE by default, 0 for no cap).
+    """
+    max_sentences = MAX_SENTENCES_PER_ARTICLE if max_sentences is None else max_sentences
+    count = 0
+    for s, ents in iter_sentences_with_entities(text):
+        s = s.strip().replace("\n", " ")
+        if not s:
+            continue
+        if max_sentences and count >= max_sentences:
+            metrics.incr("sentences.capped")
+            logger.warning("✂️ Article capped at %d sentences", max_sentences)
+            return
+        count += 1
+        yield s, ents
+
+def parse_article(text: str, max_sentences: int = None) -> list[tuple[str, list]]:
+    """Splits article text into (sentence, entities) pairs; each sentence comes from a single spaCy parse."""
+    with metrics.stage("parse"):
+        return list(iter_parse_article(text, max_sentences))
+
+def iter_article_chunks(text: str, chunk_sentences: int = None, max_sentences: int = None):
+    """Yields the parsed article as lists of at most chunk_sentences (sentence, entities) pairs."""
+    parsed = iter_parse_article(text, max_sentences)
+    while True:
+        with metrics.stage("parse"):
+            chunk = list(itertools.islice(parsed, chunk_sentences or CHUNK_SENTENCES))
+        if not chunk:
+            return
+        yield chunk
+
+STREAM_MAX_WAVE = 16
+
+
+def _nli_waves(count: int, first_wave: int = None):
+    """
+    Wave sizes for NLI over `count` pending sentences. Streaming starts with a
+    single sentence so the first result is ready after one forward pass, then
+    doubles up to STREAM_MAX_WAVE to regain batching efficiency. Without
+    first_wave everything runs as one batch.
+    """
+    if not first_wave:
+        if count:
+            yield count
+        return
+    size = first_wave
+    while count > 0:
+        yield min(size, count)
+        count -= size
+        size = min(size * 2, STREAM_MAX_WAVE)
+
+
+def _classify_nli(texts: list[str]) -> list[dict]:
+    return classify_nli_batch(texts, mode="auto")
+
+def iter_score_sentences(parsed: list[tuple[str, list]], prefilter: bool = None, first_wave: int = 1,
+                         nli_fn=None, force_refresh: bool = False):
+    """
+    Generator version of score_sentences. Yields (index, result) pairs as soon
+    as each sentence is decided, in priority order: claim-cache hits first, then
+    the remaining sentences by descending check-worthiness, and sentences the
+    prefilter dropped last. ClaimBuster and evidence lookups for every pending
+    sentence are started up front in that same order, so they overlap with NLI.
+
+    Sentences that match a previously verified claim (exactly or as a near
+    duplicate) reuse its score, evidence and verdict and skip the heavy stages.
+    With the prefilter on, the check-worthiness cascade drops boilerplate and
+    low-value sentences before any of the heavy stages run.
+
+    nli_fn(texts) -> results replaces the direct NLI call, e.g. with the
+    service's cross-request micro-batcher. force_refresh skips claim cache
+    reads and overwrites the entries with the fresh results.
+    """
+    nli_fn = nli_fn or _classify_nli
+    prefilter = PREFILTER_ENABLED if prefilter is None else prefilter
+    metrics.incr("sentences", len(parsed))
+    claim_cache = get_claim_cache()
+    use_cache = CLAIM_CACHE_ENABLED and not force_refresh
+    cached = [claim_cache.get(s, "article_result") if use_cache else None for s, _ in parsed]
+
+    # Rows decided without the heavy stages: claim cache hits and prefiltered sentences
+    decided = {i: dict(hit, prefilter=None) for i, hit in enumerate(cached) if hit is not None}
+    uncached = [i for i in range(len(parsed)) if i not in decided]
+    priority = {}
+    dropped = {}
+    if prefilter and uncached:
+        with metrics.stage("prefilter"):
+            cascade = run_cascade([parsed[i] for i in uncached])
+        logger.info("🧹 Prefilter: %s", cascade["counts"])
+        for i, keep, reason, score in zip(uncached, cascade["keep"], cascade["eliminated_by"], cascade["scores"]):
+            priority[i] = score
+            if not keep:
+                # No ClaimBuster call was made; the local estimate goes in its own field, not "score"
+                dropped[i] = {"score": None, "prefilter_score": round(score, 2), "evidence": [],
+                              "verdict": "Not significant", "claim_type": "UNSURE", "prefilter": reason}
+    pending = sorted((i for i in uncached if i not in dropped), key=lambda i: -priority.get(i, 0.0))
+
+    for i in sorted(decided, key=lambda i: -decided[i]["score"]):
+        yield i, dict(decided[i], sentence=parsed[i][0], entities=parsed[i][1])
+
+    context = ArticleContext()
+    lookups = start_prefetch([parsed[i][0] for i in pending], context, entities=[parsed[i][1] for i in pending])
+    try:
+        offset = 0
+        for wave in _nli_waves(len(pending), first_wave):
+            batch = pending[offset:offset + wave]
+            offset += wave
+            with metrics.stage("nli"):
+                nli_results = nli_fn([parsed[i][0] for i in batch])
+
+            for i, nli_result in zip(batch, nli_results):
+                sentence, entities = parsed[i]
+                with metrics.stage("classify"), metrics.track_failures() as failures:
+                    score = context.claimbuster_score(sentence)
+                    claim_type = classify_claim_auto(sentence, nli_result=nli_result, context=context,
+                                                     entities=entities, refresh=force_refresh)
+                    evidence = context.evidence(sentence) if score > 0.6 else []
 
-    for sentence in sentences:
-        entities = extract_named_entities(sentence)
-        score = get_claimbuster_score(sentence)
-        claim_type = classify_claim_auto(sentence)
-        evidence = retrieve_evidence(sentence) if score > 0.6 else []
-
-        results.append({
-            "sentence": sentence,
-            "entities": entities,
-            "score": round(score, 2),
-            "evidence": evidence,
-            "verdict": "Check-worthy" if score > 0.6 else "Not significant",
-            "claim_type": claim_type
-        })
+                result = {
+                    "sentence": sentence,
+                    "entities": entities,
+                    "score": round(score, 2),
+                    "evidence": evidence,
+                    "verdict": "Check-worthy" if score > 0.6 else "Not significant",
+                    "claim_type": claim_type,
+                    "prefilter": None
+                }
+                # A row built on a failed lookup (e.g. ClaimBuster down) is served but not remembered
+                if CLAIM_CACHE_ENABLED and not failures:
+                    claim_cache.put(sentence, {k: result[k] for k in ("score", "evidence", "verdict", "claim_type")},
+                                    "article_result")
+                yield i, result
+    finally:
+        lookups.shutdown(wait=False, cancel_futures=True)
 
+    for i in sorted(dropped, key=lambda i: -dropped[i]["prefilter_score"]):
+        yield i, dict(dropped[i], sentence=parsed[i][0], entities=parsed[i][1])
+
+    logger.info("📈 Lookup cache stats: %s, claim cache hit rate: %.2f", context.stats(), claim_cache.hit_rate())
+
+def score_sentences(parsed: list[tuple[str, list]], prefilter: bool = None, nli_fn=None,
+                    force_refresh: bool = False) -> list[dict]:
+    """Runs the full scoring for already parsed article sentences and returns results in article order."""
+    results = [None] * len(parsed)
+    for i, result in iter_score_sentences(parsed, prefilter=prefilter, first_wave=None, nli_fn=nli_fn,
+                                          force_refresh=force_refresh):
+        results[i] = result
     return results
 
-def run_pipeline_from_text_manual(text: str):
-    sentences = split_into_sentences(text)
-    results = []
+def iter_score_chunked(text: str, nli_fn=None, chunk_sentences: int = None, first_wave: int = 1,
+                       force_refresh: bool = False):
+    """
+    Bounded-memory scoring for long texts. The article is parsed and scored a
+    chunk of sentences at a time, so only one chunk's spaCy Doc, sentences and
+    lookups are alive at once. Yields (index, result) pairs chunk by chunk,
+    each chunk in check-worthiness order.
+    """
+    offset = 0
+    for chunk in iter_article_chunks(text, chunk_sentences):
+        for i, result in iter_score_sentences(chunk, first_wave=first_wave, nli_fn=nli_fn,
+                                              force_refresh=force_refresh):
+            yield offset + i, result
+        offset += len(chunk)
 
-    for sentence in sentences:
-        claim_type = classify_claim_auto(sentence, mode="manual")
-        results.append({
-            "sentence": sentence,
-            "score": 1.0,
-            "claim_type": claim_type,
-            "evidence": []
-        })
+def _score_text(text: str, nli_fn=None, force_refresh: bool = False) -> list[dict]:
+    """Scores a whole article, switching to chunked mode once it outgrows a single spaCy Doc."""
+    if len(text) <= CHUNK_CHARS:
+        # One spaCy parse yields both the sentences and their entity spans
+        parsed = parse_article(text)
+        logger.info("📝 Sentences extracted: %d", len(parsed))
+        return score_sentences(parsed, nli_fn=nli_fn, force_refresh=force_refresh)
 
+    results = []
+    for chunk in iter_article_chunks(text):
+        results.extend(score_sentences(chunk, nli_fn=nli_fn, force_refresh=force_refresh))
+    logger.info("📝 Scored %d sentences from %d chars in chunks", len(results), len(text))
     return results
 
-    
+def _stored_results(keys: list[str], force_refresh: bool = False):
+    """
+    Looks the keys up in the shared result store, first hit wins. A hit is
+    copied to the keys that missed, so e.g. a new URL for already scored
+    content is answered straight from its URL next time.
+    """
+    if not RESULT_STORE_ENABLED or force_refresh:
+        return None
+    store = get_result_store()
+    for n, key in enumerate(keys):
+        results = store.get(key)
+        if results is not None:
+            if n:
+                store.put(keys[:n], results)
+            logger.info("♻️ Served from result store: %s", key)
+            return results
+    return None
+
+def _store_results(keys: list[str], text: str, results: list[dict], failures: list = None):
+    # Failed fetches, empty articles and runs where a lookup failed are retried next time rather than cached
+    if failures:
+        logger.info("⏭️ Not storing results built on failed lookups: %s", sorted(set(failures)))
+        return
+    if RESULT_STORE_ENABLED and results and text != FAILED_TEXT:
+        get_result_store().put(keys, results)
+
+def run_pipeline_from_url(url: str, force_refresh: bool = False, nli_fn=None):
+    with metrics.collect_metrics(), metrics.stage("total"):
+        keys = [url_key(url)]
+        if (results := _stored_results(keys, force_refresh)) is not None:
+            return results
+
+        with metrics.stage("fetch"):
+            text = extract_article_from_url(url)
+        logger.debug("📄 Extracted article (%d chars): %.500s", len(text), text)
+        keys.append(content_key(text))
+        if (results := _stored_results(keys, force_refresh)) is not None:
+            return results
+
+        with metrics.track_failures() as failures:
+            results = _score_text(text, nli_fn=nli_fn, force_refresh=force_refresh)
+        _store_results(keys, text, results, failures)
+        return results
+
+def run_pipeline_from_text(text: str, force_refresh: bool = False, nli_fn=None):
+    """Article-mode scoring for text that has already been fetched, e.g. posted to the service."""
+    with metrics.collect_metrics(), metrics.stage("total"):
+        keys = [content_key(text)]
+        if (results := _stored_results(keys, force_refresh)) is not None:
+            return results
+        with metrics.track_failures() as failures:
+            results = _score_text(text, nli_fn=nli_fn, force_refresh=force_refresh)
+        _store_results(keys, text, results, failures)
+        return results
+
+def iter_pipeline_from_url(url: str, on_parsed=None, force_refresh: bool = False):
+    """
+    Streaming variant of run_pipeline_from_url: yields per-sentence results as
+    soon as each one is ready, highest check-worthiness first. on_parsed, if
+    given, is called with the sentence count once the article is split.
+    Each result carries its position in the article under "index".
+    Stored results are replayed in the same priority order. Articles too long
+    for one spaCy Doc stream chunk by chunk instead, and on_parsed gets None
+    since the count is only known at the end.
+    """
+    keys = [url_key(url)]
+    results = _stored_results(keys, force_refresh)
+    if results is None:
+        with metrics.stage("fetch"):
+            text = extract_article_from_url(url)
+        keys.append(content_key(text))
+        results = _stored_results(keys, force_refresh)
+
+    if results is not None:
+        if on_parsed:
+            on_parsed(len(results))
+        # Prefiltered rows have no score and replay last, as they streamed
+        order = sorted(range(len(results)),
+                       key=lambda i: (results[i]["score"] is None, -(results[i]["score"] or 0)))
+        for i in order:
+            yield dict(results[i], index=i)
+        return
+
+    if len(text) > CHUNK_CHARS:
+        if on_parsed:
+            on_parsed(None)
+        scored = iter_score_chunked(text, force_refresh=force_refresh)
+    else:
+        parsed = parse_article(text)
+        logger.info("📝 Sentences extracted: %d", len(parsed))
+        if on_parsed:
+            on_parsed(len(parsed))
+        scored = iter_score_sentences(parsed, force_refresh=force_refresh)
+    results = {}
+    with metrics.track_failures() as failures:
+        for i, result in scored:
+            results[i] = result
+            yield dict(result, index=i)
+    _store_results(keys, text, [results[i] for i in sorted(results)], failures)
+
+def run_pipeline_from_text_manual(text: str, force_refresh: bool = False, nli_fn=None):
+    with metrics.collect_metrics(), metrics.stage("total"):
+        keys = [content_key(text, mode="manual")]
+        if (results := _stored_results(keys, force_refresh)) is not None:
+            return results
+
+        with metrics.stage("parse"):
+            parsed = split_into_sentences_with_entities(text)
+        entities_by_sentence = dict(parsed)
+        sentences = [s for s, _ in parsed]
+        claims = [s for s in sentences if s.strip()]
+        metrics.incr("sentences", len(claims))
+        with metrics.stage("nli"):
+            nli_by_sentence = dict(zip(claims, (nli_fn or _classify_nli)(claims)))
+        results = []
+        with metrics.track_failures() as failures:
+            with metrics.stage("lookups"):
+                context = prefetch_lookups(claims, ArticleContext(), with_evidence=False,
+                                           entities=[entities_by_sentence.get(s) for s in claims])
+
+            with metrics.stage("classify"):
+                for sentence in sentences:
+                    claim_type = classify_claim_auto(sentence, mode="manual",
+                                                     nli_result=nli_by_sentence.get(sentence), context=context,
+                                                     entities=entities_by_sentence.get(sentence),
+                                                     refresh=force_refresh)
+                    results.append({
+                        "sentence": sentence,
+                        "score": 1.0,
+                        "claim_type": claim_type,
+                        "evidence": []
+                    })
 
+        _store_results(keys, text, results, failures)
+        return results
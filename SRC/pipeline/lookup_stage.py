@@ -0,0 +1,79 @@
+import contextvars
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from pipeline.article_context import ArticleContext
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+LOOKUP_WORKERS = int(os.getenv("LOOKUP_WORKERS", "16"))
+
+
+def _detached(fn, *args):
+    # A prefetch only warms the context; its failures count against the rows that go on to use the
+    # value (ArticleContext flags those), not against whatever was being tracked when it was submitted
+    with metrics.track_failures(propagate=False):
+        return fn(*args)
+
+
+def _submit(pool, fn, *args):
+    # Worker threads don't inherit context variables; carry the metrics collector over
+    return pool.submit(contextvars.copy_context().run, _detached, fn, *args)
+
+
+def _log_failure(future):
+    if not future.cancelled() and future.exception() is not None:
+        # The sequential pass will retry the lookup and surface the error there
+        logger.warning("⚠️ Prefetch lookup failed: %s", future.exception())
+
+
+def _entity_names(entities) -> list[str]:
+    """Unique entity texts across sentences, from the (text, label) spans of the article parse."""
+    return list(dict.fromkeys(ent for spans in entities or [] for ent, _label in spans or []))
+
+
+def start_prefetch(sentences: list[str], context: ArticleContext, with_evidence: bool = True,
+                   max_workers: int = None, entities: list = None) -> ThreadPoolExecutor:
+    """
+    Non-blocking variant of prefetch_lookups for the streaming path. Lookups are
+    submitted in the given order, so callers pass sentences highest priority
+    first, and the per-sentence loop blocks only on the lookup it needs next
+    (the context dedupes in-flight calls). The caller owns the returned pool and
+    shuts it down once it is done reading from the context.
+    """
+    pool = ThreadPoolExecutor(max_workers=max_workers or LOOKUP_WORKERS)
+    if names := _entity_names(entities):
+        _submit(pool, context.resolve_entities, names).add_done_callback(_log_failure)
+    for s in dict.fromkeys(s for s in sentences if s.strip()):
+        _submit(pool, context.claimbuster_score, s).add_done_callback(_log_failure)
+        if with_evidence:
+            _submit(pool, context.evidence, s).add_done_callback(_log_failure)
+    return pool
+
+
+def prefetch_lookups(sentences: list[str], context: ArticleContext, with_evidence: bool = True,
+                     max_workers: int = None, entities: list = None) -> ArticleContext:
+    """
+    Fans out every sentence's ClaimBuster and evidence lookups over a bounded
+    thread pool and stores the results in the context. The per-sentence loop
+    that follows then reads from the memo instead of waiting on the network.
+    Per-host limits in utils.http_client keep each upstream from being flooded.
+    entities, the per-sentence (text, label) spans, are resolved against
+    Wikipedia in bulk alongside.
+    """
+    unique = list(dict.fromkeys(s for s in sentences if s.strip()))
+    if not unique:
+        return context
+
+    with ThreadPoolExecutor(max_workers=max_workers or LOOKUP_WORKERS) as pool:
+        futures = [_submit(pool, context.claimbuster_score, s) for s in unique]
+        if names := _entity_names(entities):
+            futures.append(_submit(pool, context.resolve_entities, names))
+        if with_evidence:
+            futures += [_submit(pool, context.evidence, s) for s in unique]
+        for future in as_completed(futures):
+            _log_failure(future)
+
+    return context
@@ -0,0 +1,81 @@
+import hashlib
+import os
+import threading
+from urllib.parse import urlsplit, urlunsplit
+
+from utils import metrics
+from utils.disk_cache import DiskCache, REPO_ROOT, normalize_key
+
+RESULT_STORE_ENABLED = os.getenv("RESULT_STORE_ENABLED", "1").lower() in ("1", "true", "yes")
+RESULT_STORE_PATH = os.getenv(
+    "RESULT_STORE_PATH", os.path.join(REPO_ROOT, "data", "cache", "results.sqlite3")
+)
+RESULT_STORE_MAX_ENTRIES = int(os.getenv("RESULT_STORE_MAX_ENTRIES", "2000"))
+RESULT_STORE_TTL = float(os.getenv("RESULT_STORE_TTL", str(6 * 3600)))
+
+SOURCE = "pipeline_results"
+
+
+def url_key(url: str) -> str:
+    """Scheme and host are case-insensitive and a trailing slash is dropped; the path keeps its case."""
+    parts = urlsplit(url.strip())
+    return "url:" + urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"),
+                                parts.query, parts.fragment))
+
+
+def content_key(text: str, mode: str = "article") -> str:
+    """Key on the article text itself, so the same story under different URLs is scored once."""
+    digest = hashlib.sha256(normalize_key(text).encode("utf-8")).hexdigest()
+    return f"{mode}:{digest}"
+
+
+class ResultStore:
+    """
+    Finished pipeline results, shared by every Streamlit session and worker
+    process on the host. Lives in its own SQLite file so max_entries bounds
+    articles rather than competing with the per-lookup cache entries.
+    """
+
+    def __init__(self, path: str = RESULT_STORE_PATH, max_entries: int = RESULT_STORE_MAX_ENTRIES,
+                 ttl: float = RESULT_STORE_TTL):
+        self.cache = DiskCache(path, max_entries=max_entries, ttls={SOURCE: ttl})
+
+    def get(self, key: str):
+        """Returns the stored result rows, or None on a miss or expired entry."""
+        hit, value = self.cache.get(SOURCE, key)
+        metrics.incr("result_store.hit" if hit else "result_store.miss")
+        return value if hit else None
+
+    def put(self, keys, results: list[dict]):
+        for key in keys:
+            self.cache.set(SOURCE, key, results)
+        # Writes are one per article, so evicting on each keeps the bound exact
+        self.cache.evict()
+
+    def invalidate(self, *keys):
+        for key in keys:
+            self.cache.delete(SOURCE, key)
+
+    def clear(self):
+        self.cache.clear(SOURCE)
+
+    def __len__(self):
+        return len(self.cache)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_result_store() -> ResultStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ResultStore()
+    return _store
+
+
+def served_from_cache(run_metrics) -> bool:
+    """True when a run collected with metrics.collect_metrics() was answered from the store."""
+    return run_metrics.counters.get("result_store.hit", 0) > 0
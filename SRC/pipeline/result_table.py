@@ -0,0 +1,262 @@
+import csv
+import io
+import json
+import math
+
+import numpy as np
+
+# Known labels get fixed codes; anything else is interned on first sight
+CATEGORIES = {
+    "claim_type": ["FAKE", "REAL", "UNSURE"],
+    "verdict": ["Check-worthy", "Not significant"],
+    "prefilter": [None, "too_short", "boilerplate", "byline", "question", "no_entity_or_number",
+                  "low_checkworthiness"],
+}
+COLUMNS = ("article", "sentence_index", "sentence", "score", "verdict", "claim_type", "prefilter",
+           "prefilter_score", "evidence", "entities")
+NUMERIC = ("article", "sentence_index", "score", "prefilter_score")
+
+
+class _Category:
+    """Interned string column: one small int code per row plus the label list."""
+
+    def __init__(self, labels):
+        self.labels = list(labels)
+        self.codes = {label: n for n, label in enumerate(self.labels)}
+
+    def code(self, label) -> int:
+        if label not in self.codes:
+            self.codes[label] = len(self.labels)
+            self.labels.append(label)
+        return self.codes[label]
+
+
+class ResultTable:
+    """
+    Columnar store for per-sentence results, many articles at a time. Scores
+    and positions are NumPy arrays, labels are interned int8 codes, and the
+    ragged evidence / entity lists sit in flat lists. Rows are appended as the
+    pipeline yields them; the NumPy columns are materialized on first read
+    after an append. Article-level fields (URL, id, error) live once per
+    article in `articles` rather than on every row.
+    """
+
+    def __init__(self):
+        self.articles = []
+        self.categories = {name: _Category(labels) for name, labels in CATEGORIES.items()}
+        self._article, self._position, self._score, self._prefilter_score = [], [], [], []
+        self._codes = {name: [] for name in CATEGORIES}
+        self.sentences, self.evidence, self.entities = [], [], []
+        self._arrays = None
+
+    def add_article(self, **meta) -> int:
+        self.articles.append(meta)
+        return len(self.articles) - 1
+
+    def append(self, result: dict, sentence_index: int = None, article: int = 0):
+        """Adds one pipeline result row; sentence_index defaults to result["index"], then the row number."""
+        if not self.articles:
+            self.add_article()
+        if sentence_index is None:
+            sentence_index = result.get("index", len(self._position))
+        self._article.append(article)
+        self._position.append(sentence_index)
+        self._score.append(math.nan if result.get("score") is None else result["score"])
+        self._prefilter_score.append(math.nan if result.get("prefilter_score") is None
+                                     else result["prefilter_score"])
+        for name, category in self.categories.items():
+            self._codes[name].append(category.code(result.get(name)))
+        self.sentences.append(result.get("sentence"))
+        self.evidence.append(result.get("evidence") or [])
+        self.entities.append(result.get("entities") or [])
+        self._arrays = None
+
+    def extend(self, results: list[dict], article: int = None, **meta) -> int:
+        """Adds one article's results in article order; an empty result list still records the article."""
+        if article is None:
+            article = self.add_article(**meta)
+        if not results:
+            self.append({}, sentence_index=-1, article=article)
+        for n, result in enumerate(results):
+            self.append(result, sentence_index=n, article=article)
+        return article
+
+    @classmethod
+    def from_results(cls, results: list[dict], **meta) -> "ResultTable":
+        table = cls()
+        if results:
+            table.extend(results, **meta)
+        return table
+
+    def _columns(self) -> dict:
+        if self._arrays is None:
+            arrays = {
+                "article": np.asarray(self._article, dtype=np.int32),
+                "sentence_index": np.asarray(self._position, dtype=np.int32),
+                "score": np.asarray(self._score, dtype=np.float64),
+                "prefilter_score": np.asarray(self._prefilter_score, dtype=np.float64),
+            }
+            for name, codes in self._codes.items():
+                arrays[name] = np.asarray(codes, dtype=np.int8)
+            self._arrays = arrays
+        return self._arrays
+
+    def __len__(self):
+        return len(self._score)
+
+    def view(self) -> "TableView":
+        return TableView(self, np.arange(len(self)), full=True)
+
+    def filter(self, min_score: float = None, claim_types=None, articles=None) -> "TableView":
+        return self.view().filter(min_score, claim_types, articles)
+
+    # The full table exports like a view over every row
+    def to_arrow(self, columns=COLUMNS, schema=None):
+        return self.view().to_arrow(columns, schema)
+
+    def to_parquet(self, target=None, columns=COLUMNS):
+        return self.view().to_parquet(target, columns)
+
+    def to_csv(self, target=None, columns=COLUMNS):
+        return self.view().to_csv(target, columns)
+
+    def to_jsonl(self, target=None, columns=COLUMNS):
+        return self.view().to_jsonl(target, columns)
+
+
+class TableView:
+    """A row selection over a ResultTable. Filtering and sorting only touch the row index array."""
+
+    def __init__(self, table: ResultTable, rows: np.ndarray, full: bool = False):
+        self.table = table
+        self.rows = rows
+        self.full = full
+
+    def _take(self, name: str) -> np.ndarray:
+        # Whole-table views hand out the column arrays themselves instead of a gathered copy
+        column = self.table._columns()[name]
+        return column if self.full else column[self.rows]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def filter(self, min_score: float = None, claim_types=None, articles=None) -> "TableView":
+        mask = self._take("sentence_index") >= 0
+        if min_score is not None:
+            mask &= self._take("score") >= min_score
+        if claim_types is not None:
+            codes = [self.table.categories["claim_type"].codes[t] for t in claim_types
+                     if t in self.table.categories["claim_type"].codes]
+            mask &= np.isin(self._take("claim_type"), codes)
+        if articles is not None:
+            mask &= np.isin(self._take("article"), list(articles))
+        return TableView(self.table, self.rows[mask])
+
+    def sort_by(self, column: str = "score", descending: bool = True) -> "TableView":
+        """Stable sort on a numeric column; rows without a value (NaN) go last either way."""
+        values = self._take(column)
+        # argsort puts NaN last, so negating for descending order keeps it there
+        order = np.argsort(-values if descending else values, kind="stable")
+        return TableView(self.table, self.rows[order])
+
+    def head(self, n: int) -> "TableView":
+        return TableView(self.table, self.rows[:n])
+
+    def counts(self, column: str = "claim_type") -> dict:
+        category = self.table.categories[column]
+        totals = np.bincount(self._take(column), minlength=len(category.labels))
+        return {label: int(n) for label, n in zip(category.labels, totals)}
+
+    def column(self, name: str) -> list:
+        """One column for the selected rows, labels decoded and ragged lists as-is."""
+        table = self.table
+        if name in table.categories:
+            labels = table.categories[name].labels
+            return [labels[c] for c in self._take(name)]
+        if name in NUMERIC:
+            return self._take(name).tolist()
+        if name in ("sentence", "evidence", "entities"):
+            source = {"sentence": table.sentences, "evidence": table.evidence, "entities": table.entities}[name]
+            return [source[r] for r in self.rows]
+        # Anything else is an article-level field
+        return [table.articles[a].get(name) for a in self._take("article")]
+
+    def __iter__(self):
+        """Row dicts, built one at a time for display; nothing is materialized up front."""
+        table = self.table
+        cols = table._columns()
+        labels = {name: category.labels for name, category in table.categories.items()}
+        for r in self.rows:
+            score, prefilter_score = float(cols["score"][r]), float(cols["prefilter_score"][r])
+            yield {
+                "sentence": table.sentences[r], "score": None if math.isnan(score) else score,
+                "verdict": labels["verdict"][cols["verdict"][r]],
+                "claim_type": labels["claim_type"][cols["claim_type"][r]],
+                "prefilter": labels["prefilter"][cols["prefilter"][r]],
+                "prefilter_score": None if math.isnan(prefilter_score) else prefilter_score,
+                "evidence": table.evidence[r], "entities": table.entities[r],
+                "index": int(cols["sentence_index"][r]), "article": int(cols["article"][r]),
+            }
+
+    def _export_column(self, name: str) -> list:
+        values = self.column(name)
+        if name == "entities":
+            return [json.dumps(v) for v in values]
+        if name in ("score", "prefilter_score"):
+            return [None if math.isnan(v) else v for v in values]
+        return values
+
+    def to_arrow(self, columns=COLUMNS, schema=None):
+        """
+        pyarrow Table. Numeric columns are handed over without copying and
+        label columns become dictionary arrays over the interned labels.
+        Pass a schema to pin the types, e.g. across Parquet row groups.
+        """
+        import pyarrow as pa
+        table = self.table
+        arrays = {}
+        for name in columns:
+            if name in table.categories:
+                # Parquet can't store a null inside the dictionary, so a None label becomes a null index
+                labels = table.categories[name].labels
+                codes = self._take(name)
+                null_codes = [n for n, label in enumerate(labels) if label is None]
+                indices = pa.array(codes, mask=np.isin(codes, null_codes) if null_codes else None)
+                dictionary = pa.array(["" if label is None else label for label in labels], type=pa.string())
+                arrays[name] = pa.DictionaryArray.from_arrays(indices, dictionary)
+            elif name in NUMERIC:
+                values = self._take(name)
+                arrays[name] = pa.array(values, mask=np.isnan(values) if values.dtype.kind == "f" else None)
+            elif name == "evidence":
+                arrays[name] = pa.array(self.column(name), type=pa.list_(pa.string()))
+            else:
+                arrays[name] = pa.array(self._export_column(name))
+                if arrays[name].type == pa.null():
+                    arrays[name] = arrays[name].cast(pa.string())
+        arrow = pa.table(arrays)
+        return arrow if schema is None else arrow.cast(schema)
+
+    def to_parquet(self, target=None, columns=COLUMNS):
+        """Writes to a path or file object; with no target returns the file as bytes."""
+        import pyarrow.parquet as pq
+        sink = target if target is not None else io.BytesIO()
+        pq.write_table(self.to_arrow(columns), sink)
+        return sink.getvalue() if target is None else None
+
+    def to_csv(self, target=None, columns=COLUMNS):
+        out = io.StringIO() if target is None else target
+        writer = csv.writer(out)
+        writer.writerow(columns)
+        data = [self._export_column(name) for name in columns]
+        for n, name in enumerate(columns):
+            if name == "evidence":
+                data[n] = [json.dumps(v) for v in data[n]]
+        writer.writerows(zip(*data))
+        return out.getvalue() if target is None else None
+
+    def to_jsonl(self, target=None, columns=COLUMNS):
+        out = io.StringIO() if target is None else target
+        data = [self._export_column(name) for name in columns]
+        for values in zip(*data):
+            out.write(json.dumps(dict(zip(columns, values)), ensure_ascii=False) + "\n")
+        return out.getvalue() if target is None else None
@@ -0,0 +1,66 @@
+import gc
+import multiprocessing
+import os
+
+from claim_detection import model_registry
+from pipeline.bulk import parse_input_line
+from utils.article_fetcher import extract_article_from_url
+from pipeline.full_pipeline import parse_article, score_sentences
+
+
+def _init_worker(torch_threads: int):
+    # Each worker gets its own slice of the cores instead of every process
+    # spawning one intra-op thread per core and oversubscribing the machine.
+    import torch
+    torch.set_num_threads(torch_threads)
+
+
+def _parse_items(items):
+    for index, line in enumerate(items):
+        try:
+            parsed = parse_input_line(line)
+        except ValueError as e:
+            # Rides through the pool as an error record so the output stays in input order
+            yield index, None, line.strip(), None, f"invalid input: {e}"
+            continue
+        if parsed is not None:
+            yield (index, *parsed, None)
+
+
+def _score_item(item) -> dict:
+    index, kind, value, record_id, error = item
+    if error is not None:
+        return {"index": index, "id": record_id, "input": value, "results": [], "error": error}
+    try:
+        text = extract_article_from_url(value) if kind == "url" else value
+        results = score_sentences(parse_article(text))
+        return {"index": index, "id": record_id, "input": value, "results": results, "error": None}
+    except Exception as e:
+        return {"index": index, "id": record_id, "input": value, "results": [], "error": str(e)}
+
+
+def run_pipeline_pool(items, workers: int = None, mode: str = "article", chunksize: int = 1):
+    """
+    Scores articles across a pool of forked worker processes and yields the
+    results in input order. items are URLs, raw texts or JSON lines, as
+    accepted by the bulk CLI; each result carries the line's input index, and
+    malformed lines come back as error records instead of raising.
+
+    Models are loaded once in the parent before forking, so the workers share
+    the weight pages copy-on-write instead of each holding its own copy of
+    roberta-large and spaCy. gc.freeze() keeps the collector from touching
+    (and therefore copying) those objects in the children.
+    """
+    workers = workers or os.cpu_count() or 1
+    torch_threads = max(1, (os.cpu_count() or 1) // workers)
+
+    model_registry.warmup(mode, run_forward=False)
+    gc.freeze()
+
+    parsed = _parse_items(items)
+    ctx = multiprocessing.get_context("fork")
+    try:
+        with ctx.Pool(workers, initializer=_init_worker, initargs=(torch_threads,)) as pool:
+            yield from pool.imap(_score_item, parsed, chunksize=chunksize)
+    finally:
+        gc.unfreeze()
@@ -0,0 +1,133 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# Sentences per coalesced call; classify_nli_batch splits it further by token budget
+BATCHER_MAX_SENTENCES = int(os.getenv("BATCHER_MAX_SENTENCES", "64"))
+BATCHER_MAX_WAIT_MS = float(os.getenv("BATCHER_MAX_WAIT_MS", "10"))
+
+_STOP = object()
+
+
+class _Request:
+    __slots__ = ("texts", "future")
+
+    def __init__(self, texts: list[str]):
+        self.texts = texts
+        self.future = Future()
+
+
+class NLIBatcher:
+    """
+    Coalesces NLI calls from concurrent requests into shared forward passes.
+    The first waiting request opens a window of max_wait_ms; everything that
+    arrives before it closes (or until max_sentences are queued) runs as one
+    batch on a single inference thread, and each caller gets its own slice of
+    the results back. classify() has the same shape as classify_nli_batch, so
+    it can be passed straight to the pipeline as nli_fn.
+    """
+
+    def __init__(self, classify_fn=None, max_sentences: int = BATCHER_MAX_SENTENCES,
+                 max_wait_ms: float = BATCHER_MAX_WAIT_MS):
+        if classify_fn is None:
+            from claim_detection.claim_classifier import classify_nli_batch
+
+            def classify_fn(texts):
+                return classify_nli_batch(texts, mode="auto")
+
+        self.classify_fn = classify_fn
+        self.max_sentences = max_sentences
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self) -> "NLIBatcher":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="nli-batcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the inference thread; requests still queued fail instead of waiting forever."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+            self._fail_queued()
+
+    def _fail_queued(self):
+        error = RuntimeError("NLI batcher stopped")
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP:
+                item.future.set_exception(error)
+
+    def classify(self, texts: list[str]) -> list[dict]:
+        if not texts:
+            return []
+        request = _Request(list(texts))
+        # Checked under the lock so nothing is queued after stop() has drained the queue
+        with self._lock:
+            if self._thread is None:
+                raise RuntimeError("NLI batcher is not running")
+            self._queue.put(request)
+        return request.future.result()
+
+    def _collect(self, first: _Request) -> tuple[list[_Request], bool]:
+        """Gathers requests until the wait window closes or the batch is full."""
+        pending = [first]
+        size = len(first.texts)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_sentences:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return pending, True
+            pending.append(item)
+            size += len(item.texts)
+        return pending, False
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            pending, stopping = self._collect(first)
+            texts = [t for request in pending for t in request.texts]
+
+            # The batcher thread has no request context, so record into its own collector
+            with metrics.collect_metrics():
+                metrics.incr("batcher.batches")
+                metrics.incr("batcher.requests", len(pending))
+                metrics.incr("batcher.sentences", len(texts))
+                try:
+                    with metrics.stage("batcher.nli"):
+                        results = self.classify_fn(texts)
+                except Exception as e:
+                    logger.warning("⚠️ Coalesced NLI batch of %d failed: %s", len(texts), e)
+                    for request in pending:
+                        request.future.set_exception(e)
+                    continue
+
+            offset = 0
+            for request in pending:
+                request.future.set_result(results[offset:offset + len(request.texts)])
+                offset += len(request.texts)
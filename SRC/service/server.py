@@ -0,0 +1,281 @@
+"""
+Headless HTTP/JSON scoring service around pipeline.full_pipeline.
+
+    python SRC/service/server.py --port 8080 --workers 8 --queue-size 32
+
+    POST /v1/score/url    {"url": "...", "force_refresh": false}
+    POST /v1/score/text   {"text": "...", "mode": "article" | "manual", "force_refresh": false}
+    GET  /healthz         liveness, 200 while the process is up
+    GET  /readyz          200 once models are warmed up, 503 before; lists which models are loaded
+    GET  /metrics         process-wide metrics in Prometheus format
+
+Requests go onto a bounded job queue served by a fixed set of worker threads.
+When the queue is full the service answers 429 with Retry-After instead of
+piling up work it cannot finish. NLI calls from all in-flight requests are
+coalesced into shared micro-batches by service.nli_batcher.
+"""
+import argparse
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from claim_detection import model_registry
+from service.nli_batcher import NLIBatcher
+from pipeline.result_store import served_from_cache
+from utils import http_client, metrics
+from utils.metrics import configure_logging
+
+logger = logging.getLogger(__name__)
+
+SERVICE_WORKERS = int(os.getenv("SERVICE_WORKERS", "8"))
+SERVICE_QUEUE_SIZE = int(os.getenv("SERVICE_QUEUE_SIZE", "32"))
+SERVICE_TIMEOUT = float(os.getenv("SERVICE_TIMEOUT", "120"))
+MAX_BODY_BYTES = 2 * 1024 * 1024
+
+_STOP = object()
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _default_runners() -> dict:
+    from pipeline import full_pipeline
+
+    def score_url(payload, nli_fn):
+        return full_pipeline.run_pipeline_from_url(payload["url"], payload["force_refresh"], nli_fn=nli_fn)
+
+    def score_text(payload, nli_fn):
+        run = full_pipeline.run_pipeline_from_text_manual if payload["mode"] == "manual" \
+            else full_pipeline.run_pipeline_from_text
+        return run(payload["text"], payload["force_refresh"], nli_fn=nli_fn)
+
+    return {"url": score_url, "text": score_text}
+
+
+def _default_warmup():
+    model_registry.warmup(mode="article")
+
+
+def validate(kind: str, payload) -> dict:
+    """Checks a request body and fills in defaults; raises BadRequest."""
+    if not isinstance(payload, dict):
+        raise BadRequest("body must be a JSON object")
+    clean = {"force_refresh": bool(payload.get("force_refresh", False))}
+    if kind == "url":
+        url = payload.get("url")
+        if not isinstance(url, str) or not url.startswith(("http://", "https://")):
+            raise BadRequest("'url' must be an http(s) URL")
+        clean["url"] = url
+    else:
+        text = payload.get("text")
+        if not isinstance(text, str) or not text.strip():
+            raise BadRequest("'text' must be a non-empty string")
+        mode = payload.get("mode", "article")
+        if mode not in ("article", "manual"):
+            raise BadRequest("'mode' must be 'article' or 'manual'")
+        clean.update(text=text, mode=mode)
+    return clean
+
+
+class ScoringService:
+    """Bounded job queue, worker threads and the shared NLI batcher behind the HTTP handler."""
+
+    def __init__(self, runners: dict = None, workers: int = SERVICE_WORKERS, queue_size: int = SERVICE_QUEUE_SIZE,
+                 batcher: NLIBatcher = None, warmup=_default_warmup):
+        self.runners = runners
+        self.workers = workers
+        self.jobs = queue.Queue(maxsize=queue_size)
+        self.batcher = batcher or NLIBatcher()
+        self.warmup = warmup
+        self.ready = threading.Event()
+        self.warmup_error = None
+        self._threads = []
+
+    def start(self) -> "ScoringService":
+        self.runners = self.runners or _default_runners()
+        self.batcher.start()
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"scoring-worker-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        # Warm up off the main thread so /healthz answers while the weights load
+        threading.Thread(target=self._warmup, name="warmup", daemon=True).start()
+        return self
+
+    def stop(self):
+        for _ in self._threads:
+            self.jobs.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.batcher.stop()
+
+    def _warmup(self):
+        start = time.perf_counter()
+        try:
+            if self.warmup:
+                self.warmup()
+        except Exception as e:
+            self.warmup_error = str(e)
+            logger.error("❌ Warmup failed, staying unready: %s", e)
+            return
+        self.ready.set()
+        logger.info("🔥 Models warm after %.1fs, ready for traffic", time.perf_counter() - start)
+
+    def submit(self, kind: str, payload: dict) -> Future:
+        """Queues a scoring job; raises queue.Full when the service is saturated."""
+        future = Future()
+        self.jobs.put_nowait((kind, payload, future, time.perf_counter()))
+        return future
+
+    def _work(self):
+        while (job := self.jobs.get()) is not _STOP:
+            kind, payload, future, queued_at = job
+            started = time.perf_counter()
+            try:
+                with metrics.collect_metrics() as run_metrics:
+                    results = self.runners[kind](payload, self.batcher.classify)
+                future.set_result({
+                    "results": results,
+                    "from_cache": served_from_cache(run_metrics),
+                    "queue_s": round(started - queued_at, 4),
+                    "elapsed_s": round(time.perf_counter() - started, 4),
+                })
+            except Exception as e:
+                logger.exception("❌ %s job failed", kind)
+                future.set_exception(e)
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready.is_set(),
+            "warmup_error": self.warmup_error,
+            "queue_depth": self.jobs.qsize(),
+            "queue_size": self.jobs.maxsize,
+            "workers": self.workers,
+            "models": model_registry.loaded_models(),
+        }
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    service: ScoringService = None
+    timeout_s = SERVICE_TIMEOUT
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        logger.debug("%s - %s", self.address_string(), fmt % args)
+
+    def _send(self, status: int, body, headers: dict = None, content_type: str = "application/json"):
+        data = (json.dumps(body, default=str) if content_type == "application/json" else body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._send(200, {"status": "ok"})
+        elif self.path == "/readyz":
+            status = self.service.status()
+            self._send(200 if status["ready"] else 503, status)
+        elif self.path == "/metrics":
+            gauges = (f"# TYPE fake_article_service_queue_depth gauge\n"
+                      f"fake_article_service_queue_depth {self.service.jobs.qsize()}\n"
+                      f"# TYPE fake_article_source_circuit_open gauge\n")
+            gauges += "".join(f'fake_article_source_circuit_open{{source="{source}"}} {int(state != "closed")}\n'
+                              for source, state in http_client.circuit_states().items())
+            self._send(200, metrics.GLOBAL_METRICS.to_prometheus() + gauges, content_type="text/plain")
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        kind = {"/v1/score/url": "url", "/v1/score/text": "text"}.get(self.path)
+        if kind is None:
+            self._send(404, {"error": "not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            # Without a usable length the body can't be skipped, so the connection can't be reused
+            self._send(400, {"error": "invalid Content-Length"}, headers={"Connection": "close"})
+            self.close_connection = True
+            return
+        if length > MAX_BODY_BYTES:
+            self._send(413, {"error": "body too large"}, headers={"Connection": "close"})
+            self.close_connection = True
+            return
+        try:
+            payload = validate(kind, json.loads(self.rfile.read(length) or b"null"))
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+            return
+
+        if not self.service.ready.is_set():
+            self._send(503, {"error": "warming up"}, headers={"Retry-After": "5"})
+            return
+        try:
+            future = self.service.submit(kind, payload)
+        except queue.Full:
+            metrics.GLOBAL_METRICS.incr("service.rejected")
+            self._send(429, {"error": "queue full, retry later"}, headers={"Retry-After": "1"})
+            return
+
+        metrics.GLOBAL_METRICS.incr(f"service.{kind}.requests")
+        try:
+            self._send(200, future.result(timeout=self.timeout_s))
+        except TimeoutError:
+            self._send(504, {"error": "scoring timed out"})
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+
+
+def make_server(service: ScoringService, host: str = "127.0.0.1", port: int = 8080) -> ThreadingHTTPServer:
+    handler = type("BoundScoringHandler", (ScoringHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP/JSON scoring service for the fake news pipeline.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS, help="Concurrent pipeline runs")
+    parser.add_argument("--queue-size", type=int, default=SERVICE_QUEUE_SIZE,
+                        help="Jobs allowed to wait before new requests get 429")
+    parser.add_argument("--max-wait-ms", type=float, default=None, help="NLI batching window")
+    parser.add_argument("--max-batch", type=int, default=None, help="Sentences per coalesced NLI call")
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    batcher_kwargs = {k: v for k, v in (("max_wait_ms", args.max_wait_ms), ("max_sentences", args.max_batch))
+                      if v is not None}
+    service = ScoringService(workers=args.workers, queue_size=args.queue_size,
+                             batcher=NLIBatcher(**batcher_kwargs)).start()
+    server = make_server(service, args.host, args.port)
+    logger.info("🚀 Serving on http://%s:%d (%d workers, queue %d)", args.host, args.port,
+                args.workers, args.queue_size)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,132 @@
+import time
+import logging
 from newspaper import Article
 import trafilatura
-import requests
 from bs4 import BeautifulSoup
+from utils import http_client, metrics
+from utils.disk_cache import get_default_cache, is_offline
 
-def extract_article_from_url(url: str) -> str:
-    try:
-        # ✅ Try newspaper3k first
-        article = Article(url)
-        article.download()
-        article.parse()
-        full_text = article.text.strip()
-        if full_text and len(full_text.split()) > 50:
-            print("✅ Extracted FULL article using Newspaper3k")
-            return full_text
-        else:
-            print("⚠️ Newspaper3k text too short, falling back...")
-    except Exception as e:
-        print(f"⚠️ Newspaper3k failed: {e} — falling back to Trafilatura.")
+logger = logging.getLogger(__name__)
 
-    try:
-        # 🟡 Try trafilatura
-        downloaded = trafilatura.fetch_url(url)
-        if downloaded:
-            text = trafilatura.extract(downloaded, include_comments=False, include_tables=False)
-            if text and len(text.split()) > 50:
-                print("✅ Extracted using Trafilatura")
-                return text.strip()
-            else:
-                print("⚠️ Trafilatura text too short, falling back...")
-    except Exception as e:
-        print(f"⚠️ Trafilatura failed: {e} — falling back to raw scraping.")
+FAILED_TEXT = "⚠️ Failed to extract article text."
+USER_AGENT = "Mozilla/5.0 (compatible; FakeArticleBot/1.0)"
+
+
+def fetch_html(url: str) -> tuple[str, bool]:
+    """
+    Downloads the page once through the pooled session. The raw HTML is cached
+    on disk with its ETag/Last-Modified, so a repeat fetch is a conditional
+    request that usually comes back 304. Returns (html, changed), where changed
+    is False when the cached copy is still current. In offline mode a cache
+    miss raises LookupError instead of going to the network.
+    """
+    cache = get_default_cache()
+    hit, cached = cache.get("article_html", url)
+    if is_offline():
+        if not hit:
+            raise LookupError(f"{url} is not in the cache and FAKE_ARTICLE_OFFLINE is set")
+        return cached["html"], False
+
+    headers = {"User-Agent": USER_AGENT}
+    if hit and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if hit and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    metrics.incr("external_calls.article")
+    response = http_client.get(url, headers=headers)
+    if response.status_code == 304 and hit:
+        metrics.incr("cache.article_html.revalidated")
+        return cached["html"], False
+    response.raise_for_status()
+
+    html = response.text
+    cache.set("article_html", url, {
+        "html": html,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    })
+    return html, True
+
+
+def _extract_newspaper(url: str, html: str) -> str:
+    article = Article(url)
+    article.download(input_html=html)
+    article.parse()
+    return article.text.strip()
+
+
+def _extract_trafilatura(url: str, html: str) -> str:
+    text = trafilatura.extract(html, url=url, include_comments=False, include_tables=False)
+    return (text or "").strip()
 
+
+def _extract_beautifulsoup(url: str, html: str) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+    paragraphs = soup.find_all("p")
+    return "\n".join(p.get_text() for p in paragraphs).strip()
+
+
+# Tried in order; the first one that yields more than 50 words wins
+EXTRACTORS = [
+    ("newspaper3k", _extract_newspaper),
+    ("trafilatura", _extract_trafilatura),
+    ("beautifulsoup", _extract_beautifulsoup),
+]
+
+
+def _record_timings(timings: dict):
+    collector = metrics.current_metrics()
+    if collector is not None:
+        for name, seconds in timings.items():
+            collector.observe_stage(f"fetch.{name}", seconds)
+
+
+def fetch_article(url: str) -> dict:
+    """
+    Fetches a URL once and hands the HTML to each extractor in turn.
+    Returns the text, which extractor won, per-step timings in seconds and
+    whether the result came from the on-disk cache.
+    """
+    timings = {}
+    start = time.perf_counter()
     try:
-        # 🔴 Final fallback: basic scraping with BeautifulSoup
-        response = requests.get(url)
-        soup = BeautifulSoup(response.text, "html.parser")
-        paragraphs = soup.find_all("p")
-        text = "\n".join(p.get_text() for p in paragraphs).strip()
-        if len(text.split()) > 50:
-            print("✅ Extracted using BeautifulSoup fallback")
-            return text
-        else:
-            print("⚠️ BeautifulSoup text too short.")
+        html, changed = fetch_html(url)
     except Exception as e:
-        print(f"❌ Final fallback failed: {e}")
+        logger.warning("❌ Download failed for %s: %s", url, e)
+        return {"text": FAILED_TEXT, "extractor": None, "timings": {"download": time.perf_counter() - start},
+                "from_cache": False}
+    timings["download"] = time.perf_counter() - start
 
-    return "⚠️ Failed to extract article text."
+    cache = get_default_cache()
+    if not changed:
+        hit, extracted = cache.get("article_text", url)
+        if hit:
+            metrics.incr("cache.article_text.hit")
+            _record_timings(timings)
+            return dict(extracted, timings=timings, from_cache=True)
+
+    for name, extractor in EXTRACTORS:
+        start = time.perf_counter()
+        try:
+            text = extractor(url, html)
+        except Exception as e:
+            logger.info("⚠️ %s failed: %s — falling back...", name, e)
+            text = ""
+        timings[name] = time.perf_counter() - start
+
+        if text and len(text.split()) > 50:
+            logger.info("✅ Extracted using %s", name)
+            extracted = {"text": text, "extractor": name}
+            cache.set("article_text", url, extracted)
+            _record_timings(timings)
+            return dict(extracted, timings=timings, from_cache=False)
+        logger.info("⚠️ %s text too short, falling back...", name)
+
+    logger.warning("❌ All extractors failed for %s", url)
+    _record_timings(timings)
+    return {"text": FAILED_TEXT, "extractor": None, "timings": timings, "from_cache": False}
+
+
+def extract_article_from_url(url: str) -> str:
+    return fetch_article(url)["text"]
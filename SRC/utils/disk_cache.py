@@ -0,0 +1,190 @@
+import functools
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from utils import metrics
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_CACHE_PATH = os.getenv(
+    "FAKE_ARTICLE_CACHE_PATH", os.path.join(REPO_ROOT, "data", "cache", "lookups.sqlite3")
+)
+DEFAULT_MAX_ENTRIES = int(os.getenv("FAKE_ARTICLE_CACHE_MAX_ENTRIES", "200000"))
+
+# Seconds before an entry is considered stale, per external source
+SOURCE_TTLS = {
+    "claimbuster": 30 * 24 * 3600,
+    "wikipedia": 7 * 24 * 3600,
+    "wikipedia_summary": 7 * 24 * 3600,
+    "serpapi": 24 * 3600,
+    "google_cse": 24 * 3600,
+    # Article HTML is revalidated with a conditional request on every fetch
+    "article_html": 30 * 24 * 3600,
+    "article_text": 30 * 24 * 3600,
+}
+DEFAULT_TTL = 24 * 3600
+
+# Evict once every N writes rather than on each one
+EVICT_EVERY = 500
+
+
+def is_offline() -> bool:
+    """Cache-only mode: misses return the caller's default instead of hitting the network."""
+    return os.getenv("FAKE_ARTICLE_OFFLINE", "").lower() in ("1", "true", "yes")
+
+
+def normalize_key(text: str) -> str:
+    return re.sub(r"\s+", " ", str(text)).strip().lower()
+
+
+class DiskCache:
+    """
+    SQLite-backed key/value cache shared by every worker process on a host.
+    WAL mode lets readers and a writer work concurrently; each thread (and each
+    forked process) gets its own connection.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttls: dict = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttls = dict(SOURCE_TTLS, **(ttls or {}))
+        self._local = threading.local()
+        self._writes = 0
+        self._ensure_schema()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _ensure_schema(self):
+        self._connection().execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                source TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (source, key)
+            )
+            """
+        )
+        self._connection().execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)"
+        )
+
+    def ttl_for(self, source: str) -> float:
+        return self.ttls.get(source, DEFAULT_TTL)
+
+    def get(self, source: str, key: str):
+        """Returns (hit, value). Expired entries count as misses."""
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, created_at FROM entries WHERE source = ? AND key = ?", (source, key)
+        ).fetchone()
+        if row is None:
+            return False, None
+        value, created_at = row
+        now = time.time()
+        if now - created_at > self.ttl_for(source):
+            self.delete(source, key)
+            return False, None
+        conn.execute(
+            "UPDATE entries SET accessed_at = ? WHERE source = ? AND key = ?", (now, source, key)
+        )
+        return True, json.loads(value)
+
+    def set(self, source: str, key: str, value):
+        now = time.time()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO entries (source, key, value, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (source, key, json.dumps(value), now, now),
+        )
+        self._writes += 1
+        if self._writes % EVICT_EVERY == 0:
+            self.evict()
+
+    def delete(self, source: str, key: str):
+        self._connection().execute("DELETE FROM entries WHERE source = ? AND key = ?", (source, key))
+
+    def evict(self):
+        """Drops least-recently-used entries beyond max_entries."""
+        conn = self._connection()
+        (count,) = conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM entries WHERE rowid IN "
+                "(SELECT rowid FROM entries ORDER BY accessed_at ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def clear(self, source: str = None):
+        if source is None:
+            self._connection().execute("DELETE FROM entries")
+        else:
+            self._connection().execute("DELETE FROM entries WHERE source = ?", (source,))
+
+    def __len__(self):
+        (count,) = self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()
+        return count
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> DiskCache:
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = DiskCache()
+    return _default_cache
+
+
+def disk_cached(source: str, offline_default=None):
+    """
+    Caches a lookup function on disk, keyed on its normalized first argument
+    plus any remaining arguments. Falsy results (errors, empty evidence) are
+    not stored so transient failures are retried next time.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(query, *args, **kwargs):
+            cache = get_default_cache()
+            key = normalize_key(query)
+            if args or kwargs:
+                key += "|" + json.dumps([args, sorted(kwargs.items())], default=str)
+
+            hit, value = cache.get(source, key)
+            if hit:
+                metrics.incr(f"cache.{source}.hit")
+                return value
+            metrics.incr(f"cache.{source}.miss")
+            if is_offline():
+                # A stand-in value, not a real answer; keep results built on it out of other caches
+                metrics.mark_failed(source)
+                return offline_default
+
+            value = fn(query, *args, **kwargs)
+            if value:
+                cache.set(source, key, value)
+            return value
+
+        wrapper.uncached = fn
+        return wrapper
+    return decorator
@@ -0,0 +1,309 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+DEFAULT_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+DEFAULT_BACKOFF = float(os.getenv("HTTP_BACKOFF", "0.5"))
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "32"))
+
+# Max in-flight requests per upstream host; anything not listed gets DEFAULT_HOST_LIMIT
+HOST_LIMITS = {
+    "idir.uta.edu": 4,
+    "en.wikipedia.org": 8,
+    "serpapi.com": 4,
+    "www.googleapis.com": 4,
+}
+DEFAULT_HOST_LIMIT = 8
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Requests per second and burst size for each external source, per API key
+SOURCE_RATE_LIMITS = {
+    "claimbuster": (5.0, 10),
+    "serpapi": (2.0, 5),
+    "google_cse": (2.0, 5),
+    "wikipedia": (20.0, 40),
+}
+# Longest a caller waits for a rate-limit token before giving up on the source
+RATE_LIMIT_MAX_WAIT = float(os.getenv("HTTP_RATE_LIMIT_MAX_WAIT", "5"))
+# Retry-After values above this are not waited out; the error response is returned instead
+RETRY_AFTER_MAX = float(os.getenv("HTTP_RETRY_AFTER_MAX", "10"))
+# Consecutive failures that open a source's circuit, and how long it stays open
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("HTTP_CIRCUIT_FAILURES", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("HTTP_CIRCUIT_RESET", "30"))
+
+_session = None
+_session_lock = threading.Lock()
+_host_semaphores = {}
+_host_lock = threading.Lock()
+_buckets = {}
+_breakers = {}
+_source_lock = threading.Lock()
+
+
+class SourceUnavailable(requests.RequestException):
+    """Raised instead of calling a source whose circuit is open or whose rate limit can't be met in time."""
+
+
+class TokenBucket:
+    """Token bucket: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait: float = None) -> bool:
+        """Takes one token, sleeping until one is free; False if that would take longer than max_wait."""
+        deadline = time.monotonic() + (RATE_LIMIT_MAX_WAIT if max_wait is None else max_wait)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures so callers skip the
+    source instead of waiting on it. After `reset_after` seconds a single
+    trial call is let through; success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = None, reset_after: float = None):
+        self.failure_threshold = failure_threshold or CIRCUIT_FAILURE_THRESHOLD
+        self.reset_after = CIRCUIT_RESET_SECONDS if reset_after is None else reset_after
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.reset_after else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def cancel_trial(self):
+        """Frees the half-open trial slot when the admitted call never went out."""
+        with self._lock:
+            self.trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Returns True if this failure opened (or re-opened) the circuit."""
+        with self._lock:
+            self.failures += 1
+            reopen = self.trial_in_flight
+            self.trial_in_flight = False
+            if reopen or (self.opened_at is None and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+
+def get_breaker(source: str) -> CircuitBreaker:
+    with _source_lock:
+        if source not in _breakers:
+            _breakers[source] = CircuitBreaker()
+        return _breakers[source]
+
+
+def _bucket(source: str, api_key: str = None):
+    if source not in SOURCE_RATE_LIMITS:
+        return None
+    with _source_lock:
+        key = (source, api_key)
+        if key not in _buckets:
+            _buckets[key] = TokenBucket(*SOURCE_RATE_LIMITS[source])
+        return _buckets[key]
+
+
+def circuit_states() -> dict:
+    """Circuit state per source that has been called, e.g. for the service's /metrics."""
+    with _source_lock:
+        breakers = dict(_breakers)
+    return {source: breaker.state for source, breaker in sorted(breakers.items())}
+
+
+def _admit(source: str, api_key: str = None):
+    """Checks the source's circuit and takes a rate-limit token, or raises SourceUnavailable."""
+    if not get_breaker(source).allow():
+        metrics.incr(f"http.{source}.circuit_open")
+        raise SourceUnavailable(f"{source} circuit is open")
+    bucket = _bucket(source, api_key)
+    if bucket is not None and not bucket.acquire():
+        metrics.incr(f"http.{source}.rate_limited")
+        get_breaker(source).cancel_trial()
+        raise SourceUnavailable(f"{source} rate limit not available within {RATE_LIMIT_MAX_WAIT}s")
+
+
+def _record(source: str, ok: bool):
+    breaker = get_breaker(source)
+    if ok:
+        breaker.record_success()
+        return
+    metrics.incr(f"http.{source}.errors")
+    if breaker.record_failure():
+        metrics.incr(f"http.{source}.circuit_opened")
+        logger.warning("⚡ Circuit opened for %s after %d failures; skipping it for %.0fs",
+                       source, breaker.failures, breaker.reset_after)
+
+
+def retry_after_seconds(response: requests.Response):
+    """The response's Retry-After header in seconds (delta or HTTP date), or None."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_session() -> requests.Session:
+    """Process-wide session so keep-alive connections are pooled across lookups."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def _host_semaphore(host: str) -> threading.BoundedSemaphore:
+    with _host_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT))
+        return _host_semaphores[host]
+
+
+@contextmanager
+def host_slot(host: str):
+    """Holds one of the host's concurrency slots, e.g. around third-party clients."""
+    semaphore = _host_semaphore(host)
+    with semaphore:
+        yield
+
+
+@contextmanager
+def source_call(source: str, host: str, api_key: str = None, failures: tuple = (requests.RequestException,)):
+    """
+    Wraps a call made by a third-party client (e.g. the wikipedia package)
+    in the same circuit breaker, rate limit, host slot and per-source
+    counters that request() applies. Only `failures` count against the
+    circuit; other exceptions (page not found and the like) mean the source
+    answered.
+    """
+    _admit(source, api_key)
+    metrics.incr(f"http.{source}.requests")
+    try:
+        with metrics.stage(f"http.{source}"), host_slot(host):
+            yield
+    except failures:
+        _record(source, ok=False)
+        raise
+    except Exception:
+        _record(source, ok=True)
+        raise
+    _record(source, ok=True)
+
+
+def request(method: str, url: str, timeout: float = None, retries: int = None,
+            backoff: float = None, source: str = None, api_key: str = None, **kwargs) -> requests.Response:
+    """
+    Sends a request through the pooled session, holding a per-host slot and
+    retrying connection errors and retryable statuses with exponential backoff,
+    or after the server's Retry-After when it sends one. The last response is
+    returned even if it is an error status.
+
+    With a `source` name the request also goes through that source's circuit
+    breaker and its token bucket for `api_key`, and is counted under
+    http.<source>.*; SourceUnavailable is raised while the circuit is open.
+    """
+    timeout = DEFAULT_TIMEOUT if timeout is None else timeout
+    retries = DEFAULT_RETRIES if retries is None else retries
+    backoff = DEFAULT_BACKOFF if backoff is None else backoff
+    host = urlparse(url).netloc
+
+    for attempt in range(retries + 1):
+        if source:
+            _admit(source, api_key)
+            metrics.incr(f"http.{source}.requests")
+            if attempt:
+                metrics.incr(f"http.{source}.retries")
+        try:
+            with metrics.stage(f"http.{source}") if source else nullcontext(), host_slot(host):
+                response = get_session().request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if source:
+                _record(source, ok=False)
+            if attempt == retries:
+                raise
+            time.sleep(backoff * (2 ** attempt))
+            continue
+
+        retryable = response.status_code in RETRY_STATUSES
+        if source:
+            _record(source, ok=not retryable)
+        if not retryable or attempt == retries:
+            return response
+        delay = retry_after_seconds(response)
+        if delay is None:
+            delay = backoff * (2 ** attempt)
+        elif delay > RETRY_AFTER_MAX:
+            logger.debug("⏳ %s asked to retry after %.0fs; not waiting", host, delay)
+            return response
+        time.sleep(delay)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
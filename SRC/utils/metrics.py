@@ -0,0 +1,173 @@
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+class PipelineMetrics:
+    """
+    Per-article instrumentation: stage timings, counters (external calls,
+    cache hits/misses) and model batch sizes. Thread-safe so the lookup
+    thread pool can record into the same object.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = Counter()
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+
+    def observe_stage(self, name: str, seconds: float):
+        with self._lock:
+            stage = self.stages.setdefault(name, {"count": 0, "total_s": 0.0, "max_s": 0.0})
+            stage["count"] += 1
+            stage["total_s"] += seconds
+            stage["max_s"] = max(stage["max_s"], seconds)
+
+    def incr(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] += n
+
+    def observe_batch(self, size: int):
+        with self._lock:
+            self.batch_sizes.append(size)
+
+    def merge(self, other: "PipelineMetrics"):
+        with self._lock:
+            for name, s in other.stages.items():
+                stage = self.stages.setdefault(name, {"count": 0, "total_s": 0.0, "max_s": 0.0})
+                stage["count"] += s["count"]
+                stage["total_s"] += s["total_s"]
+                stage["max_s"] = max(stage["max_s"], s["max_s"])
+            self.counters.update(other.counters)
+            self.batch_sizes.extend(other.batch_sizes)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "stages": {k: dict(v) for k, v in self.stages.items()},
+                "counters": dict(self.counters),
+                "batch_sizes": list(self.batch_sizes),
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = "fake_article") -> str:
+        """Prometheus text exposition format."""
+        data = self.to_dict()
+        lines = [
+            f"# TYPE {prefix}_stage_seconds_total counter",
+            *(f'{prefix}_stage_seconds_total{{stage="{k}"}} {v["total_s"]:.6f}' for k, v in data["stages"].items()),
+            f"# TYPE {prefix}_stage_calls_total counter",
+            *(f'{prefix}_stage_calls_total{{stage="{k}"}} {v["count"]}' for k, v in data["stages"].items()),
+            f"# TYPE {prefix}_events_total counter",
+            *(f'{prefix}_events_total{{name="{k}"}} {v}' for k, v in sorted(data["counters"].items())),
+            f"# TYPE {prefix}_batch_size_sum counter",
+            f"{prefix}_batch_size_sum {sum(data['batch_sizes'])}",
+            f"# TYPE {prefix}_batch_size_count counter",
+            f"{prefix}_batch_size_count {len(data['batch_sizes'])}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide totals; every collect_metrics() block is merged in when it exits
+GLOBAL_METRICS = PipelineMetrics()
+
+_current = contextvars.ContextVar("pipeline_metrics", default=None)
+
+
+def current_metrics():
+    return _current.get()
+
+
+@contextmanager
+def collect_metrics():
+    """
+    Activates a PipelineMetrics for the enclosed block. Nested blocks reuse the
+    outer collector, so callers can wrap a pipeline run that also opens one.
+    """
+    active = _current.get()
+    if active is not None:
+        yield active
+        return
+    metrics = PipelineMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+        GLOBAL_METRICS.merge(metrics)
+
+
+@contextmanager
+def stage(name: str):
+    """Times a stage into the active collector; a no-op when nothing is collecting."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.observe_stage(name, time.perf_counter() - start)
+
+
+def incr(name: str, n: int = 1):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.incr(name, n)
+
+
+_failures = contextvars.ContextVar("lookup_failures", default=None)
+
+
+@contextmanager
+def track_failures(propagate: bool = True):
+    """
+    Collects the sources of every lookup_failed() in the enclosed block. The
+    failures also count toward any enclosing block unless propagate is False,
+    so a caller can tell whether a result was built on a degraded lookup
+    before caching it.
+    """
+    parent = _failures.get() if propagate else None
+    failures = []
+    token = _failures.set(failures)
+    try:
+        yield failures
+    finally:
+        _failures.reset(token)
+        if parent is not None:
+            parent.extend(failures)
+
+
+def mark_failed(source: str):
+    """Flags the enclosing track_failures() blocks without counting a new error, e.g. for a memoized failure."""
+    failures = _failures.get()
+    if failures is not None:
+        failures.append(source)
+
+
+def lookup_failed(source: str):
+    """Counts an external lookup error and flags the enclosing track_failures() blocks."""
+    incr(f"external_errors.{source}")
+    mark_failed(source)
+
+
+def observe_batch(size: int):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.observe_batch(size)
+
+
+def configure_logging(level: str = None):
+    """Sets up pipeline logging; LOG_LEVEL=DEBUG brings back the per-sentence output."""
+    logging.basicConfig(
+        level=(level or os.getenv("LOG_LEVEL", "INFO")).upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
@@ -0,0 +1,22 @@
+import os
+import threading
+
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+
+# Sentence splitting needs the parser and NER needs ner; nothing in the
+# pipeline reads POS tags or lemmas, so those components are never run.
+UNUSED_COMPONENTS = ["tagger", "attribute_ruler", "lemmatizer"]
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def get_nlp():
+    """Shared spaCy model, loaded on first use and reused by every module."""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                _nlp = spacy.load(SPACY_MODEL, disable=UNUSED_COMPONENTS)
+    return _nlp
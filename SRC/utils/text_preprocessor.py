@@ -1,8 +1,11 @@
+import os
 import re
-import spacy
+from utils.spacy_model import get_nlp
+
+# Characters per spaCy Doc; longer texts are parsed in paragraph-aligned chunks.
+# Well under spaCy's max_length, and the parser's memory grows with Doc size.
+CHUNK_CHARS = int(os.getenv("CHUNK_CHARS", "100000"))
 
-# Load once at the top level
-nlp = spacy.load("en_core_web_sm")
 
 def clean_text(text: str) -> str:
     text = re.sub(r'<.*?>', '', text)
@@ -10,8 +13,57 @@ def clean_text(text: str) -> str:
     text = re.sub(r'\s+', ' ', text)
     return text.strip()
 
+def _split_oversized(paragraph: str, max_chars: int):
+    """Breaks a single paragraph longer than max_chars after sentence punctuation, or at whitespace."""
+    while len(paragraph) > max_chars:
+        window = paragraph[:max_chars]
+        cut = max(window.rfind(". "), window.rfind("? "), window.rfind("! "))
+        if cut <= 0:
+            cut = window.rfind(" ")
+        cut = cut + 1 if cut > 0 else max_chars
+        yield paragraph[:cut]
+        paragraph = paragraph[cut:]
+    if paragraph.strip():
+        yield paragraph
+
+def iter_paragraph_chunks(text: str, max_chars: int = None):
+    """
+    Yields pieces of the text of at most max_chars, cut only between
+    paragraphs (blank lines or line breaks) so no sentence spans two chunks.
+    Texts that already fit come back unchanged as a single chunk.
+    """
+    max_chars = max_chars or CHUNK_CHARS
+    if len(text) <= max_chars:
+        yield text
+        return
+
+    chunk, size = [], 0
+    for match in re.finditer(r"[^\n]+(?:\n+|$)", text):
+        for paragraph in _split_oversized(match.group(0), max_chars):
+            if size + len(paragraph) > max_chars and chunk:
+                yield "".join(chunk)
+                chunk, size = [], 0
+            chunk.append(paragraph)
+            size += len(paragraph)
+    if chunk:
+        yield "".join(chunk)
+
+def iter_sentences_with_entities(text: str, max_chars: int = None):
+    """
+    Streaming form of split_into_sentences_with_entities: parses the text
+    chunk by chunk with nlp.pipe, so only one chunk's Doc is alive at a time.
+    """
+    for doc in get_nlp().pipe(iter_paragraph_chunks(text, max_chars)):
+        for sent in doc.sents:
+            yield sent.text.strip(), [(ent.text, ent.label_) for ent in sent.ents]
+
 def split_into_sentences(text: str) -> list[str]:
-    doc = nlp(text)
-    return [sent.text.strip() for sent in doc.sents]
+    return [sent for sent, _ents in iter_sentences_with_entities(text)]
 
+def split_into_sentences_with_entities(text: str) -> list[tuple[str, list[tuple[str, str]]]]:
+    """
+    Parses the text once and returns each sentence together with the
+    (entity_text, entity_label) spans that fall inside it.
+    """
+    return list(iter_sentences_with_entities(text))
 
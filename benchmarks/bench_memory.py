@@ -0,0 +1,84 @@
+"""
+Peak Python memory for long inputs: one whole-text spaCy parse versus the
+paragraph-chunked parse, and optionally the full chunked pipeline.
+
+    python benchmarks/bench_memory.py --megabytes 1 4 8
+    python benchmarks/bench_memory.py --megabytes 2 --score --latency claimbuster=0 wikipedia=0
+
+Inputs are built by repeating the saved corpus articles paragraph by
+paragraph. Peaks come from tracemalloc, which sees spaCy's Doc allocations
+but not torch's, so --score numbers cover everything except model memory.
+"""
+import argparse
+import gc
+import importlib
+import tracemalloc
+
+from common import timed
+from stub_services import load_corpus, parse_latency, use_stub_services
+
+
+def long_text(megabytes: float) -> str:
+    paragraphs = [p.strip() for a in load_corpus() for p in a["body"].split("\n") if p.strip()]
+    target = int(megabytes * 1024 * 1024)
+    out, size, n = [], 0, 0
+    while size < target:
+        paragraph = paragraphs[n % len(paragraphs)]
+        out.append(paragraph)
+        size += len(paragraph) + 2
+        n += 1
+    return "\n\n".join(out)
+
+
+def measure(fn, *args):
+    gc.collect()
+    tracemalloc.start()
+    result, elapsed = timed(fn, *args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--megabytes", type=float, nargs="+", default=[1, 4])
+    parser.add_argument("--score", action="store_true", help="Also run the full chunked pipeline")
+    parser.add_argument("--max-sentences", type=int, default=0, help="Sentence cap for --score (0: none)")
+    parser.add_argument("--latency", nargs="*", help="service=milliseconds for the stub services")
+    args = parser.parse_args()
+
+    if args.score:
+        # The input repeats paragraphs; the stub setup also keeps the claim cache from skipping the repeats
+        use_stub_services(parse_latency(args.latency))
+    text_preprocessor = importlib.import_module("utils.text_preprocessor")
+    spacy_model = importlib.import_module("utils.spacy_model")
+    nlp = spacy_model.get_nlp()
+
+    def whole_parse(text):
+        # What split_into_sentences_with_entities did before chunking: one Doc for everything
+        nlp.max_length = max(nlp.max_length, len(text) + 1)
+        doc = nlp(text)
+        return sum(1 for _ in doc.sents)
+
+    def chunked_parse(text):
+        return sum(1 for _ in text_preprocessor.iter_sentences_with_entities(text))
+
+    print(f"{'MB':>5} {'mode':<14} {'sentences':>9} {'seconds':>8} {'peak MB':>8}")
+    for megabytes in args.megabytes:
+        text = long_text(megabytes)
+        modes = [("whole parse", whole_parse), ("chunked parse", chunked_parse)]
+        if args.score:
+            full_pipeline = importlib.import_module("pipeline.full_pipeline")
+            full_pipeline.MAX_SENTENCES_PER_ARTICLE = args.max_sentences
+
+            def chunked_score(text):
+                return sum(1 for _ in full_pipeline.iter_score_chunked(text, first_wave=None))
+            modes.append(("chunked score", chunked_score))
+
+        for name, fn in modes:
+            sentences, elapsed, peak = measure(fn, text)
+            print(f"{megabytes:5.1f} {name:<14} {sentences:9d} {elapsed:8.1f} {peak:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
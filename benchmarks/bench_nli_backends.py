@@ -0,0 +1,41 @@
+"""
+Accuracy/latency harness for the NLI inference backends: label agreement with
+the fp32 PyTorch model and speedup on the fixed sample sentence set.
+
+    NLI_ONNX_THREADS=4 python benchmarks/bench_nli_backends.py --backends torch torch_int8 onnx
+"""
+import argparse
+
+from common import SAMPLE_SENTENCES, timed
+from claim_detection.claim_classifier import classify_nli_batch
+from claim_detection.nli_backends import BACKENDS, get_backend
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", nargs="+", default=sorted(BACKENDS))
+    parser.add_argument("--repeat", type=int, default=4)
+    args = parser.parse_args()
+
+    sentences = SAMPLE_SENTENCES * args.repeat
+
+    # Load and warm each backend before timing; exporting ONNX is a one-off cost
+    for name in ["torch", *args.backends]:
+        get_backend("auto", name)
+        classify_nli_batch(sentences[:2], backend=name)
+
+    reference, reference_time = timed(classify_nli_batch, sentences, backend="torch")
+
+    print(f"{'backend':12} {'sent/s':>9} {'speedup':>8} {'label agree':>12} {'max |dp|':>9}")
+    for name in args.backends:
+        results, elapsed = timed(classify_nli_batch, sentences, backend=name)
+        agree = sum(r["nli_label"] == ref["nli_label"] for r, ref in zip(results, reference))
+        max_delta = max(
+            abs(p - q) for r, ref in zip(results, reference) for p, q in zip(r["probs"], ref["probs"])
+        )
+        print(f"{name:12} {len(sentences) / elapsed:9.2f} {reference_time / elapsed:7.2f}x "
+              f"{agree:>5}/{len(sentences):<6} {max_delta:9.4f}")
+
+
+if __name__ == "__main__":
+    main()
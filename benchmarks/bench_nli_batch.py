@@ -0,0 +1,39 @@
+"""
+Compares sentences/second of per-call classify_nli against classify_nli_batch.
+
+    python benchmarks/bench_nli_batch.py --repeat 4 --token-budget 4096
+"""
+import argparse
+
+from common import SAMPLE_SENTENCES, timed
+from claim_detection.claim_classifier import classify_nli, classify_nli_batch
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=4, help="Copies of the sample set to score")
+    parser.add_argument("--token-budget", type=int, default=None)
+    parser.add_argument("--max-batch-size", type=int, default=None)
+    args = parser.parse_args()
+
+    sentences = SAMPLE_SENTENCES * args.repeat
+
+    # Warm up so the first forward pass does not skew either path
+    classify_nli(sentences[0])
+
+    per_call, per_call_time = timed(lambda: [classify_nli(s) for s in sentences])
+    batched, batched_time = timed(
+        classify_nli_batch, sentences,
+        token_budget=args.token_budget, max_batch_size=args.max_batch_size,
+    )
+
+    agree = sum(a["nli_label"] == b["nli_label"] for a, b in zip(per_call, batched))
+    print(f"Sentences:      {len(sentences)}")
+    print(f"Per-call:       {len(sentences) / per_call_time:8.2f} sentences/s ({per_call_time:.2f}s)")
+    print(f"Batched:        {len(sentences) / batched_time:8.2f} sentences/s ({batched_time:.2f}s)")
+    print(f"Speedup:        {per_call_time / batched_time:8.2f}x")
+    print(f"Label agreement: {agree}/{len(sentences)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+End-to-end latency with and without the check-worthiness prefilter, and how
+far the verdicts agree, on the saved corpus against the stub services.
+
+    python benchmarks/bench_prefilter.py --iterations 3 --threshold 0.35
+"""
+import argparse
+import importlib
+from collections import Counter
+
+from common import timed
+from stub_services import load_corpus, parse_latency, use_stub_services
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=None)
+    parser.add_argument("--latency", nargs="*", help="service=milliseconds for the stub services")
+    args = parser.parse_args()
+
+    # The stub setup also disables the claim cache, so repeated iterations redo the work being measured
+    server, _ = use_stub_services(parse_latency(args.latency))
+    full_pipeline = importlib.import_module("pipeline.full_pipeline")
+    prefilter = importlib.import_module("claim_detection.prefilter")
+    disk_cache = importlib.import_module("utils.disk_cache")
+    importlib.import_module("claim_detection.model_registry").warmup("article")
+    if args.threshold is not None:
+        prefilter.CHECKWORTHY_THRESHOLD = args.threshold
+
+    parsed_articles = [full_pipeline.parse_article(a["body"]) for a in load_corpus()]
+
+    def run(enabled):
+        elapsed_total, rows = 0.0, []
+        for _ in range(args.iterations):
+            for parsed in parsed_articles:
+                disk_cache.get_default_cache().clear()
+                results, elapsed = timed(full_pipeline.score_sentences, parsed, prefilter=enabled)
+                elapsed_total += elapsed
+                rows.append(results)
+        return elapsed_total, rows
+
+    baseline_time, baseline = run(False)
+    cascade_time, cascaded = run(True)
+
+    flat_base = [r for article in baseline for r in article]
+    flat_cascade = [r for article in cascaded for r in article]
+    eliminated = Counter(r["prefilter"] for r in flat_cascade if r["prefilter"])
+    kept = [(b, c) for b, c in zip(flat_base, flat_cascade) if not c["prefilter"]]
+    dropped = [(b, c) for b, c in zip(flat_base, flat_cascade) if c["prefilter"]]
+
+    print(f"Sentences:             {len(flat_base)}")
+    print(f"Eliminated by stage:   {dict(eliminated)}")
+    print(f"Without prefilter:     {baseline_time:.2f}s")
+    print(f"With prefilter:        {cascade_time:.2f}s ({baseline_time / cascade_time:.2f}x)")
+    print(f"Verdict agreement:     {sum(b['claim_type'] == c['claim_type'] for b, c in zip(flat_base, flat_cascade))}"
+          f"/{len(flat_base)}")
+    print(f"  on kept sentences:   {sum(b['claim_type'] == c['claim_type'] for b, c in kept)}/{len(kept)}")
+    print(f"  dropped, were FAKE:  {sum(b['claim_type'] == 'FAKE' for b, _ in dropped)}/{len(dropped)}")
+    print(f"  dropped, check-worthy by ClaimBuster: {sum(b['score'] > 0.6 for b, _ in dropped)}/{len(dropped)}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Measures cold import time and resident memory of the pipeline, then the cost
+of warming up the models each mode needs. Every measurement runs in a fresh
+interpreter so earlier imports do not hide later ones.
+
+    python benchmarks/bench_startup.py
+"""
+import json
+import subprocess
+import sys
+
+from common import SRC_DIR
+
+PROBE = """
+import json, resource, sys, time
+sys.path.insert(0, {src!r})
+
+def rss_mb():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+start = time.perf_counter()
+import {module}
+import_s = time.perf_counter() - start
+import_rss = rss_mb()
+
+warmup_s = None
+if {mode!r} is not None:
+    from claim_detection import model_registry
+    start = time.perf_counter()
+    model_registry.warmup({mode!r})
+    warmup_s = time.perf_counter() - start
+
+print(json.dumps({{"import_s": import_s, "import_rss_mb": import_rss,
+                  "warmup_s": warmup_s, "peak_rss_mb": rss_mb()}}))
+"""
+
+CASES = [
+    ("pipeline.full_pipeline", None),
+    ("claim_detection.claim_classifier", None),
+    ("pipeline.full_pipeline", "manual_text"),
+    ("pipeline.full_pipeline", "article"),
+]
+
+
+def run_case(module, mode):
+    code = PROBE.format(src=SRC_DIR, module=module, mode=mode)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    print(f"{'module':34} {'warmup':12} {'import s':>9} {'import MB':>10} {'warmup s':>9} {'peak MB':>9}")
+    for module, mode in CASES:
+        r = run_case(module, mode)
+        warmup_s = f"{r['warmup_s']:.2f}" if r["warmup_s"] is not None else "-"
+        print(f"{module:34} {mode or '-':12} {r['import_s']:9.2f} {r['import_rss_mb']:10.0f} "
+              f"{warmup_s:>9} {r['peak_rss_mb']:9.0f}")
+
+
+if __name__ == "__main__":
+    main()
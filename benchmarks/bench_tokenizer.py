@@ -0,0 +1,65 @@
+"""
+NLI tokenization time per sentence: the old per-call pair encoding plus
+tokenizer.pad, against the PairEncoder with a cold and a warm encoding cache.
+
+    python benchmarks/bench_tokenizer.py --repeat 20 --batch-size 32
+
+Only the tokenizers are loaded, not the model weights.
+"""
+import argparse
+
+from common import SAMPLE_SENTENCES, timed
+from stub_services import load_corpus
+
+
+def corpus_sentences() -> list[str]:
+    lines = [s.strip() for a in load_corpus() for s in a["body"].replace("\n", " ").split(". ") if s.strip()]
+    return list(dict.fromkeys(SAMPLE_SENTENCES + lines))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    from transformers import AutoTokenizer
+    from claim_detection.model_registry import AUTO_MODEL_ID
+    from claim_detection.claim_classifier import NLI_PREMISE, NLI_MAX_LENGTH
+    from claim_detection import nli_tokenizer
+    from claim_detection.nli_tokenizer import PairEncoder, select_tokenizer
+
+    sentences = corpus_sentences()
+    batches = [sentences[i:i + args.batch_size] for i in range(0, len(sentences), args.batch_size)]
+    slow = AutoTokenizer.from_pretrained(AUTO_MODEL_ID, use_fast=False)
+
+    def baseline():
+        for batch in batches:
+            encodings = [slow(NLI_PREMISE, t, truncation=True, max_length=NLI_MAX_LENGTH) for t in batch]
+            slow.pad(encodings, padding=True, return_tensors="pt")
+
+    def run_encoder(encoder):
+        for batch in batches:
+            encoder.to_tensors(encoder.encode(batch))
+
+    per_sentence = len(sentences) * args.repeat / 1e6
+    _, base = timed(lambda: [baseline() for _ in range(args.repeat)])
+    print(f"{'variant':<28} {'us/sentence':>12}")
+    print(f"{'slow, per-call + pad':<28} {base / per_sentence:12.1f}")
+
+    # Skip the probe check so the fast tokenizer is timed even where it would be rejected
+    nli_tokenizer.NLI_FAST_TOKENIZER = "1"
+    for name, tokenizer in (("slow", slow), ("fast", select_tokenizer(AUTO_MODEL_ID, slow, NLI_PREMISE,
+                                                                      NLI_MAX_LENGTH))):
+        cold_total = 0.0
+        for _ in range(args.repeat):
+            encoder = PairEncoder(tokenizer, NLI_PREMISE, NLI_MAX_LENGTH)
+            _, elapsed = timed(run_encoder, encoder)
+            cold_total += elapsed
+        _, warm = timed(lambda: [run_encoder(encoder) for _ in range(args.repeat)])
+        print(f"{name + ' encoder, cold cache':<28} {cold_total / per_sentence:12.1f}")
+        print(f"{name + ' encoder, warm cache':<28} {warm / per_sentence:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Articles/minute of the forked worker pool at increasing worker counts.
+
+    python benchmarks/bench_worker_scaling.py --workers 1 2 4 8 --articles 32
+
+Without --input the articles are synthesised from the fixed sample sentences.
+Run with FAKE_ARTICLE_OFFLINE=1 against a warm lookup cache to measure model
+throughput rather than upstream API latency.
+"""
+import argparse
+import json
+import os
+
+from common import SAMPLE_SENTENCES, timed
+from pipeline.worker_pool import run_pipeline_pool
+
+
+def synthetic_articles(count: int) -> list[str]:
+    articles = []
+    for i in range(count):
+        rotated = SAMPLE_SENTENCES[i % len(SAMPLE_SENTENCES):] + SAMPLE_SENTENCES[:i % len(SAMPLE_SENTENCES)]
+        articles.append(json.dumps({"text": " ".join(rotated)}))
+    return articles
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--articles", type=int, default=32)
+    parser.add_argument("--input", help="File of URLs / texts / JSON lines to use instead")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, encoding="utf-8") as f:
+            items = [line for line in f if line.strip()][:args.articles]
+    else:
+        items = synthetic_articles(args.articles)
+
+    print(f"{'workers':>7} {'articles/min':>13} {'seconds':>8} {'errors':>7}")
+    for workers in sorted(set(args.workers)):
+        results, elapsed = timed(lambda: list(run_pipeline_pool(items, workers=workers)))
+        errors = sum(1 for r in results if r["error"])
+        print(f"{workers:7d} {len(items) / elapsed * 60:13.1f} {elapsed:8.1f} {errors:7d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import os
+import sys
+import time
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "SRC"))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+# Fixed sentence set so runs are comparable across machines and commits
+SAMPLE_SENTENCES = [
+    "Tesla Inc. opened its first showroom in India on Tuesday.",
+    "The showroom is located in the Bandra-Kurla Complex, an upscale business center in Mumbai.",
+    "Sales of Tesla electric cars fell sharply from April to June.",
+    "Narendra Modi is the President of the United States.",
+    "Joe Biden served as the 46th president of the United States.",
+    "The Eiffel Tower is located in Berlin.",
+    "Water boils at 100 degrees Celsius at sea level.",
+    "The company said it expects deliveries to recover in the second half of the year.",
+    "India is the world's third-biggest automotive market.",
+    "Elon Musk is the chief executive of Tesla and SpaceX.",
+    "Officials declined to comment on the report.",
+    "The Great Wall of China is visible from the Moon with the naked eye.",
+    "Mount Everest is the highest mountain above sea level, at 8,849 metres.",
+    "The central bank raised interest rates by 25 basis points on Wednesday, citing persistent inflation "
+    "in services and a tight labour market that has kept wage growth above pre-pandemic levels.",
+    "Barack Obama is the current president.",
+    "Read more stories like this on our website.",
+]
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
@@ -0,0 +1,98 @@
+"""
+Load test for the HTTP scoring service: fires requests from concurrent
+clients for a fixed duration and reports throughput, latency percentiles and
+how many requests were shed with 429.
+
+    python SRC/service/server.py --port 8080 &
+    python benchmarks/load_test_service.py --concurrency 1 8 32 --duration 30
+
+Requests post the saved corpus articles (or, with --sentences, single sample
+sentences in manual mode) to /v1/score/text. --force-refresh bypasses the
+result store so every request does real work.
+"""
+import argparse
+import itertools
+import threading
+import time
+from collections import Counter
+
+import requests
+
+from common import SAMPLE_SENTENCES
+from run_benchmarks import percentile
+from stub_services import load_corpus
+
+
+def payloads(args) -> list[dict]:
+    if args.sentences:
+        return [{"text": s, "mode": "manual", "force_refresh": args.force_refresh} for s in SAMPLE_SENTENCES]
+    return [{"text": a["body"], "mode": "article", "force_refresh": args.force_refresh} for a in load_corpus()]
+
+
+def run_level(base_url: str, bodies: list[dict], concurrency: int, duration: float) -> dict:
+    latencies, statuses = [], Counter()
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    cycle = itertools.cycle(bodies)
+
+    def client():
+        session = requests.Session()
+        while time.perf_counter() < deadline:
+            with lock:
+                body = next(cycle)
+            start = time.perf_counter()
+            try:
+                status = session.post(f"{base_url}/v1/score/text", json=body, timeout=300).status_code
+            except requests.RequestException:
+                status = "error"
+            elapsed = time.perf_counter() - start
+            with lock:
+                statuses[status] += 1
+                if status == 200:
+                    latencies.append(elapsed)
+            if status == 429:
+                time.sleep(0.05)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "ok": statuses[200],
+        "rejected": statuses[429],
+        "other": sum(v for k, v in statuses.items() if k not in (200, 429)),
+        "throughput_rps": statuses[200] / wall,
+        "p50_s": percentile(latencies, 50),
+        "p99_s": percentile(latencies, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8080")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--duration", type=float, default=20, help="Seconds per concurrency level")
+    parser.add_argument("--sentences", action="store_true", help="Post single sentences instead of articles")
+    parser.add_argument("--force-refresh", action="store_true")
+    args = parser.parse_args()
+
+    ready = requests.get(f"{args.base_url}/readyz", timeout=10)
+    if ready.status_code != 200:
+        raise SystemExit(f"Service not ready: {ready.text}")
+
+    bodies = payloads(args)
+    print(f"{'clients':>7} {'req/s':>8} {'p50 (s)':>8} {'p99 (s)':>8} {'ok':>6} {'429':>6} {'other':>6}")
+    for concurrency in args.concurrency:
+        r = run_level(args.base_url, bodies, concurrency, args.duration)
+        p50 = f"{r['p50_s']:8.3f}" if r["p50_s"] is not None else f"{'-':>8}"
+        p99 = f"{r['p99_s']:8.3f}" if r["p99_s"] is not None else f"{'-':>8}"
+        print(f"{concurrency:7d} {r['throughput_rps']:8.2f} {p50} {p99} {r['ok']:6d} {r['rejected']:6d} {r['other']:6d}")
+
+
+if __name__ == "__main__":
+    main()
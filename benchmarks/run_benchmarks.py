@@ -0,0 +1,163 @@
+"""
+Reproducible end-to-end benchmark: runs the saved corpus through
+run_pipeline_from_url and run_pipeline_from_text_manual against the local
+stub services, reports throughput and latency percentiles per stage, and
+stores the results so successive runs can be compared.
+
+    python benchmarks/run_benchmarks.py --iterations 3 --latency claimbuster=50 serpapi=150
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<previous>.json
+
+Each run uses a fresh lookup cache unless --warm-cache is given, so the
+numbers include the (stubbed) external calls. The result store and claim
+cache are off and cleared before every run either way.
+"""
+import argparse
+import datetime
+import glob
+import importlib
+import json
+import os
+import statistics
+import subprocess
+
+from common import timed
+from stub_services import load_corpus, parse_latency, use_stub_services
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * q / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(samples: list[float]) -> dict:
+    return {
+        "n": len(samples),
+        "mean_s": statistics.fmean(samples) if samples else None,
+        "p50_s": percentile(samples, 50),
+        "p90_s": percentile(samples, 90),
+        "p99_s": percentile(samples, 99),
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def run_mode(name, fn, inputs, iterations, collect_metrics):
+    latencies, stage_samples, sentences, counters = [], {}, 0, {}
+    for _ in range(iterations):
+        for item in inputs:
+            with collect_metrics() as m:
+                results, elapsed = timed(fn, item)
+            latencies.append(elapsed)
+            sentences += len(results)
+            data = m.to_dict()
+            for stage, s in data["stages"].items():
+                stage_samples.setdefault(stage, []).append(s["total_s"])
+            for key, value in data["counters"].items():
+                counters[key] = counters.get(key, 0) + value
+    total = sum(latencies)
+    return {
+        "mode": name,
+        "articles": len(latencies),
+        "sentences": sentences,
+        "articles_per_s": len(latencies) / total if total else None,
+        "sentences_per_s": sentences / total if total else None,
+        "latency": summarize(latencies),
+        "stages": {stage: summarize(v) for stage, v in sorted(stage_samples.items())},
+        "counters": counters,
+    }
+
+
+def print_report(report: dict, previous: dict = None):
+    prev_modes = {m["mode"]: m for m in (previous or {}).get("modes", [])}
+    for mode in report["modes"]:
+        prev = prev_modes.get(mode["mode"])
+        print(f"\n== {mode['mode']}: {mode['articles']} articles, {mode['sentences']} sentences, "
+              f"{mode['sentences_per_s']:.2f} sentences/s")
+        print(f"{'stage':28} {'p50 s':>8} {'p90 s':>8} {'p99 s':>8} {'Δp50':>8}")
+        rows = [("end-to-end", mode["latency"], prev and prev["latency"])]
+        rows += [(k, v, prev and prev["stages"].get(k)) for k, v in mode["stages"].items()]
+        for stage, s, p in rows:
+            delta = f"{(s['p50_s'] - p['p50_s']) / p['p50_s'] * 100:+7.1f}%" if p and p.get("p50_s") else ""
+            print(f"{stage:28} {s['p50_s']:8.3f} {s['p90_s']:8.3f} {s['p99_s']:8.3f} {delta:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--latency", nargs="*", help="service=milliseconds for the stub services")
+    parser.add_argument("--warm-cache", action="store_true", help="Keep the lookup cache between iterations")
+    parser.add_argument("--compare", help="Previous results file; defaults to the latest in benchmarks/results")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    server, base_url = use_stub_services(parse_latency(args.latency))
+
+    # Import after the environment points at the stubs; endpoints are read at import time
+    full_pipeline = importlib.import_module("pipeline.full_pipeline")
+    disk_cache = importlib.import_module("utils.disk_cache")
+    result_store = importlib.import_module("pipeline.result_store")
+    claim_cache = importlib.import_module("claim_detection.claim_cache")
+    metrics = importlib.import_module("utils.metrics")
+    importlib.import_module("claim_detection.model_registry").warmup("article")
+
+    corpus = load_corpus()
+    urls = [f"{base_url}/articles/{a['html']}" for a in corpus]
+    texts = [a["body"] for a in corpus]
+
+    def fresh(fn):
+        def run(item):
+            if not args.warm_cache:
+                disk_cache.get_default_cache().clear()
+            # Whole-article and per-claim replays would hide the pipeline being measured
+            if result_store.RESULT_STORE_ENABLED:
+                result_store.get_result_store().clear()
+            claim_cache.get_claim_cache().clear()
+            return fn(item)
+        return run
+
+    report = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "iterations": args.iterations,
+        "stub_latency_ms": dict(server.RequestHandlerClass.latency_ms),
+        "warm_cache": args.warm_cache,
+        "modes": [
+            run_mode("url", fresh(full_pipeline.run_pipeline_from_url), urls, args.iterations,
+                     metrics.collect_metrics),
+            run_mode("text_manual", fresh(full_pipeline.run_pipeline_from_text_manual), texts, args.iterations,
+                     metrics.collect_metrics),
+        ],
+        "stub_calls": dict(server.RequestHandlerClass.counts),
+    }
+    server.shutdown()
+
+    previous = None
+    candidates = [args.compare] if args.compare else sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))[-1:]
+    if candidates:
+        with open(candidates[0], encoding="utf-8") as f:
+            previous = json.load(f)
+        print(f"Comparing with {candidates[0]}")
+    print_report(report, previous)
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{report['timestamp'].replace(':', '')}-{report['revision']}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved {path}")
+
+
+if __name__ == "__main__":
+    main()
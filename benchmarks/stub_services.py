@@ -0,0 +1,224 @@
+"""
+Local stand-ins for ClaimBuster, the Wikipedia action/REST APIs, SerpAPI,
+Google Custom Search and the article pages themselves, with configurable
+per-service latency. Responses are deterministic so runs are comparable.
+
+    python benchmarks/stub_services.py --port 8765 --latency claimbuster=50 wikipedia=80
+
+stub_environment() returns the environment variables that point the pipeline
+at a running stub.
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+
+DEFAULT_LATENCY_MS = {
+    "claimbuster": 40,
+    "wikipedia": 60,
+    "serpapi": 120,
+    "google_cse": 100,
+    "article": 30,
+}
+
+
+def _load_knowledge() -> dict:
+    with open(os.path.join(CORPUS_DIR, "knowledge.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _stable_unit(text: str) -> float:
+    """Deterministic pseudo-score in [0, 1) for a piece of text."""
+    return (zlib.crc32(text.encode("utf-8")) % 10000) / 10000
+
+
+def _page_id(title: str) -> str:
+    return str(zlib.crc32(title.encode("utf-8")) % 10_000_000)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency_ms = dict(DEFAULT_LATENCY_MS)
+    knowledge = {}
+    counts = {}
+    counts_lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _service(self, name: str):
+        with self.counts_lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+        delay = self.latency_ms.get(name, 0)
+        if delay:
+            time.sleep(delay / 1000)
+
+    def _send(self, body, status=200, content_type="application/json"):
+        payload = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _resolve_title(self, query: str):
+        query_lower = query.lower()
+        for title in self.knowledge:
+            if title.lower() in query_lower or query_lower in title.lower():
+                return title
+        return query.strip().title() or None
+
+    def _extract(self, title: str) -> str:
+        return self.knowledge.get(title, f"{title} is a topic described in the benchmark corpus.")
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if path.startswith("/claimbuster/"):
+            self._service("claimbuster")
+            text = body.get("input_text", "")
+            self._send({"version": "2", "claim": text,
+                        "results": [{"text": text, "index": 0, "score": _stable_unit(text)}]})
+        else:
+            self._send({"error": "not found"}, status=404)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+
+        if url.path.startswith("/articles/"):
+            self._service("article")
+            path = os.path.join(CORPUS_DIR, os.path.basename(url.path))
+            if not os.path.exists(path):
+                return self._send({"error": "not found"}, status=404)
+            with open(path, "rb") as f:
+                return self._send(f.read(), content_type="text/html; charset=utf-8")
+
+        if url.path == "/w/api.php":
+            self._service("wikipedia")
+            return self._send(self._wiki_action(params))
+
+        if url.path.startswith("/api/rest_v1/page/summary/"):
+            self._service("wikipedia")
+            title = unquote(url.path.rsplit("/", 1)[-1]).replace("_", " ")
+            return self._send({"title": title, "extract": self._extract(title)})
+
+        if url.path == "/search":
+            self._service("serpapi")
+            q = params.get("q", "")
+            return self._send({"organic_results": [
+                {"position": i + 1, "title": f"Result {i + 1}", "snippet": f"Coverage of {q} (source {i + 1})."}
+                for i in range(int(params.get("num", 3)))
+            ]})
+
+        if url.path == "/customsearch/v1":
+            self._service("google_cse")
+            q = params.get("q", "")
+            return self._send({"items": [{"snippet": f"Search result about {q}."}]})
+
+        self._send({"error": "not found"}, status=404)
+
+    def _wiki_action(self, params: dict) -> dict:
+        if params.get("list") == "search":
+            title = self._resolve_title(params.get("srsearch", ""))
+            return {"query": {"searchinfo": {}, "search": [{"title": title}] if title else []}}
+
+        titles = [t for t in params.get("titles", "").split("|") if t]
+        pages = {}
+        for title in titles:
+            page = {"pageid": int(_page_id(title)), "title": title,
+                    "fullurl": f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}"}
+            if "extracts" in params.get("prop", ""):
+                page["extract"] = self._extract(title)
+                page["revisions"] = [{"revid": 1, "parentid": 0}]
+            pages[_page_id(title)] = page
+        return {"query": {"pages": pages}}
+
+
+def start_stub_server(port: int = 0, latency_ms: dict = None):
+    """Starts the stub in a daemon thread. Returns (server, base_url)."""
+    StubHandler.latency_ms = dict(DEFAULT_LATENCY_MS, **(latency_ms or {}))
+    StubHandler.knowledge = _load_knowledge()
+    StubHandler.counts = {}
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def stub_environment(base_url: str) -> dict:
+    return {
+        "CLAIMBUSTER_ENDPOINT": f"{base_url}/claimbuster/api/v2/score/text/",
+        "CLAIMBUSTER_API_KEY": "stub",
+        "WIKIPEDIA_API_URL": f"{base_url}/w/api.php",
+        "WIKIPEDIA_REST_URL": f"{base_url}/api/rest_v1",
+        "SERPAPI_BACKEND": base_url,
+        "SERPAPI_KEY": "stub",
+        "GOOGLE_CSE_ENDPOINT": f"{base_url}/customsearch/v1",
+        "GOOGLE_API_KEY": "stub",
+        "GOOGLE_CX": "stub",
+    }
+
+
+def use_stub_services(latency_ms: dict = None):
+    """
+    Starts the stub and points this process at it, with a throwaway lookup
+    cache. The result store and claim cache are switched off (and the store
+    moved out of the repo's data dir) so repeated iterations redo the work
+    instead of replaying it. Must run before the pipeline modules are
+    imported, since they read their endpoints and settings at import time.
+    Returns (server, base_url).
+    """
+    server, base_url = start_stub_server(0, latency_ms)
+    os.environ.update(stub_environment(base_url))
+    cache_dir = tempfile.mkdtemp(prefix="fake-article-bench-")
+    os.environ["FAKE_ARTICLE_CACHE_PATH"] = os.path.join(cache_dir, "lookups.sqlite3")
+    os.environ["RESULT_STORE_PATH"] = os.path.join(cache_dir, "results.sqlite3")
+    os.environ["RESULT_STORE_ENABLED"] = "0"
+    os.environ["CLAIM_CACHE_ENABLED"] = "0"
+    return server, base_url
+
+
+def load_corpus() -> list[dict]:
+    """Manifest entries with the article text loaded under "body"."""
+    with open(os.path.join(CORPUS_DIR, "manifest.json"), encoding="utf-8") as f:
+        articles = json.load(f)["articles"]
+    for article in articles:
+        with open(os.path.join(CORPUS_DIR, article["text"]), encoding="utf-8") as f:
+            article["body"] = f.read()
+    return articles
+
+
+def parse_latency(pairs) -> dict:
+    latency = {}
+    for pair in pairs or []:
+        name, _, ms = pair.partition("=")
+        latency[name] = float(ms)
+    return latency
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", nargs="*", help="service=milliseconds, e.g. claimbuster=50")
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(args.port, parse_latency(args.latency))
+    print(f"Stub services on {base_url}")
+    for key, value in stub_environment(base_url).items():
+        print(f"export {key}={value}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import pytest
+
+bulk = pytest.importorskip("pipeline.bulk")
+
+ROWS = [{"sentence": "The bridge opened in 1932.", "score": 0.8, "verdict": "Likely fact",
+         "claim_type": "REAL", "evidence": []}]
+
+
+def test_flushed_parquet_parts_are_readable_before_close(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    writer = bulk.ParquetWriter(str(tmp_path / "out.parquet"), append=False, row_group_size=2)
+
+    assert not writer.write({"index": 0, "input": "a", "results": ROWS})
+    assert writer.write({"index": 1, "input": "b", "results": ROWS})
+
+    # No close(): a crash here must still leave the checkpointed rows readable
+    table = pq.read_table(str(tmp_path / "out.part001.parquet"))
+    assert table.column("index").to_pylist() == [0, 1]
+
+    resumed = bulk.ParquetWriter(str(tmp_path / "out.parquet"), append=True, row_group_size=2)
+    resumed.write({"index": 2, "input": "c", "results": ROWS})
+    resumed.close()
+    assert pq.read_table(str(tmp_path / "out.part002.parquet")).column("index").to_pylist() == [2]
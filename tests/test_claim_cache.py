@@ -0,0 +1,101 @@
+import pytest
+
+from claim_detection.claim_cache import ClaimCache, cached_claim, fact_tokens, normalize_claim
+from claim_detection import claim_cache as claim_cache_module
+from utils import metrics
+
+
+def test_normalize_claim():
+    assert normalize_claim("Tesla’s  showroom, in MUMBAI!") == "tesla s showroom in mumbai"
+
+
+def test_exact_and_near_duplicate_hits():
+    cache = ClaimCache(threshold=0.6)
+    cache.put("Tesla Inc. opened its first showroom in India on Tuesday, marking its debut in the market.", "REAL")
+
+    assert cache.get("tesla inc opened its first showroom in india on tuesday marking its debut in the market") == "REAL"
+    assert cache.get("Tesla Inc. opened its first showroom in India on Tuesday, marking its long debut in the market.") == "REAL"
+    assert cache.get("The central bank raised interest rates by 25 basis points on Wednesday.") is None
+    assert cache.stats == {"exact_hits": 1, "near_hits": 1, "misses": 1, "evictions": 0}
+    assert cache.hit_rate() == pytest.approx(2 / 3)
+
+
+def test_fact_tokens():
+    assert fact_tokens(normalize_claim("Rates didn't rise 0.25% in 2024, not 2023.")) == ("not", "0", "25", "2024", "not", "2023")
+
+
+def test_near_duplicates_with_different_facts_miss():
+    cache = ClaimCache()
+    cache.put("Narendra Modi is the Prime Minister of India since 2014.", "REAL")
+
+    assert cache.get("Narendra Modi is the Prime Minister of India since 2014 .") == "REAL"
+    assert cache.get("Narendra Modi is the Prime Minister of India since 2019.") is None
+    assert cache.get("Narendra Modi is not the Prime Minister of India since 2014.") is None
+    assert cache.get("Narendra Modi isn't the Prime Minister of India since 2014.") is None
+
+
+def test_namespaces_are_separate():
+    cache = ClaimCache()
+    cache.put("Water boils at 100 degrees Celsius at sea level.", "REAL", namespace="a")
+    assert cache.get("Water boils at 100 degrees Celsius at sea level.", namespace="b") is None
+
+
+@pytest.mark.parametrize("eviction, survivor", [("lru", "first claim about tesla"), ("fifo", "second claim about rates")])
+def test_eviction_policies(eviction, survivor):
+    cache = ClaimCache(max_entries=2, eviction=eviction)
+    cache.put("first claim about tesla", 1)
+    cache.put("second claim about rates", 2)
+    cache.get("first claim about tesla")
+    cache.put("third claim about climate", 3)
+
+    assert len(cache) == 2
+    assert cache.get(survivor) is not None
+    assert cache.stats["evictions"] == 1
+
+
+def test_cached_claim_keys_on_mode(monkeypatch):
+    monkeypatch.setattr(claim_cache_module, "_default_cache", ClaimCache())
+    calls = []
+
+    @cached_claim("test")
+    def classify(text, mode="article", context=None):
+        calls.append((text, mode))
+        return mode.upper()
+
+    assert classify("Joe Biden is president.") == "ARTICLE"
+    assert classify("Joe Biden is president.", context=object()) == "ARTICLE"
+    assert classify("Joe Biden is president.", mode="manual") == "MANUAL"
+    assert calls == [("Joe Biden is president.", "article"), ("Joe Biden is president.", "manual")]
+
+
+def test_cached_claim_skips_degraded_verdicts(monkeypatch):
+    monkeypatch.setattr(claim_cache_module, "_default_cache", ClaimCache())
+    upstream_down = [True]
+    calls = []
+
+    @cached_claim("test")
+    def classify(text):
+        calls.append(text)
+        if upstream_down[0]:
+            metrics.lookup_failed("claimbuster")
+            return "UNSURE"
+        return "REAL"
+
+    assert classify("Water boils at 100 degrees Celsius.") == "UNSURE"
+    upstream_down[0] = False
+    assert classify("Water boils at 100 degrees Celsius.") == "REAL"
+    assert classify("Water boils at 100 degrees Celsius.") == "REAL"
+    assert len(calls) == 2
+
+
+def test_cached_claim_refresh_overwrites(monkeypatch):
+    monkeypatch.setattr(claim_cache_module, "_default_cache", ClaimCache())
+    verdicts = iter(["UNSURE", "REAL"])
+
+    @cached_claim("test")
+    def classify(text):
+        return next(verdicts)
+
+    assert classify("Water boils at 100 degrees Celsius.") == "UNSURE"
+    assert classify("Water boils at 100 degrees Celsius.", refresh=True) == "REAL"
+    assert classify("Water boils at 100 degrees Celsius.") == "REAL"
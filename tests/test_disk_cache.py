@@ -0,0 +1,58 @@
+import time
+
+from utils import disk_cache
+from utils.disk_cache import DiskCache, disk_cached, normalize_key
+
+
+def test_normalize_key():
+    assert normalize_key("  Joe   Biden\nis President ") == "joe biden is president"
+
+
+def test_get_set_and_ttl(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), ttls={"claimbuster": 60})
+    assert cache.get("claimbuster", "k") == (False, None)
+
+    cache.set("claimbuster", "k", 0.75)
+    assert cache.get("claimbuster", "k") == (True, 0.75)
+
+    cache.ttls["claimbuster"] = -1
+    assert cache.get("claimbuster", "k") == (False, None)
+
+
+def test_lru_eviction(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.set("wikipedia", "a", ["a"])
+    time.sleep(0.01)
+    cache.set("wikipedia", "b", ["b"])
+    time.sleep(0.01)
+    cache.get("wikipedia", "a")
+    time.sleep(0.01)
+    cache.set("wikipedia", "c", ["c"])
+    cache.evict()
+
+    assert len(cache) == 2
+    assert cache.get("wikipedia", "b")[0] is False
+    assert cache.get("wikipedia", "a")[0] is True
+
+
+def test_disk_cached_and_offline(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache, "_default_cache", DiskCache(str(tmp_path / "cache.sqlite3")))
+    calls = []
+
+    @disk_cached("serpapi", offline_default=[])
+    def lookup(query):
+        calls.append(query)
+        return [query.upper()] if query != "empty" else []
+
+    assert lookup("Tesla India") == ["TESLA INDIA"]
+    assert lookup("tesla   india") == ["TESLA INDIA"]
+    assert calls == ["Tesla India"]
+
+    # Empty results are not cached
+    lookup("empty")
+    lookup("empty")
+    assert calls.count("empty") == 2
+
+    monkeypatch.setenv("FAKE_ARTICLE_OFFLINE", "1")
+    assert lookup("never seen") == []
+    assert "never seen" not in calls
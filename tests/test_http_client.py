@@ -0,0 +1,177 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils import http_client
+from utils.metrics import collect_metrics
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Fault-injecting upstream: the next `failures_left` requests fail with `fail_status`."""
+    failures_left = 0
+    fail_status = 503
+    retry_after = None
+    hits = 0
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.hits += 1
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            if self.path.startswith("/slow"):
+                time.sleep(0.2)
+            with cls.lock:
+                fail = cls.failures_left > 0
+                cls.failures_left -= fail
+            self.send_response(cls.fail_status if fail else 200)
+            if fail and cls.retry_after is not None:
+                self.send_header("Retry-After", cls.retry_after)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b'{"ok": true}')
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    StubHandler.failures_left = 0
+    StubHandler.fail_status = 503
+    StubHandler.retry_after = None
+    StubHandler.hits = 0
+    StubHandler.max_in_flight = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_retries_retryable_status(stub_server):
+    StubHandler.failures_left = 2
+    response = http_client.get(f"{stub_server}/", retries=2, backoff=0.01)
+    assert response.status_code == 200
+    assert response.json() == {"ok": True}
+
+
+def test_returns_last_error_when_retries_exhausted(stub_server):
+    StubHandler.failures_left = 5
+    response = http_client.get(f"{stub_server}/", retries=1, backoff=0.01)
+    assert response.status_code == 503
+
+
+def test_timeout_raises(stub_server):
+    with pytest.raises(Exception):
+        http_client.get(f"{stub_server}/slow", timeout=0.05, retries=0)
+
+
+def test_per_host_concurrency_limit(stub_server, monkeypatch):
+    host = stub_server.replace("http://", "")
+    monkeypatch.setitem(http_client.HOST_LIMITS, host, 2)
+    http_client._host_semaphores.pop(host, None)
+
+    threads = [threading.Thread(target=http_client.get, args=(f"{stub_server}/slow",)) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert StubHandler.max_in_flight == 2
+
+
+@pytest.fixture
+def source(monkeypatch):
+    """A fresh source name with its own breaker and a generous rate limit."""
+    monkeypatch.setitem(http_client.SOURCE_RATE_LIMITS, "stub", (1000.0, 1000))
+    monkeypatch.setattr(http_client, "_breakers", {})
+    monkeypatch.setattr(http_client, "_buckets", {})
+    return "stub"
+
+
+def test_retry_after_is_honored(stub_server, source):
+    StubHandler.failures_left = 1
+    StubHandler.fail_status = 429
+    StubHandler.retry_after = "0.3"
+    start = time.monotonic()
+    response = http_client.get(f"{stub_server}/", retries=1, backoff=0.01, source=source)
+    assert response.status_code == 200
+    assert time.monotonic() - start >= 0.3
+
+
+def test_long_retry_after_is_not_waited_out(stub_server, source, monkeypatch):
+    monkeypatch.setattr(http_client, "RETRY_AFTER_MAX", 1)
+    StubHandler.failures_left = 5
+    StubHandler.fail_status = 429
+    StubHandler.retry_after = "120"
+    start = time.monotonic()
+    response = http_client.get(f"{stub_server}/", retries=3, source=source)
+    assert response.status_code == 429
+    assert StubHandler.hits == 1
+    assert time.monotonic() - start < 1
+
+
+def test_circuit_opens_and_recovers(stub_server, source, monkeypatch):
+    monkeypatch.setattr(http_client, "CIRCUIT_FAILURE_THRESHOLD", 3)
+    monkeypatch.setattr(http_client, "CIRCUIT_RESET_SECONDS", 0.2)
+    StubHandler.failures_left = 100
+    with collect_metrics() as m:
+        for _ in range(3):
+            assert http_client.get(f"{stub_server}/", retries=0, source=source).status_code == 503
+        # Open: the stub is not called at all
+        with pytest.raises(http_client.SourceUnavailable):
+            http_client.get(f"{stub_server}/", retries=0, source=source)
+    assert StubHandler.hits == 3
+    assert http_client.circuit_states() == {source: "open"}
+    assert m.counters["http.stub.errors"] == 3
+    assert m.counters["http.stub.circuit_open"] == 1
+    assert m.stages["http.stub"]["count"] == 3
+
+    # After the reset interval one trial call goes through and closes the circuit
+    time.sleep(0.25)
+    StubHandler.failures_left = 0
+    assert http_client.get(f"{stub_server}/", retries=0, source=source).status_code == 200
+    assert http_client.circuit_states() == {source: "closed"}
+
+
+def test_failed_trial_reopens_circuit():
+    breaker = http_client.CircuitBreaker(failure_threshold=1, reset_after=0.05)
+    assert breaker.record_failure()
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+    # Only one trial at a time while half-open
+    assert not breaker.allow()
+    assert breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_token_bucket_limits_rate():
+    bucket = http_client.TokenBucket(rate=20, burst=2)
+    start = time.monotonic()
+    for _ in range(6):
+        assert bucket.acquire(max_wait=1)
+    # Two from the burst, then four at 20/s
+    assert time.monotonic() - start >= 0.18
+    empty = http_client.TokenBucket(rate=0.1, burst=1)
+    empty.acquire()
+    assert not empty.acquire(max_wait=0.05)
+
+
+def test_rate_limit_is_per_api_key(stub_server, source, monkeypatch):
+    monkeypatch.setitem(http_client.SOURCE_RATE_LIMITS, source, (0.01, 1))
+    monkeypatch.setattr(http_client, "RATE_LIMIT_MAX_WAIT", 0.05)
+    assert http_client.get(f"{stub_server}/", source=source, api_key="a").status_code == 200
+    assert http_client.get(f"{stub_server}/", source=source, api_key="b").status_code == 200
+    with pytest.raises(http_client.SourceUnavailable):
+        http_client.get(f"{stub_server}/", source=source, api_key="a")
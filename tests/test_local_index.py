@@ -0,0 +1,46 @@
+import json
+
+from evidence.local_index import LocalWikipediaIndex, build_index, tokenize
+
+
+def write_dump(path):
+    rows = [
+        {"title": "Narendra Modi", "abstract": "Narendra Modi is an Indian politician. He has served as the prime minister of India since 2014."},
+        {"title": "Joe Biden", "abstract": "Joe Biden is an American politician. He served as the 46th president of the United States."},
+        {"title": "Eiffel Tower", "abstract": "The Eiffel Tower is a wrought-iron lattice tower in Paris, France."},
+    ]
+    with open(path, "w") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+
+
+def test_tokenize_drops_stopwords():
+    assert tokenize("The President of the United States") == ["president", "united", "states"]
+
+
+def test_build_and_search(tmp_path):
+    dump = tmp_path / "dump.jsonl"
+    write_dump(dump)
+    meta = build_index(str(dump), str(tmp_path / "index"))
+    assert meta["titles"] == 3
+    assert meta["documents"] == 5
+
+    index = LocalWikipediaIndex(str(tmp_path / "index"))
+    hits = index.search("Modi prime minister of India", k=2)
+    assert hits[0]["title"] == "Narendra Modi"
+    assert hits[0]["sentence"] == "He has served as the prime minister of India since 2014."
+
+    assert index.search("Eiffel Tower Paris", k=1)[0]["title"] == "Eiffel Tower"
+    assert index.search("zzzz unknown words") == []
+
+
+def test_summary_returns_leading_sentences_of_best_article(tmp_path):
+    dump = tmp_path / "dump.jsonl"
+    write_dump(dump)
+    build_index(str(dump), str(tmp_path / "index"))
+    index = LocalWikipediaIndex(str(tmp_path / "index"))
+
+    assert index.summary("Joe Biden") == (
+        "Joe Biden is an American politician. He served as the 46th president of the United States."
+    )
+    assert index.summary("qqqq") is None
@@ -0,0 +1,63 @@
+import threading
+
+from utils import metrics
+from utils.metrics import collect_metrics, stage, incr, observe_batch
+
+
+def test_noop_without_collector():
+    with stage("parse"):
+        incr("external_calls.claimbuster")
+    assert metrics.current_metrics() is None
+
+
+def test_collects_stages_counters_and_batches():
+    with collect_metrics() as m:
+        with stage("nli"):
+            observe_batch(8)
+        with stage("nli"):
+            observe_batch(3)
+        incr("cache.claimbuster.hit", 2)
+
+        # Nested collectors reuse the outer one
+        with collect_metrics() as inner:
+            incr("cache.claimbuster.hit")
+        assert inner is m
+
+    data = m.to_dict()
+    assert data["stages"]["nli"]["count"] == 2
+    assert data["counters"] == {"cache.claimbuster.hit": 3}
+    assert data["batch_sizes"] == [8, 3]
+
+    text = m.to_prometheus()
+    assert 'fake_article_stage_calls_total{stage="nli"} 2' in text
+    assert 'fake_article_events_total{name="cache.claimbuster.hit"} 3' in text
+
+
+def test_thread_safe_increments():
+    with collect_metrics() as m:
+        def work():
+            for _ in range(1000):
+                m.incr("n")
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    assert m.counters["n"] == 8000
+
+
+def test_track_failures_nests_and_counts():
+    with collect_metrics() as m:
+        with metrics.track_failures() as outer:
+            with metrics.track_failures() as inner:
+                metrics.lookup_failed("claimbuster")
+            metrics.mark_failed("wikipedia")
+        with metrics.track_failures() as clean:
+            incr("external_calls.claimbuster")
+
+    assert inner == ["claimbuster"]
+    assert outer == ["claimbuster", "wikipedia"]
+    assert clean == []
+    # Only lookup_failed counts an error; mark_failed just flags the block
+    assert m.counters["external_errors.claimbuster"] == 1
+    assert "external_errors.wikipedia" not in m.counters
@@ -0,0 +1,67 @@
+from claim_detection.nli_tokenizer import PairEncoder
+
+
+class ToyTokenizer:
+    """Whitespace tokenizer with a RoBERTa-style pair layout: <s> A </s></s> B </s>."""
+
+    model_input_names = ["input_ids", "attention_mask"]
+    pad_token_id = 1
+
+    def __init__(self):
+        self.vocab = {}
+        self.calls = 0
+
+    def _ids(self, text):
+        return [self.vocab.setdefault(w, len(self.vocab) + 10) for w in text.split()]
+
+    def num_special_tokens_to_add(self, pair=False):
+        return 4 if pair else 2
+
+    def build_inputs_with_special_tokens(self, a, b):
+        return [0] + a + [2, 2] + b + [2]
+
+    def __call__(self, text, pair=None, add_special_tokens=True, truncation=False, max_length=None):
+        self.calls += 1
+        if isinstance(text, list):
+            return {"input_ids": [self._ids(t) for t in text]}
+        if pair is None:
+            return {"input_ids": self._ids(text)}
+        a, b = self._ids(text), self._ids(pair)
+        if truncation:
+            b = b[:max_length - len(a) - 4]
+        return {"input_ids": self.build_inputs_with_special_tokens(a, b)}
+
+
+def test_assembled_pairs_match_direct_encoding():
+    tokenizer = ToyTokenizer()
+    encoder = PairEncoder(tokenizer, "According to verified sources,", max_length=12)
+    assert encoder.assemble
+
+    short = "Water boils at 100 degrees."
+    long = " ".join(f"w{n}" for n in range(20))
+    for text in (short, long):
+        assert encoder.encode([text])[0] == encoder._direct(text)
+    assert len(encoder.encode([long])[0][0]) == 12
+
+
+def test_encodings_are_cached_with_lru_bound():
+    tokenizer = ToyTokenizer()
+    encoder = PairEncoder(tokenizer, "Premise.", max_length=64, cache_size=2)
+    encoder.encode(["a b", "c d"])
+    calls = tokenizer.calls
+    encoder.encode(["a b", "c d", "a b"])
+    assert tokenizer.calls == calls
+
+    encoder.encode(["a b"])
+    encoder.encode(["e f"])
+    assert encoder.cache_info()["entries"] == 2
+    assert "c d" not in encoder._cache and "a b" in encoder._cache
+
+
+def test_to_arrays_pads_right():
+    encoder = PairEncoder(ToyTokenizer(), "P", max_length=64)
+    arrays = encoder.to_arrays(encoder.encode(["one", "one two three"]))
+    assert set(arrays) == {"input_ids", "attention_mask"}
+    assert arrays["input_ids"].shape == (2, 8)
+    assert arrays["attention_mask"].tolist() == [[1] * 6 + [0] * 2, [1] * 8]
+    assert arrays["input_ids"][0, -1] == ToyTokenizer.pad_token_id
@@ -0,0 +1,51 @@
+import pytest
+
+from utils import disk_cache
+from utils.disk_cache import DiskCache, normalize_key
+from claim_detection.prefilter import checkworthiness_scores, heuristic_reject, run_cascade
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(disk_cache, "_default_cache", cache)
+    return cache
+
+
+@pytest.mark.parametrize("sentence, entities, reason", [
+    ("Read more stories like this on our website.", [], "boilerplate"),
+    ("Subscribe to our newsletter for daily market updates.", [], "boilerplate"),
+    ("By Jane Smith", [("Jane Smith", "PERSON")], "too_short"),
+    ("Officials declined to comment on the report.", [], "no_entity_or_number"),
+    ("Will the central bank raise rates again in July?", [("July", "DATE")], "question"),
+    ("The central bank raised rates by 25 basis points.", [("25", "CARDINAL")], None),
+])
+def test_heuristic_reject(sentence, entities, reason):
+    assert heuristic_reject(sentence, entities) == reason
+
+
+def test_scorer_prefers_factual_claims():
+    factual = "Consumer prices rose 3.9% in the year to May, well above the 2% target."
+    opinion = "I think the Tesla showroom in Mumbai is a beautiful building."
+    scores = checkworthiness_scores(
+        [factual, opinion],
+        [[("3.9%", "PERCENT"), ("May", "DATE")], [("Tesla", "ORG"), ("Mumbai", "GPE")]],
+    )
+    assert scores[0] > 0.5 > scores[1]
+
+
+def test_cascade_counts_and_cached_claimbuster_score(isolated_cache):
+    parsed = [
+        ("Read more stories like this on our website.", []),
+        ("I think the Tesla showroom in Mumbai is a beautiful building.", [("Tesla", "ORG"), ("Mumbai", "GPE")]),
+        ("Consumer prices rose 3.9% in the year to May, well above the 2% target.", [("3.9%", "PERCENT")]),
+        ("Narendra Modi met officials in New Delhi on Friday afternoon.", [("Narendra Modi", "PERSON")]),
+    ]
+    isolated_cache.set("claimbuster", normalize_key(parsed[3][0]), 0.05)
+
+    result = run_cascade(parsed, threshold=0.5)
+
+    assert result["keep"] == [False, False, True, False]
+    assert result["eliminated_by"] == ["boilerplate", "low_checkworthiness", None, "low_checkworthiness"]
+    assert result["scores"][3] == 0.05
+    assert result["counts"] == {"input": 4, "heuristics": 1, "scorer": 2, "kept": 1}
@@ -0,0 +1,78 @@
+import pytest
+
+from pipeline.result_store import ResultStore, url_key, content_key, served_from_cache
+from utils.metrics import collect_metrics
+
+ROWS = [{"sentence": "The bridge opened in 1932.", "score": 0.8, "claim_type": "REAL", "evidence": []}]
+
+
+def test_keys_are_normalized():
+    assert url_key("HTTPS://Example.com/story/") == url_key("https://example.com/story")
+    # Paths and queries are case-sensitive on most servers
+    assert url_key("https://example.com/Story") != url_key("https://example.com/story")
+    assert url_key("https://example.com/a?id=X") != url_key("https://example.com/a?id=x")
+    assert content_key("Some  text\n") == content_key("some text")
+    assert content_key("some text") != content_key("some text", mode="manual")
+
+
+def test_put_get_and_invalidate(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"))
+    key = url_key("https://example.com/a")
+    assert store.get(key) is None
+
+    store.put([key, content_key("text")], ROWS)
+    assert store.get(key) == ROWS
+    assert store.get(content_key("text")) == ROWS
+
+    store.invalidate(key)
+    assert store.get(key) is None
+
+
+def test_size_bound_and_ttl(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"), max_entries=2)
+    for n in range(4):
+        store.put([f"url:{n}"], ROWS)
+    assert len(store) == 2
+
+    expired = ResultStore(str(tmp_path / "expired.sqlite3"), ttl=-1)
+    expired.put(["url:x"], ROWS)
+    assert expired.get("url:x") is None
+
+
+def test_served_from_cache_counter(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"))
+    store.put(["url:a"], ROWS)
+    with collect_metrics() as run_metrics:
+        store.get("url:missing")
+    assert not served_from_cache(run_metrics)
+    with collect_metrics() as run_metrics:
+        store.get("url:a")
+    assert served_from_cache(run_metrics)
+
+
+def test_runs_with_failed_lookups_are_not_stored(tmp_path, monkeypatch):
+    full_pipeline = pytest.importorskip("pipeline.full_pipeline")
+    from pipeline import result_store
+    from utils import metrics
+
+    monkeypatch.setattr(full_pipeline, "RESULT_STORE_ENABLED", True)
+    monkeypatch.setattr(result_store, "_store", ResultStore(str(tmp_path / "results.sqlite3")))
+    upstream_down = [True]
+
+    def score_text(text, nli_fn=None, force_refresh=False):
+        if upstream_down[0]:
+            metrics.lookup_failed("claimbuster")
+            return [dict(ROWS[0], score=0.0, verdict="Not significant")]
+        return ROWS
+
+    monkeypatch.setattr(full_pipeline, "_score_text", score_text)
+    text = "The bridge opened in 1932."
+
+    assert full_pipeline.run_pipeline_from_text(text)[0]["score"] == 0.0
+    upstream_down[0] = False
+    assert full_pipeline.run_pipeline_from_text(text) == ROWS
+    # The recovered run was stored and is replayed from now on
+    upstream_down[0] = True
+    with collect_metrics() as m:
+        assert full_pipeline.run_pipeline_from_text(text) == ROWS
+    assert served_from_cache(m)
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from pipeline.result_table import ResultTable
+
+
+def _results():
+    return [
+        {"sentence": "Modi is the President of the US.", "score": 0.9, "verdict": "Check-worthy",
+         "claim_type": "FAKE", "evidence": ["https://example.com/a"], "entities": [("Modi", "PERSON")]},
+        {"sentence": "Everest is 8,849 metres high.", "score": 0.7, "verdict": "Check-worthy",
+         "claim_type": "REAL", "evidence": [], "entities": []},
+        {"sentence": "Read more below.", "score": 0.1, "verdict": "Not significant",
+         "claim_type": "UNSURE", "prefilter": "boilerplate"},
+    ]
+
+
+def test_filter_counts_and_sort():
+    table = ResultTable.from_results(_results())
+    view = table.filter(min_score=0.5)
+
+    assert len(view) == 2
+    assert view.counts()["FAKE"] == 1 and view.counts()["UNSURE"] == 0
+    assert [r["claim_type"] for r in table.filter(claim_types=["REAL"])] == ["REAL"]
+    assert [r["score"] for r in table.view().sort_by("score", descending=False)] == [0.1, 0.7, 0.9]
+    assert [r["index"] for r in table.view().sort_by("score").head(2)] == [0, 1]
+
+
+def test_articles_and_placeholder_rows():
+    table = ResultTable()
+    table.extend(_results(), url="https://a.example")
+    empty = table.extend([], url="https://b.example", error="timeout")
+
+    assert len(table.articles) == 2
+    assert len(table) == 4
+    # The empty article keeps a row for export but never shows up in filtered views
+    assert len(table.filter()) == 3
+    assert table.view().column("error")[-1] == "timeout"
+    assert len(table.filter(articles=[empty])) == 0
+
+
+def test_unknown_labels_are_interned():
+    table = ResultTable()
+    table.append({"sentence": "x", "score": 0.5, "claim_type": "CONTRADICTION"})
+    table.append({"sentence": "y", "score": 0.5, "claim_type": "CONTRADICTION"})
+
+    assert table.categories["claim_type"].labels.count("CONTRADICTION") == 1
+    assert table.view().counts()["CONTRADICTION"] == 2
+
+
+def test_csv_and_jsonl_export():
+    table = ResultTable.from_results(_results())
+    columns = ("sentence", "score", "claim_type", "evidence")
+
+    rows = [json.loads(line) for line in table.to_jsonl(columns=columns).splitlines()]
+    assert rows[0] == {"sentence": "Modi is the President of the US.", "score": 0.9,
+                       "claim_type": "FAKE", "evidence": ["https://example.com/a"]}
+
+    lines = table.to_csv(columns=columns).splitlines()
+    assert lines[0] == "sentence,score,claim_type,evidence"
+    assert len(lines) == 4
+
+
+def test_prefiltered_rows_have_no_score():
+    rows = _results() + [{"sentence": "Click here to subscribe.", "score": None, "prefilter_score": 0.12,
+                          "verdict": "Not significant", "claim_type": "UNSURE", "prefilter": "boilerplate"}]
+    table = ResultTable.from_results(rows)
+
+    assert len(table.filter(min_score=0.0)) == 3
+    ordered = list(table.view().sort_by("score"))
+    assert ordered[-1]["score"] is None and ordered[-1]["prefilter_score"] == 0.12
+    exported = [json.loads(line) for line in table.to_jsonl(columns=("score", "prefilter_score")).splitlines()]
+    assert exported[-1] == {"score": None, "prefilter_score": 0.12}
+    assert exported[0] == {"score": 0.9, "prefilter_score": None}
+
+
+def test_parquet_round_trip(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = ResultTable()
+    table.extend(_results(), url="https://a.example")
+    table.extend([], url="https://b.example", error="timeout")
+
+    arrow = table.to_arrow(columns=("score", "claim_type", "evidence", "url", "error"))
+    assert pa.types.is_dictionary(arrow.schema.field("claim_type").type)
+
+    path = tmp_path / "results.parquet"
+    table.to_parquet(str(path), columns=("sentence", "score", "claim_type", "error"))
+    rows = pq.read_table(str(path)).to_pylist()
+    assert rows[0] == {"sentence": "Modi is the President of the US.", "score": 0.9, "claim_type": "FAKE",
+                       "error": None}
+    # The placeholder row for the failed article has no score
+    assert rows[-1]["score"] is None and rows[-1]["error"] == "timeout"
+    assert table.to_parquet(columns=("score",))[:4] == b"PAR1"
@@ -0,0 +1,169 @@
+import socket
+import threading
+import time
+
+import requests
+
+from service.nli_batcher import NLIBatcher
+from service.server import ScoringService, make_server
+
+
+def fake_nli(calls):
+    def classify(texts):
+        calls.append(list(texts))
+        return [{"label": "ENTAILMENT", "text": t} for t in texts]
+    return classify
+
+
+def test_batcher_coalesces_concurrent_requests():
+    calls = []
+    batcher = NLIBatcher(fake_nli(calls), max_sentences=64, max_wait_ms=100).start()
+    results = {}
+
+    def request(n):
+        results[n] = batcher.classify([f"s{n}a", f"s{n}b"])
+
+    threads = [threading.Thread(target=request, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.stop()
+
+    assert len(calls) == 1 and len(calls[0]) == 8
+    for n in range(4):
+        assert [r["text"] for r in results[n]] == [f"s{n}a", f"s{n}b"]
+
+
+def test_batcher_respects_max_sentences_and_errors():
+    calls = []
+    batcher = NLIBatcher(fake_nli(calls), max_sentences=2, max_wait_ms=50).start()
+    assert batcher.classify(["a", "b"]) == [{"label": "ENTAILMENT", "text": "a"},
+                                            {"label": "ENTAILMENT", "text": "b"}]
+    assert batcher.classify([]) == []
+    batcher.stop()
+
+    def boom(texts):
+        raise RuntimeError("model down")
+
+    batcher = NLIBatcher(boom, max_wait_ms=1).start()
+    try:
+        batcher.classify(["a"])
+        assert False, "expected the batch error to propagate"
+    except RuntimeError as e:
+        assert "model down" in str(e)
+    finally:
+        batcher.stop()
+
+
+def test_batcher_stop_leaves_no_request_waiting():
+    release = threading.Event()
+
+    def slow(texts):
+        release.wait(5)
+        return [{"label": "ENTAILMENT", "text": t} for t in texts]
+
+    batcher = NLIBatcher(slow, max_sentences=1, max_wait_ms=1).start()
+    outcomes = []
+
+    def request(text):
+        try:
+            outcomes.append(batcher.classify([text]))
+        except RuntimeError as e:
+            outcomes.append(e)
+
+    threads = [threading.Thread(target=request, args=(t,)) for t in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    stopper = threading.Thread(target=batcher.stop)
+    stopper.start()
+    release.set()
+    stopper.join(5)
+    for thread in threads:
+        thread.join(5)
+
+    assert not stopper.is_alive() and not any(t.is_alive() for t in threads)
+    assert len(outcomes) == 2
+    try:
+        batcher.classify(["late"])
+        assert False, "expected a stopped batcher to refuse work"
+    except RuntimeError as e:
+        assert "not running" in str(e)
+
+
+def start_service(runner, workers=1, queue_size=1, warmup=None):
+    runners = {"url": runner, "text": runner}
+    batcher = NLIBatcher(fake_nli([]), max_wait_ms=1)
+    service = ScoringService(runners, workers=workers, queue_size=queue_size, batcher=batcher,
+                             warmup=warmup).start()
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return service, server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def raw_post(base: str, path: str, header: str) -> str:
+    """Sends a hand-written request, e.g. with a header requests would refuse to send."""
+    host, port = base.replace("http://", "").split(":")
+    with socket.create_connection((host, int(port)), timeout=5) as sock:
+        sock.sendall(f"POST {path} HTTP/1.1\r\nHost: {host}\r\n{header}\r\n\r\n".encode())
+        return sock.recv(4096).decode()
+
+
+def test_endpoints_and_backpressure():
+    release = threading.Event()
+
+    def runner(payload, nli_fn):
+        release.wait(5)
+        return [dict(r, sentence=r["text"]) for r in nli_fn([payload["text"]])]
+
+    service, server, base = start_service(runner)
+    try:
+        service.ready.wait(5)
+        assert requests.get(f"{base}/healthz").json() == {"status": "ok"}
+        assert requests.get(f"{base}/readyz").status_code == 200
+        assert requests.post(f"{base}/v1/score/text", json={"text": ""}).status_code == 400
+        assert requests.post(f"{base}/v1/score/url", json={"url": "ftp://x"}).status_code == 400
+        assert raw_post(base, "/v1/score/text", "Content-Length: abc").split()[1] == "400"
+
+        # One job running, one queued: the third concurrent request is shed
+        responses = []
+        threads = [threading.Thread(target=lambda: responses.append(
+            requests.post(f"{base}/v1/score/text", json={"text": "Water boils at 100 C."})))
+            for _ in range(2)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.2)
+        shed = requests.post(f"{base}/v1/score/text", json={"text": "x"})
+        assert shed.status_code == 429 and shed.headers["Retry-After"] == "1"
+
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert [r.status_code for r in responses] == [200, 200]
+        body = responses[0].json()
+        assert body["results"][0]["sentence"] == "Water boils at 100 C."
+        assert body["from_cache"] is False
+
+        assert "fake_article_service_queue_depth 0" in requests.get(f"{base}/metrics").text
+    finally:
+        release.set()
+        server.shutdown()
+        service.stop()
+
+
+def test_not_ready_until_warm():
+    warm = threading.Event()
+    service, server, base = start_service(lambda p, nli_fn: [], warmup=lambda: warm.wait(5))
+    try:
+        assert requests.get(f"{base}/readyz").status_code == 503
+        assert requests.post(f"{base}/v1/score/text", json={"text": "hi"}).status_code == 503
+        warm.set()
+        service.ready.wait(5)
+        status = requests.get(f"{base}/readyz").json()
+        assert status["ready"] is True
+        # The stub warmup loads nothing
+        assert status["models"] and not any(status["models"].values())
+    finally:
+        server.shutdown()
+        service.stop()
@@ -0,0 +1,32 @@
+from utils.text_preprocessor import clean_text, iter_paragraph_chunks
+
+
+def test_clean_text():
+    assert clean_text("<p>Read  more at https://example.com</p>\n") == "Read more at"
+
+
+def test_short_text_is_a_single_chunk():
+    text = "One paragraph.\n\nAnother one."
+    assert list(iter_paragraph_chunks(text, max_chars=100)) == [text]
+
+
+def test_chunks_split_between_paragraphs():
+    paragraphs = [f"Paragraph {n} has a sentence in it." for n in range(20)]
+    text = "\n\n".join(paragraphs)
+    chunks = list(iter_paragraph_chunks(text, max_chars=120))
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == text
+    assert all(len(c) <= 120 for c in chunks)
+    # Every paragraph lands whole in exactly one chunk
+    for p in paragraphs:
+        assert sum(p in c for c in chunks) == 1
+
+
+def test_oversized_paragraph_splits_after_sentences():
+    text = " ".join(f"Sentence number {n} is here." for n in range(50))
+    chunks = list(iter_paragraph_chunks(text, max_chars=100))
+
+    assert "".join(chunks) == text
+    assert all(len(c) <= 100 for c in chunks)
+    assert all(c.rstrip().endswith(".") for c in chunks)
@@ -0,0 +1,16 @@
+import pytest
+
+worker_pool = pytest.importorskip("pipeline.worker_pool")
+
+
+def test_malformed_lines_become_indexed_error_records(monkeypatch):
+    monkeypatch.setattr(worker_pool, "parse_article", lambda text: [text])
+    monkeypatch.setattr(worker_pool, "score_sentences", lambda parsed: [{"sentence": parsed[0]}])
+    lines = ["The bridge opened in 1932.", "", '{"id": "x"}', '{"text": "Water boils at 100C.", "id": "y"}']
+
+    records = [worker_pool._score_item(item) for item in worker_pool._parse_items(lines)]
+
+    assert [r["index"] for r in records] == [0, 2, 3]
+    assert records[0]["results"] == [{"sentence": "The bridge opened in 1932."}]
+    assert records[1]["error"].startswith("invalid input:") and records[1]["results"] == []
+    assert records[2]["id"] == "y" and records[2]["error"] is None
@@ -7,7 +7,21 @@ import json
 import time
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
-from pipeline.full_pipeline import run_pipeline_from_url, run_pipeline_from_text_manual
+from pipeline.full_pipeline import iter_pipeline_from_url, run_pipeline_from_text_manual
+from pipeline.result_store import get_result_store, served_from_cache
+from pipeline.result_table import ResultTable
+from claim_detection import model_registry
+from claim_detection.claim_cache import get_claim_cache
+from utils.metrics import collect_metrics, configure_logging
+
+configure_logging()
+
+
+@st.cache_resource(show_spinner="Loading models...")
+def load_shared_resources():
+    """Loaded once per server process and shared by every session and rerun."""
+    model_registry.warmup(mode="article")
+    return {"result_store": get_result_store(), "claim_cache": get_claim_cache()}
 
 
 st.set_page_config(page_title="Fake News Detector", layout="wide")
@@ -28,6 +42,12 @@ st.sidebar.header("⚙️ Settings")
 min_score = st.sidebar.slider("Minimum Claim Score", 0.0, 1.0, 0.6, 0.05)
 max_claims = st.sidebar.slider("Maximum Claims to Display", 5, 50, 10)
 only_fake = st.sidebar.checkbox("Show only FAKE claims", value=False)
+force_refresh = st.sidebar.checkbox("🔄 Force refresh (ignore cached results)", value=False)
+
+resources = load_shared_resources()
+st.sidebar.markdown(f"<small>Cached results: `{len(resources['result_store'])}` | "
+                    f"Claim cache hit rate: `{resources['claim_cache'].hit_rate():.0%}`</small>",
+                    unsafe_allow_html=True)
 
 # === Input Mode ===
 input_mode = st.radio("Select Input Mode:", ("Article URL", "Manual Text Input"))
@@ -41,42 +61,88 @@ else:
 if "analysis_requested" not in st.session_state:
     st.session_state.analysis_requested = False
 if "results" not in st.session_state:
-    st.session_state.results = []
+    st.session_state.results = ResultTable()
+
+color_map = {"FAKE": "red", "REAL": "green", "UNSURE": "gray"}
+
+
+def summarize(table):
+    """Applies the sidebar filters to the result table and derives the claim counts and overall verdict."""
+    results = table.filter(min_score=min_score, claim_types=["FAKE"] if only_fake else None)
+    found = results.counts("claim_type")
+    counts = {label: found.get(label, 0) for label in color_map}
+    total = counts["FAKE"] + counts["REAL"]
+
+    # ✅ Verdict Logic
+    if total == 0:
+        verdict = "UNSURE"
+    elif counts["FAKE"] > counts["REAL"]:
+        verdict = "FAKE"
+    else:
+        verdict = "REAL"
+    return results, counts, verdict
+
+
+def render_claim(r):
+    claim_color = color_map.get(r["claim_type"], "gray")
+    st.markdown(
+        f"<span style='color:{claim_color}'>●</span> "
+        f"**{r['sentence']}**  \n"
+        f"<small>Score: `{round(r['score'], 2)}` | Type: `{r['claim_type']}`</small>",
+        unsafe_allow_html=True
+    )
+
+
+def render_live(placeholder, table, total_sentences):
+    """Redraws the in-progress view: running verdict, counts and the claims found so far."""
+    results, counts, verdict = summarize(table)
+    with placeholder.container():
+        st.markdown(f"⏳ Checked `{len(table)}` / `{total_sentences or '?'}` sentences "
+                    f"(highest check-worthiness first)")
+        cols = st.columns(4)
+        cols[0].markdown(f"Verdict so far: <b style='color:{color_map[verdict]}'>{verdict}</b>",
+                         unsafe_allow_html=True)
+        cols[1].metric("FAKE", counts["FAKE"])
+        cols[2].metric("REAL", counts["REAL"])
+        cols[3].metric("UNSURE", counts["UNSURE"])
+        for r in results.sort_by("score").head(max_claims):
+            render_claim(r)
+
 
 # === Analyze Button ===
 if st.button("Analyze") and user_input:
-    with st.spinner("Running claim detection pipeline..."):
-        start = time.time()
+    start = time.time()
+    with collect_metrics() as run_metrics:
         if input_mode == "Article URL":
-            st.session_state.results = run_pipeline_from_url(user_input)
+            # Results arrive highest check-worthiness first; redraw as each one lands
+            live = st.empty()
+            sentence_count = {}
+            table = ResultTable()
+            live.info("📥 Fetching and parsing article...")
+            for r in iter_pipeline_from_url(user_input, on_parsed=lambda n: sentence_count.update(n=n),
+                                            force_refresh=force_refresh):
+                table.append(r)
+                render_live(live, table, sentence_count.get("n"))
+            live.empty()
+            st.session_state.results = table
         else:
-            from pipeline.full_pipeline import run_pipeline_from_text_manual
-            st.session_state.results = run_pipeline_from_text_manual(user_input)
-
-        st.session_state.elapsed_time = time.time() - start
+            with st.spinner("Running claim detection pipeline..."):
+                st.session_state.results = ResultTable.from_results(
+                    run_pipeline_from_text_manual(user_input, force_refresh=force_refresh))
+
+    st.session_state.elapsed_time = time.time() - start
+    st.session_state.metrics = run_metrics.to_dict()
+    st.session_state.metrics_prometheus = run_metrics.to_prometheus()
+    st.session_state.from_cache = served_from_cache(run_metrics)
     st.session_state.analysis_requested = True
 
 
 # === Run Analysis ===
 if st.session_state.analysis_requested:
-    results = [r for r in st.session_state.results if r["score"] >= min_score]
-    if only_fake:
-        results = [r for r in results if r["claim_type"] == "FAKE"]
-
-    fake_count = sum(1 for r in results if r['claim_type'] == "FAKE")
-    real_count = sum(1 for r in results if r['claim_type'] == "REAL")
-    unsure_count = sum(1 for r in results if r['claim_type'] == "UNSURE")
+    results, counts, verdict = summarize(st.session_state.results)
+    fake_count, real_count, unsure_count = counts["FAKE"], counts["REAL"], counts["UNSURE"]
     total = fake_count + real_count
 
-    # ✅ Verdict Logic
-    if total == 0:
-        verdict = "UNSURE"
-    elif fake_count > real_count:
-        verdict = "FAKE"
-    else:
-        verdict = "REAL"
-
-    color_map = {"FAKE": "red", "REAL": "green", "UNSURE": "gray"}
     verdict_color = color_map.get(verdict, "gray")
     percent = (fake_count / total * 100) if total else 0
 
@@ -95,6 +161,33 @@ if st.session_state.analysis_requested:
             st.info("📘 Not enough data to make a decision.")
 
         st.markdown(f"⏱️ Processed in `{st.session_state.elapsed_time:.2f}` seconds")
+        if st.session_state.get("from_cache"):
+            st.caption("♻️ Served from cache. Tick \"Force refresh\" in the sidebar to re-run the pipeline.")
+
+        # ⏱️ Per-stage breakdown
+        run_metrics = st.session_state.get("metrics")
+        if run_metrics:
+            with st.expander("⏱️ Stage breakdown"):
+                stage_df = pd.DataFrame(
+                    [{"stage": k, "calls": v["count"], "total (s)": round(v["total_s"], 3),
+                      "max (s)": round(v["max_s"], 3)} for k, v in run_metrics["stages"].items()]
+                ).sort_values("total (s)", ascending=False)
+                st.dataframe(stage_df, hide_index=True, use_container_width=True)
+
+                counters_df = pd.DataFrame(
+                    [{"counter": k, "value": v} for k, v in sorted(run_metrics["counters"].items())]
+                )
+                st.dataframe(counters_df, hide_index=True, use_container_width=True)
+
+                batches = run_metrics["batch_sizes"]
+                if batches:
+                    st.markdown(f"<small>NLI batches: `{len(batches)}` | mean size: "
+                                f"`{sum(batches) / len(batches):.1f}`</small>", unsafe_allow_html=True)
+
+                st.download_button("Download metrics (JSON)", json.dumps(run_metrics, indent=2),
+                                   file_name="metrics.json", mime="application/json")
+                st.download_button("Download metrics (Prometheus)", st.session_state.metrics_prometheus,
+                                   file_name="metrics.prom", mime="text/plain")
 
         # 🧠 Explanation
         st.markdown("### 🧠 Why this verdict?")
@@ -133,29 +226,27 @@ if st.session_state.analysis_requested:
 
     with tabs[1]:
         st.subheader("Top Checked Claims")
-        top_claims = sorted(results, key=lambda x: x["score"], reverse=True)[:max_claims]
-        for r in top_claims:
-            claim_color = color_map.get(r["claim_type"], "gray")
-            st.markdown(
-                f"<span style='color:{claim_color}'>●</span> "
-                f"**{r['sentence']}**  \n"
-                f"<small>Score: `{round(r['score'], 2)}` | Type: `{r['claim_type']}`</small>",
-                unsafe_allow_html=True
-            )
+        for r in results.sort_by("score").head(max_claims):
+            render_claim(r)
 
     with tabs[2]:
         st.subheader("🔍 Evidence Sources")
-        for r in results[:max_claims]:
-            if r.get("evidence") and len(r["evidence"]) > 0:
+        for r in results.sort_by("sentence_index", descending=False).head(max_claims):
+            if r["evidence"]:
                 st.markdown(f"**📝 Claim:** {r['sentence']}")
                 st.markdown(f"- 🌐 [Source Link]({r['evidence'][0]})")
 
     with tabs[3]:
         st.subheader("⬇️ Download Results")
-        export_data = [{"sentence": r["sentence"], "score": r["score"], "claim_type": r["claim_type"]} for r in results]
-        json_data = json.dumps(export_data, indent=2)
-        st.download_button("Download as JSON", json_data, file_name="results.json", mime="application/json")
-
-        df = pd.DataFrame(export_data)
-        csv = df.to_csv(index=False)
-        st.download_button("Download as CSV", csv, file_name="results.csv", mime="text/csv")
+        export_columns = ("sentence", "score", "claim_type", "verdict")
+        st.download_button("Download as JSONL", results.to_jsonl(columns=export_columns),
+                           file_name="results.jsonl", mime="application/x-ndjson")
+        st.download_button("Download as CSV", results.to_csv(columns=export_columns),
+                           file_name="results.csv", mime="text/csv")
+        try:
+            parquet = results.to_parquet(columns=export_columns)
+        except ImportError:
+            parquet = None
+        if parquet is not None:
+            st.download_button("Download as Parquet", parquet, file_name="results.parquet",
+                               mime="application/octet-stream")